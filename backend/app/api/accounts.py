@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.models import EmailAccount, User
 from app.schemas import (
@@ -10,7 +14,9 @@ from app.schemas import (
     SyncResponse,
     FolderResponse
 )
-from app.utils import encrypt_password, decrypt_password, EmailService, get_current_user
+from app.utils import encrypt_password, AsyncEmailService, get_current_user
+from app.utils.email_service import IMAPTimeoutError
+from app.utils.mail_sync import list_account_folders, sync_account_safely
 
 router = APIRouter()
 
@@ -27,7 +33,10 @@ def account_to_response(account: EmailAccount) -> dict:
         "smtpHost": account.smtp_host,
         "smtpPort": account.smtp_port,
         "useSSL": account.use_ssl,
+        "imapCompress": account.imap_compress,
         "isActive": account.is_active,
+        "syncInterval": account.sync_interval,
+        "syncFolders": account.sync_folders,
         "createdAt": account.created_at.isoformat() if account.created_at else None,
         "updatedAt": account.updated_at.isoformat() if account.updated_at else None
     }
@@ -79,7 +88,10 @@ async def create_account(account_data: AccountCreate, current_user: User = Depen
         imap_port=account_data.imap_port,
         smtp_host=account_data.smtp_host,
         smtp_port=account_data.smtp_port,
-        use_ssl=account_data.use_ssl
+        use_ssl=account_data.use_ssl,
+        imap_compress=account_data.imap_compress,
+        sync_interval=account_data.sync_interval,
+        sync_folders=account_data.sync_folders
     )
     
     return {
@@ -138,15 +150,16 @@ async def delete_account(account_id: str, current_user: User = Depends(get_curre
 @router.post("/test-connection", response_model=ApiResponse)
 async def test_connection(account_data: AccountCreate, current_user: User = Depends(get_current_user)):
     """测试邮箱连接"""
-    email_service = EmailService(
+    email_service = AsyncEmailService(
         host=account_data.imap_host,
         port=account_data.imap_port,
         username=account_data.email,
         password=account_data.password,
-        use_ssl=account_data.use_ssl
+        use_ssl=account_data.use_ssl,
+        compress=account_data.imap_compress
     )
     
-    success, message = email_service.test_connection()
+    success, message = await email_service.test_connection()
     
     return {
         "success": True,
@@ -157,41 +170,81 @@ async def test_connection(account_data: AccountCreate, current_user: User = Depe
     }
 
 
+def sync_summary(result: dict) -> dict:
+    """账户同步结果摘要：获取、新增、已存在跳过和获取失败的邮件数"""
+    return {
+        "syncedCount": result["newCount"],
+        "fetched": result["fetched"],
+        "inserted": result["newCount"],
+        "skipped": result["skipped"],
+        "failed": result["failed"],
+        "duration": result["duration"],
+        "error": result["error"],
+        "folders": result["folders"]
+    }
+
+
+def sync_message(result: dict) -> str:
+    message = f"同步完成，新增 {result['newCount']} 封，跳过 {result['skipped']} 封已存在的邮件"
+    if result["failed"]:
+        message += f"，{result['failed']} 封获取失败"
+    return message
+
+
+async def stream_sync(account: EmailAccount, limit: int):
+    """以 NDJSON 逐行输出同步进度，最后一行为 {"event": "done"} 及同步摘要"""
+    events: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(sync_account_safely(account, limit=limit, progress=events.put_nowait))
+    try:
+        yield json.dumps({"event": "start", "accountId": account.id, "email": account.email}, ensure_ascii=False) + "\n"
+        while not (task.done() and events.empty()):
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                continue
+            yield json.dumps(getter.result(), ensure_ascii=False, default=str) + "\n"
+        result = task.result()
+        yield json.dumps({
+            "event": "done",
+            "success": result["success"],
+            "message": sync_message(result) if result["success"] else f"同步失败: {result['error']}",
+            **sync_summary(result)
+        }, ensure_ascii=False, default=str) + "\n"
+    finally:
+        # 客户端断开时停止同步（已写入的邮件和水位线保留，下次继续）
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/{account_id}/sync", response_model=ApiResponse)
-async def sync_account(account_id: str, current_user: User = Depends(get_current_user)):
-    """同步邮箱账户邮件"""
+async def sync_account(
+    account_id: str,
+    limit: int = Query(50, ge=1, le=1000),
+    stream: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """同步邮箱账户邮件（与刷新邮件相同的增量同步流程），新邮件写入数据库
+
+    返回新增、已存在跳过和获取失败的邮件数；stream=true 时以 NDJSON 逐行返回进度
+    （start、folders、stored、folder，最后为 done 及同步摘要）。
+    """
     account = await EmailAccount.get_or_none(id=account_id)
     
     if not account:
         raise HTTPException(status_code=404, detail="账户不存在")
     
-    # 解密密码
-    password = decrypt_password(account.password)
-    # 连接邮箱服务器
-    email_service = EmailService(
-        host=account.imap_host,
-        port=account.imap_port,
-        username=account.email,
-        password=password,
-        use_ssl=account.use_ssl
-    )
+    if stream:
+        return StreamingResponse(stream_sync(account, limit), media_type="application/x-ndjson")
     
-    if not email_service.connect():
-        raise HTTPException(status_code=500, detail="连接邮箱服务器失败")
-    
-    try:
-        # 获取邮件（这里简化处理，实际应该存储到数据库）
-        emails, total = email_service.get_emails(limit=50)
-        synced_count = len(emails)
-    finally:
-        email_service.disconnect()
+    result = await sync_account_safely(account, limit=limit)
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=f"同步失败: {result['error']}")
     
     return {
         "success": True,
-        "data": {
-            "syncedCount": synced_count
-        },
-        "message": f"同步完成，获取了 {synced_count} 封邮件"
+        "data": sync_summary(result),
+        "message": sync_message(result)
     }
 
 
@@ -216,30 +269,40 @@ async def toggle_account_active(
     }
 
 
+def folder_to_response(folder: dict) -> dict:
+    """将文件夹信息转换为响应格式"""
+    return {
+        "name": folder["name"],
+        "path": folder["path"],
+        "delimiter": folder["delimiter"],
+        "flags": folder["flags"],
+        "specialUse": folder.get("special_use"),
+        "count": folder["count"],
+        "unreadCount": folder["unread_count"],
+        "uidNext": folder["uid_next"]
+    }
+
+
 @router.get("/{account_id}/folders", response_model=ApiResponse)
-async def get_account_folders(account_id: str, current_user: User = Depends(get_current_user)):
-    """获取账户的邮件文件夹"""
+async def get_account_folders(
+    account_id: str,
+    refresh: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """获取账户的邮件文件夹（含邮件数和未读数，按账户缓存，refresh=true 时强制从服务器获取）"""
     account = await EmailAccount.get_or_none(id=account_id)
     
     if not account:
         raise HTTPException(status_code=404, detail="账户不存在")
     
-    # 解密密码
-    password = decrypt_password(account.password)
-    
-    # 连接邮箱服务器
-    email_service = EmailService(
-        host=account.imap_host,
-        port=account.imap_port,
-        username=account.email,
-        password=password,
-        use_ssl=account.use_ssl
-    )
-    
-    folders = email_service.get_folders()
-    email_service.disconnect()
+    try:
+        folders = await list_account_folders(account, refresh=refresh)
+    except ConnectionError:
+        folders = []
+    except IMAPTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     
     return {
         "success": True,
-        "data": folders
+        "data": [folder_to_response(folder) for folder in folders]
     }
@@ -1,18 +1,40 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
 from typing import Optional, List
 from tortoise.expressions import Q
-import io
-import math
+from urllib.parse import quote, urlencode
 
 from app.models import EmailAccount, Email, Attachment, User
 from app.schemas import ApiResponse
-from app.utils import decrypt_password, EmailService, get_current_user
+from app.utils import get_current_user, create_blob_signature, verify_blob_signature
+from app.utils.blob_store import blob_response, blob_store
+from app.utils.mail_sync import sync_accounts, hydrate_inline_images, store_attachment_blob
+from app.utils.pagination import paginate
+from app.utils.scheduler import sync_scheduler
 from app.logger import logger
 
 router = APIRouter()
 
 
+def inline_image_url(digest: str, content_type: str) -> str:
+    """内嵌图片的下载地址（相对于 API 根路径），签名代替登录令牌，<img> 可以直接加载"""
+    signature = create_blob_signature(f"{digest}:{content_type}")
+    return f"/emails/images/{digest}?" + urlencode({"type": content_type, "sig": signature})
+
+
+def inline_images_to_response(images: Optional[dict]) -> Optional[dict]:
+    """内嵌图片只返回类型、大小和地址，尚未保存到 blob 存储的图片 url 为空"""
+    if not images:
+        return None
+    return {
+        cid: {
+            "contentType": info.get("content_type"),
+            "size": info.get("size"),
+            "url": inline_image_url(info["sha256"], info.get("content_type") or "") if info.get("sha256") else None
+        }
+        for cid, info in images.items()
+    }
+
+
 async def email_to_response(email: Email) -> dict:
     """将邮件模型转换为响应格式"""
     attachments = None
@@ -44,7 +66,7 @@ async def email_to_response(email: Email) -> dict:
         "isStarred": email.is_starred,
         "hasAttachments": email.has_attachments,
         "attachments": attachments,
-        "inlineImages": getattr(email, 'inline_images', None),
+        "inlineImages": inline_images_to_response(getattr(email, 'inline_images', None)),
         "folder": email.folder,
         "labels": email.labels
     }
@@ -54,12 +76,14 @@ async def email_to_response(email: Email) -> dict:
 async def get_emails(
     account_id: Optional[str] = Query(None, alias="accountId"),
     folder: str = Query("INBOX"),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="页码（未传 cursor 时按页码分页，返回总数）"),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 nextCursor，传入时按游标分页"),
+    with_total: bool = Query(False, alias="withTotal", description="游标分页时是否统计总数"),
     search: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
-    """获取邮件列表"""
+    """获取邮件列表，按日期倒序；传入 cursor 时按游标分页，否则按页码分页"""
     query = Email.all()
     
     if account_id:
@@ -73,23 +97,13 @@ async def get_emails(
             Q(subject__icontains=search) | Q(body__icontains=search)
         )
     
-    # 获取总数
-    total = await query.count()
-    
-    # 分页
-    offset = (page - 1) * page_size
-    emails = await query.order_by("-date").offset(offset).limit(page_size)
-    
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    emails, page_info = await paginate(query, "date", page_size, page=page, cursor=cursor, with_total=with_total)
     
     return {
         "success": True,
         "data": {
             "items": [await email_to_response(e) for e in emails],
-            "total": total,
-            "page": page,
-            "pageSize": page_size,
-            "totalPages": total_pages
+            **page_info
         }
     }
 
@@ -102,6 +116,9 @@ async def get_email(email_id: str, current_user: User = Depends(get_current_user
     if not email:
         raise HTTPException(status_code=404, detail="邮件不存在")
     
+    # 同步时只记录了内嵌图片的部分编号，首次查看时从服务器获取并写入 blob 存储
+    await hydrate_inline_images(email)
+    
     return {
         "success": True,
         "data": await email_to_response(email)
@@ -249,63 +266,26 @@ async def refresh_emails(
     else:
         accounts = await EmailAccount.filter(is_active=True)
     
-    new_count = 0
+    # 并发同步所有账户，单个账户的失败或超时不影响其他账户
+    if sync_scheduler.running:
+        # 不进入调度器队列，直接执行并更新调度状态，不排在后台定时同步之后
+        results = await sync_scheduler.run_now(accounts)
+    else:
+        results = await sync_accounts(accounts, limit=20)
+    new_count = sum(r["newCount"] for r in results)
+    failed_count = sum(1 for r in results if not r["success"])
     
-    for account in accounts:
-        if not account:
-            continue
-            
-        # 解密密码
-        password = decrypt_password(account.password)
-        
-        # 连接邮箱服务器
-        email_service = EmailService(
-            host=account.imap_host,
-            port=account.imap_port,
-            username=account.email,
-            password=password,
-            use_ssl=account.use_ssl
-        )
-        
-        try:
-            # 获取邮件（包含正文内容）- get_emails 内部会自动连接
-            emails_data, total = email_service.get_emails(limit=20, fetch_body=True)
-            logger.success(f"账户 {account.email} 获取到 {len(emails_data)} 封邮件，总计 {total} 封")
-            
-            for email_data in emails_data:
-                # 检查邮件是否已存在
-                existing = await Email.get_or_none(
-                    account_id=account.id,
-                    message_id=email_data.get("message_id")
-                )
-                if existing:
-                    continue
-                
-                # 创建新邮件
-                await Email.create(
-                    account_id=account.id,
-                    message_id=email_data.get("message_id"),
-                    from_address=email_data.get("from"),
-                    to_addresses=email_data.get("to", []),
-                    cc_addresses=email_data.get("cc"),
-                    subject=email_data.get("subject"),
-                    body=email_data.get("body"),
-                    body_html=email_data.get("body_html"),
-                    date=email_data.get("date"),
-                    has_attachments=email_data.get("has_attachments", False),
-                    inline_images=email_data.get("inline_images"),
-                    folder="INBOX"
-                )
-                new_count += 1
-        finally:
-            email_service.disconnect()
+    message = f"获取了 {new_count} 封新邮件"
+    if failed_count:
+        message += f"，{failed_count} 个账户同步失败"
     
     return {
         "success": True,
         "data": {
-            "newCount": new_count
+            "newCount": new_count,
+            "results": results
         },
-        "message": f"获取了 {new_count} 封新邮件"
+        "message": message
     }
 
 
@@ -313,9 +293,10 @@ async def refresh_emails(
 async def download_attachment(
     email_id: str,
     attachment_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
-    """下载附件"""
+    """下载附件（从 blob 存储流式返回，支持 Range、ETag 和 If-None-Match）"""
     attachment = await Attachment.get_or_none(
         id=attachment_id,
         email_id=email_id
@@ -324,13 +305,47 @@ async def download_attachment(
     if not attachment:
         raise HTTPException(status_code=404, detail="附件不存在")
     
-    # 返回附件内容
-    content = attachment.content if attachment.content else b""
-    
-    return StreamingResponse(
-        io.BytesIO(content.encode() if isinstance(content, str) else content),
+    # 首次下载时从邮件服务器获取并写入 blob 存储，之后直接从磁盘读取
+    email = await Email.get(id=email_id)
+    try:
+        digest = await store_attachment_blob(attachment, email)
+    except Exception as e:
+        logger.error(f"获取附件 {attachment.id} 失败: {e}")
+        digest = None
+    if not digest:
+        raise HTTPException(status_code=502, detail="从邮件服务器获取附件失败")
+    
+    return blob_response(
+        request,
+        digest,
         media_type=attachment.content_type or "application/octet-stream",
         headers={
-            "Content-Disposition": f'attachment; filename="{attachment.filename}"'
+            # 非 ASCII 文件名按 RFC 5987 编码，否则响应头无法编码
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(attachment.filename)}",
+            # 附件内容不会变化，按摘要缓存；需要登录，只允许浏览器私有缓存
+            "Cache-Control": "private, max-age=31536000, immutable"
+        }
+    )
+
+
+@router.get("/images/{digest}")
+async def get_inline_image(
+    digest: str,
+    request: Request,
+    content_type: str = Query("", alias="type"),
+    sig: str = Query("")
+):
+    """获取内嵌图片（签名地址，无需登录令牌），支持 ETag 条件请求"""
+    if not verify_blob_signature(f"{digest}:{content_type}", sig) or not blob_store.exists(digest):
+        raise HTTPException(status_code=404, detail="图片不存在")
+    
+    return blob_response(
+        request,
+        digest,
+        # 只按图片类型返回，避免签名地址被当作 HTML 打开
+        media_type=content_type if content_type.startswith("image/") else "application/octet-stream",
+        headers={
+            "X-Content-Type-Options": "nosniff",
+            "Cache-Control": "private, max-age=31536000, immutable"
         }
     )
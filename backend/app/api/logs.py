@@ -7,26 +7,28 @@ Description: 访问日志 API
 '''
 from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import Optional
-import math
 
 from app.models import User, AccessLog
 from app.utils import get_current_user
 from app.schemas import ApiResponse
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
 @router.get("", response_model=ApiResponse)
 async def get_access_logs(
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="页码（未传 cursor 时按页码分页，返回总数）"),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 nextCursor，传入时按游标分页"),
+    with_total: bool = Query(False, alias="withTotal", description="游标分页时是否统计总数"),
     username: Optional[str] = None,
     ip_address: Optional[str] = Query(None, alias="ipAddress"),
     path: Optional[str] = None,
     log_type: Optional[str] = Query(None, alias="logType", description="日志类型: open_api, login, other"),
     current_user: User = Depends(get_current_user)
 ):
-    """获取访问日志列表（仅管理员）"""
+    """获取访问日志列表（仅管理员），按时间倒序；传入 cursor 时按游标分页，否则按页码分页"""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="无权限访问")
     
@@ -49,14 +51,7 @@ async def get_access_logs(
     elif log_type == "other":
         query = query.exclude(path__startswith="/api/v1/open").exclude(path__startswith="/api/auth")
     
-    # 获取总数
-    total = await query.count()
-    
-    # 分页
-    offset = (page - 1) * page_size
-    logs = await query.order_by("-created_at").offset(offset).limit(page_size)
-    
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    logs, page_info = await paginate(query, "created_at", page_size, page=page, cursor=cursor, with_total=with_total)
     
     return {
         "success": True,
@@ -75,31 +70,23 @@ async def get_access_logs(
                 }
                 for log in logs
             ],
-            "total": total,
-            "page": page,
-            "pageSize": page_size,
-            "totalPages": total_pages
+            **page_info
         }
     }
 
 
 @router.get("/my", response_model=ApiResponse)
 async def get_my_access_logs(
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="页码（未传 cursor 时按页码分页，返回总数）"),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 nextCursor，传入时按游标分页"),
+    with_total: bool = Query(False, alias="withTotal", description="游标分页时是否统计总数"),
     current_user: User = Depends(get_current_user)
 ):
-    """获取当前用户的访问日志"""
+    """获取当前用户的访问日志，传入 cursor 时按游标分页，否则按页码分页"""
     query = AccessLog.filter(user_id=current_user.id)
     
-    # 获取总数
-    total = await query.count()
-    
-    # 分页
-    offset = (page - 1) * page_size
-    logs = await query.order_by("-created_at").offset(offset).limit(page_size)
-    
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    logs, page_info = await paginate(query, "created_at", page_size, page=page, cursor=cursor, with_total=with_total)
     
     return {
         "success": True,
@@ -115,10 +102,7 @@ async def get_my_access_logs(
                 }
                 for log in logs
             ],
-            "total": total,
-            "page": page,
-            "pageSize": page_size,
-            "totalPages": total_pages
+            **page_info
         }
     }
 
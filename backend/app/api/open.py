@@ -6,10 +6,10 @@ Description: 开放 API - 需要令牌认证
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
 from typing import Optional
 from datetime import datetime
-import math
 
 from app.models import EmailAccount, Email, ApiToken
 from app.schemas import ApiResponse
+from app.utils.pagination import paginate
 from app.logger import logger
 
 router = APIRouter()
@@ -165,7 +165,9 @@ async def get_public_accounts(token: ApiToken = Depends(verify_api_token)):
 async def get_emails_by_account(
     email_address: str,
     limit: int = Query(default=10, ge=1, le=100, description="获取数量，最大100"),
-    page: int = Query(default=1, ge=1, description="页码"),
+    page: int = Query(default=1, ge=1, description="页码（未传 cursor 时按页码分页，返回总数）"),
+    cursor: Optional[str] = Query(default=None, description="上一页返回的 nextCursor，传入时按游标分页"),
+    with_total: bool = Query(default=False, alias="withTotal", description="游标分页时是否统计总数"),
     token: ApiToken = Depends(verify_api_token)
 ):
     """
@@ -177,7 +179,9 @@ async def get_emails_by_account(
     
     - **email_address**: 邮箱地址
     - **limit**: 每页数量，默认10，最大100
-    - **page**: 页码，默认1
+    - **page**: 页码，默认1（按页码分页并返回总数）
+    - **cursor**: 上一页返回的 nextCursor，传入时按游标分页，忽略 page
+    - **withTotal**: 游标分页时是否返回邮件总数，默认不统计
     """
     # 查找账户
     account = await EmailAccount.get_or_none(email=email_address)
@@ -185,26 +189,18 @@ async def get_emails_by_account(
     if not account:
         raise HTTPException(status_code=404, detail=f"邮箱 {email_address} 不存在")
     
-    # 获取邮件总数
-    total = await Email.filter(account_id=account.id).count()
+    emails, page_info = await paginate(
+        Email.filter(account_id=account.id), "date", limit, page=page, cursor=cursor, with_total=with_total
+    )
     
-    # 分页获取邮件
-    offset = (page - 1) * limit
-    emails = await Email.filter(account_id=account.id).order_by("-date").offset(offset).limit(limit)
-    
-    total_pages = math.ceil(total / limit) if total > 0 else 0
-    
-    logger.info(f"开放API[{token.name}]: 获取邮箱 {email_address} 的邮件，第{page}页，共 {len(emails)} 封")
+    logger.info(f"开放API[{token.name}]: 获取邮箱 {email_address} 的邮件，共 {len(emails)} 封")
     
     return {
         "success": True,
         "data": {
             "account": account_to_public_response(account),
             "items": [await email_to_public_response(e) for e in emails],
-            "total": total,
-            "page": page,
-            "pageSize": limit,
-            "totalPages": total_pages
+            **page_info
         }
     }
 
@@ -212,7 +208,9 @@ async def get_emails_by_account(
 @router.get("/emails", response_model=ApiResponse)
 async def get_all_emails(
     limit: int = Query(default=10, ge=1, le=100, description="获取数量，最大100"),
-    page: int = Query(default=1, ge=1, description="页码"),
+    page: int = Query(default=1, ge=1, description="页码（未传 cursor 时按页码分页，返回总数）"),
+    cursor: Optional[str] = Query(default=None, description="上一页返回的 nextCursor，传入时按游标分页"),
+    with_total: bool = Query(default=False, alias="withTotal", description="游标分页时是否统计总数"),
     token: ApiToken = Depends(verify_api_token)
 ):
     """
@@ -223,27 +221,21 @@ async def get_all_emails(
     获取所有邮箱账户的最近邮件，包含txt内容及html内容，不包含图片
     
     - **limit**: 每页数量，默认10，最大100
-    - **page**: 页码，默认1
+    - **page**: 页码，默认1（按页码分页并返回总数）
+    - **cursor**: 上一页返回的 nextCursor，传入时按游标分页，忽略 page
+    - **withTotal**: 游标分页时是否返回邮件总数，默认不统计
     """
-    # 获取邮件总数
-    total = await Email.all().count()
-    
-    # 分页获取邮件
-    offset = (page - 1) * limit
-    emails = await Email.all().order_by("-date").offset(offset).limit(limit)
-    
-    total_pages = math.ceil(total / limit) if total > 0 else 0
+    emails, page_info = await paginate(
+        Email.all(), "date", limit, page=page, cursor=cursor, with_total=with_total
+    )
     
-    logger.info(f"开放API[{token.name}]: 获取全部邮件，第{page}页，共 {len(emails)} 封")
+    logger.info(f"开放API[{token.name}]: 获取全部邮件，共 {len(emails)} 封")
     
     return {
         "success": True,
         "data": {
             "items": [await email_to_public_response(e) for e in emails],
-            "total": total,
-            "page": page,
-            "pageSize": limit,
-            "totalPages": total_pages
+            **page_info
         }
     }
 
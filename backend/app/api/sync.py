@@ -0,0 +1,146 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 同步状态和历史邮件回填 API
+'''
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models import BackfillJob, EmailAccount, SyncState, User
+from app.schemas import ApiResponse, BackfillCreate
+from app.utils import get_current_user
+from app.utils.backfill import backfill_manager
+from app.utils.email_service import imap_timeouts, tls_sessions
+from app.utils.mail_sync import compression_ratio, is_folder_syncing
+from app.utils.scheduler import sync_scheduler
+
+router = APIRouter()
+
+
+@router.get("/status", response_model=ApiResponse)
+async def get_sync_status(
+    account_id: Optional[str] = Query(None, alias="accountId"),
+    current_user: User = Depends(get_current_user)
+):
+    """获取各账户的后台同步状态（上次运行时间、耗时、错误和下次运行时间）及各服务器的 TLS 会话恢复和超时次数"""
+    return {
+        "success": True,
+        "data": {
+            "schedulerRunning": sync_scheduler.running,
+            "accounts": sync_scheduler.get_statuses(account_id),
+            "tlsSessions": tls_sessions.get_stats(),
+            "imapTimeouts": imap_timeouts.get_stats()
+        }
+    }
+
+
+def sync_state_to_response(state: SyncState) -> dict:
+    """将文件夹同步状态转换为响应格式"""
+    return {
+        "accountId": state.account_id,
+        "folder": state.folder,
+        "path": state.path or state.folder,
+        "syncing": is_folder_syncing(state.account_id, state.folder),
+        "lastUid": state.last_uid,
+        "lastNewCount": state.last_new_count,
+        "lastError": state.last_error,
+        "bytesReceived": state.bytes_received,
+        "bytesUncompressed": state.bytes_uncompressed,
+        "compressionRatio": compression_ratio(state.bytes_received, state.bytes_uncompressed),
+        "lastSyncedAt": state.last_synced_at.isoformat() if state.last_synced_at else None,
+        "flagsSyncedAt": state.flags_synced_at.isoformat() if state.flags_synced_at else None
+    }
+
+
+@router.get("/folders", response_model=ApiResponse)
+async def get_folder_sync_states(
+    account_id: Optional[str] = Query(None, alias="accountId"),
+    current_user: User = Depends(get_current_user)
+):
+    """获取各文件夹的同步进度（水位线、最近一次新增数、错误和是否正在同步）"""
+    query = SyncState.all()
+    if account_id:
+        query = query.filter(account_id=account_id)
+    states = await query.order_by("account_id", "folder")
+    return {
+        "success": True,
+        "data": [sync_state_to_response(state) for state in states]
+    }
+
+
+# ==================== 历史邮件回填 ====================
+
+async def _get_job(job_id: str) -> BackfillJob:
+    job = await BackfillJob.get_or_none(id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="回填任务不存在")
+    return job
+
+
+@router.post("/backfill", response_model=ApiResponse)
+async def create_backfill(data: BackfillCreate, current_user: User = Depends(get_current_user)):
+    """创建历史邮件回填任务（该文件夹已有未完成的任务时从断点继续）"""
+    account = await EmailAccount.get_or_none(id=data.account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="账户不存在")
+    
+    job = await backfill_manager.create(
+        account,
+        folder=data.folder,
+        max_messages_per_second=data.max_messages_per_second,
+        max_bytes_per_second=data.max_bytes_per_second
+    )
+    return {
+        "success": True,
+        "data": backfill_manager.to_response(job),
+        "message": "回填任务已开始"
+    }
+
+
+@router.get("/backfill", response_model=ApiResponse)
+async def get_backfill_jobs(
+    account_id: Optional[str] = Query(None, alias="accountId"),
+    current_user: User = Depends(get_current_user)
+):
+    """获取回填任务列表"""
+    query = BackfillJob.all()
+    if account_id:
+        query = query.filter(account_id=account_id)
+    jobs = await query.order_by("-created_at")
+    return {
+        "success": True,
+        "data": [backfill_manager.to_response(job) for job in jobs]
+    }
+
+
+@router.get("/backfill/{job_id}", response_model=ApiResponse)
+async def get_backfill_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """获取回填进度（已完成/总数、速率、预计剩余时间）"""
+    job = await _get_job(job_id)
+    return {
+        "success": True,
+        "data": backfill_manager.to_response(job)
+    }
+
+
+@router.post("/backfill/{job_id}/pause", response_model=ApiResponse)
+async def pause_backfill(job_id: str, current_user: User = Depends(get_current_user)):
+    """暂停回填任务"""
+    job = await backfill_manager.pause(await _get_job(job_id))
+    return {
+        "success": True,
+        "data": backfill_manager.to_response(job),
+        "message": "回填任务已暂停"
+    }
+
+
+@router.post("/backfill/{job_id}/resume", response_model=ApiResponse)
+async def resume_backfill(job_id: str, current_user: User = Depends(get_current_user)):
+    """从断点继续回填任务"""
+    job = await backfill_manager.resume(await _get_job(job_id))
+    return {
+        "success": True,
+        "data": backfill_manager.to_response(job),
+        "message": "回填任务已继续"
+    }
@@ -6,19 +6,69 @@ LastEditors: XDTEAM
 Description: 
 '''
 import os
+from typing import Any, Dict
+
+from aerich import Command
 from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
+
+from app.logger import logger
 
 # 数据库配置 - 使用 SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite://./email_admin.db")
+# 存储配置：production 使用下面的 SQLite PRAGMA 和 MySQL 连接池参数，default 使用 Tortoise 默认值
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "production").lower()
+# SQLite 日志模式、同步级别（WAL 下 NORMAL 只在检查点时刷盘）
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# SQLite 内存映射读取的字节数
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# SQLite 页缓存，负数表示 KiB
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+# SQLite 遇到锁时的等待毫秒数
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+# MySQL 连接池大小
+MYSQL_POOL_MIN = int(os.getenv("MYSQL_POOL_MIN", "1"))
+MYSQL_POOL_MAX = int(os.getenv("MYSQL_POOL_MAX", "10"))
+# MySQL 连接的最长使用秒数，超过后重建，避免被服务器 wait_timeout 断开
+MYSQL_POOL_RECYCLE = int(os.getenv("MYSQL_POOL_RECYCLE", "3600"))
+
+SQLITE_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+
+# aerich 迁移文件目录（与 pyproject.toml 中的 location 相同）
+MIGRATIONS_LOCATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+def storage_credentials(db_url: str = DATABASE_URL, profile: str = DATABASE_PROFILE) -> Dict[str, Any]:
+    """按存储配置生成连接参数，URL 中的查询参数优先"""
+    config = expand_db_url(db_url)
+    if profile != "production":
+        return config
+    credentials = config["credentials"]
+    if config["engine"] == "tortoise.backends.sqlite":
+        # SQLite 的 PRAGMA 按连接生效，Tortoise 建立连接时逐个执行
+        # expand_db_url 已默认填入 journal_mode=WAL，只有 URL 中未指定时才使用配置的值
+        if "journal_mode=" not in db_url:
+            credentials["journal_mode"] = SQLITE_JOURNAL_MODE
+        credentials.setdefault("synchronous", SQLITE_SYNCHRONOUS)
+        credentials.setdefault("mmap_size", SQLITE_MMAP_SIZE)
+        credentials.setdefault("cache_size", SQLITE_CACHE_SIZE)
+        credentials.setdefault("busy_timeout", SQLITE_BUSY_TIMEOUT)
+    elif config["engine"] == "tortoise.backends.mysql":
+        credentials.setdefault("minsize", MYSQL_POOL_MIN)
+        credentials.setdefault("maxsize", MYSQL_POOL_MAX)
+        credentials.setdefault("pool_recycle", MYSQL_POOL_RECYCLE)
+    return config
+
 
 # Tortoise ORM 配置
 TORTOISE_ORM = {
     "connections": {
-        "default": DATABASE_URL
+        "default": storage_credentials()
     },
     "apps": {
         "models": {
-            "models": ["app.models.account", "app.models.email", "app.models.user", "app.models.token", "aerich.models"],
+            "models": ["app.models.account", "app.models.email", "app.models.user", "app.models.token", "app.models.sync", "aerich.models"],
             "default_connection": "default",
         },
     },
@@ -28,10 +78,42 @@ TORTOISE_ORM = {
 
 
 async def init_db():
-    """初始化数据库连接"""
+    """初始化数据库连接，并执行 migrations 目录中尚未执行的迁移"""
     await Tortoise.init(config=TORTOISE_ORM)
-    # 生成数据库表
-    await Tortoise.generate_schemas()
+    command = Command(tortoise_config=TORTOISE_ORM, app="models", location=MIGRATIONS_LOCATION)
+    await command.init()
+    for version in await command.upgrade(run_in_transaction=True):
+        logger.info(f"已执行数据库迁移 {version}")
+
+
+async def storage_status() -> Dict[str, Any]:
+    """当前数据库连接实际生效的存储配置（不含地址和账号）"""
+    connection = Tortoise.get_connection("default")
+    dialect = connection.capabilities.dialect
+    status: Dict[str, Any] = {"profile": DATABASE_PROFILE, "engine": dialect}
+    if dialect == "sqlite":
+        pragmas = {
+            "journalMode": "journal_mode",
+            "synchronous": "synchronous",
+            "mmapSize": "mmap_size",
+            "cacheSize": "cache_size",
+            "busyTimeout": "busy_timeout"
+        }
+        for key, pragma in pragmas.items():
+            _, rows = await connection.execute_query(f"PRAGMA {pragma}")
+            status[key] = rows[0][0] if rows else None
+        # synchronous 返回数字
+        status["synchronous"] = SQLITE_SYNCHRONOUS_NAMES.get(status["synchronous"], status["synchronous"])
+    elif dialect == "mysql":
+        pool = connection._pool
+        status.update({
+            "poolMin": connection.pool_minsize,
+            "poolMax": connection.pool_maxsize,
+            "poolRecycle": connection.extra.get("pool_recycle", -1),
+            "poolSize": pool.size if pool else 0,
+            "poolFree": pool.freesize if pool else 0
+        })
+    return status
 
 
 async def close_db():
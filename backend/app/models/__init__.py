@@ -9,5 +9,6 @@ from app.models.account import EmailAccount
 from app.models.email import Email, Attachment
 from app.models.user import User, AccessLog
 from app.models.token import ApiToken
+from app.models.sync import SyncState, BackfillJob
 
-__all__ = ["EmailAccount", "Email", "Attachment", "User", "AccessLog", "ApiToken"]
+__all__ = ["EmailAccount", "Email", "Attachment", "User", "AccessLog", "ApiToken", "SyncState", "BackfillJob"]
@@ -26,7 +26,10 @@ class EmailAccount(Model):
     smtp_host = fields.CharField(max_length=255, description="SMTP服务器地址")
     smtp_port = fields.IntField(default=587, description="SMTP端口")
     use_ssl = fields.BooleanField(default=True, description="是否使用SSL")
+    imap_compress = fields.BooleanField(default=True, description="服务器支持时是否启用 IMAP 压缩（COMPRESS=DEFLATE）")
     is_active = fields.BooleanField(default=True, description="是否启用")
+    sync_interval = fields.IntField(default=300, description="自动同步间隔(秒)，0 表示不自动同步")
+    sync_folders = fields.JSONField(null=True, description="同步的文件夹（用途如 inbox/sent/junk 或服务器文件夹名），为空时使用默认配置")
     created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
     updated_at = fields.DatetimeField(auto_now=True, description="更新时间")
 
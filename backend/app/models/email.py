@@ -6,6 +6,7 @@ LastEditors: XDTEAM
 Description: 邮件模型 - Tortoise ORM
 '''
 from tortoise import fields
+from tortoise.indexes import Index
 from tortoise.models import Model
 import uuid
 
@@ -15,10 +16,27 @@ class Email(Model):
     
     class Meta:
         table = "emails"
+        unique_together = (("account", "folder", "message_key"),)
+        indexes = (
+            # 邮件列表：按账户和文件夹筛选，按 (日期, id) 倒序游标分页
+            Index(fields=("account_id", "folder", "date", "id"), name="idx_emails_account_folder_date_id"),
+            # 不限账户的文件夹列表
+            Index(fields=("folder", "date", "id"), name="idx_emails_folder_date_id"),
+            # 开放接口按账户分页、统计各账户邮件数
+            Index(fields=("account_id", "date", "id"), name="idx_emails_account_date_id"),
+            # 统计接口按日期范围计数、开放接口全部邮件分页
+            Index(fields=("date", "id"), name="idx_emails_date_id"),
+            # 未读数（全部和各账户）
+            Index(fields=("is_read", "account_id"), name="idx_emails_read_account"),
+            # 同步标志变化、已删除邮件按 UID 定位
+            Index(fields=("account_id", "folder", "uid"), name="idx_emails_account_folder_uid"),
+        )
     
     id = fields.CharField(pk=True, max_length=36, default=lambda: str(uuid.uuid4()))
     account = fields.ForeignKeyField("models.EmailAccount", related_name="emails", description="账户ID")
     message_id = fields.CharField(max_length=255, null=True, description="邮件消息ID")
+    message_key = fields.CharField(max_length=64, description="去重键: 规范化 Message-ID 的 SHA-256，缺失时为邮件头内容的 SHA-256；同一账户的同一文件夹内唯一")
+    uid = fields.BigIntField(null=True, description="IMAP UID")
     from_address = fields.JSONField(description="发件人")
     to_addresses = fields.JSONField(description="收件人列表")
     cc_addresses = fields.JSONField(null=True, description="抄送列表")
@@ -30,7 +48,7 @@ class Email(Model):
     is_read = fields.BooleanField(default=False, description="是否已读")
     is_starred = fields.BooleanField(default=False, description="是否星标")
     has_attachments = fields.BooleanField(default=False, description="是否有附件")
-    inline_images = fields.JSONField(null=True, description="内嵌图片 {cid: {content_type, data}}")
+    inline_images = fields.JSONField(null=True, description="内嵌图片 {cid: {content_type, part, encoding, sha256, size, failed_at}}，内容保存在 blob 存储中，sha256 为空时按需获取，failed_at 为最近一次获取失败的时间戳")
     folder = fields.CharField(max_length=100, default="INBOX", description="文件夹")
     labels = fields.JSONField(null=True, description="标签列表")
     created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
@@ -51,7 +69,10 @@ class Attachment(Model):
     filename = fields.CharField(max_length=255, description="文件名")
     content_type = fields.CharField(max_length=100, null=True, description="内容类型")
     size = fields.IntField(default=0, description="文件大小(字节)")
-    content = fields.TextField(null=True, description="文件内容(Base64)")
+    content = fields.TextField(null=True, description="文件内容(Base64)，旧数据，首次下载时转存到 blob 存储")
+    blob_sha256 = fields.CharField(max_length=64, null=True, index=True, description="blob 存储中内容的 SHA-256，为空时按需从服务器获取")
+    part = fields.CharField(max_length=50, null=True, description="IMAP 部分编号(BODY[part])，内容为空时按需从服务器获取")
+    encoding = fields.CharField(max_length=50, null=True, description="传输编码")
     created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
 
     def __str__(self):
@@ -0,0 +1,66 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 同步状态模型 - Tortoise ORM
+'''
+from tortoise import fields
+from tortoise.models import Model
+import uuid
+
+
+class SyncState(Model):
+    """文件夹同步状态（UID 水位线和标志 MODSEQ）"""
+    
+    class Meta:
+        table = "sync_states"
+        unique_together = (("account", "folder"),)
+    
+    id = fields.CharField(pk=True, max_length=36, default=lambda: str(uuid.uuid4()))
+    account = fields.ForeignKeyField("models.EmailAccount", related_name="sync_states", description="账户ID")
+    folder = fields.CharField(max_length=255, default="INBOX", description="文件夹")
+    path = fields.CharField(max_length=255, null=True, description="服务器上的文件夹名（与 folder 不同时记录）")
+    uid_validity = fields.BigIntField(null=True, description="UIDVALIDITY")
+    last_uid = fields.BigIntField(default=0, description="已同步的最大UID")
+    highest_modseq = fields.BigIntField(null=True, description="已同步标志的 HIGHESTMODSEQ（CONDSTORE）")
+    flags_synced_at = fields.DatetimeField(null=True, description="最后同步标志时间")
+    remap_uid_validity = fields.BigIntField(null=True, description="正在按去重键重新绑定 UID 的新 UIDVALIDITY，为空表示没有进行中的重新绑定")
+    remap_cursor_uid = fields.BigIntField(null=True, description="重新绑定 UID 的断点：已处理的最大 UID，下一段从大于它的 UID 继续")
+    last_synced_at = fields.DatetimeField(null=True, description="最后同步时间")
+    last_new_count = fields.IntField(default=0, description="最近一次同步新增的邮件数")
+    last_error = fields.TextField(null=True, description="最近一次同步错误")
+    bytes_received = fields.BigIntField(default=0, description="累计从服务器接收的字节数（压缩后，即网络传输量）")
+    bytes_uncompressed = fields.BigIntField(default=0, description="累计接收的字节数（解压后）")
+    created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
+    updated_at = fields.DatetimeField(auto_now=True, description="更新时间")
+
+    def __str__(self):
+        return f"<SyncState(account_id={self.account_id}, folder={self.folder}, last_uid={self.last_uid})>"
+
+
+class BackfillJob(Model):
+    """历史邮件回填任务：按 UID 从新到旧分段导入，每段完成后记录断点"""
+    
+    class Meta:
+        table = "backfill_jobs"
+    
+    id = fields.CharField(pk=True, max_length=36, default=lambda: str(uuid.uuid4()))
+    account = fields.ForeignKeyField("models.EmailAccount", related_name="backfill_jobs", description="账户ID")
+    folder = fields.CharField(max_length=255, default="INBOX", description="文件夹")
+    status = fields.CharField(max_length=20, default="pending", description="状态: pending/running/paused/completed/failed")
+    uid_validity = fields.BigIntField(null=True, description="UIDVALIDITY")
+    cursor_uid = fields.BigIntField(null=True, description="断点：已回填的最小 UID，下一段从小于它的 UID 继续")
+    total = fields.IntField(default=0, description="需要回填的邮件总数")
+    done = fields.IntField(default=0, description="已成功处理的邮件数")
+    imported = fields.IntField(default=0, description="新增的邮件数")
+    bytes_fetched = fields.BigIntField(default=0, description="已下载字节数")
+    failed_uids = fields.JSONField(null=True, description="获取失败的 UID（不含服务器上已删除的），全部分段完成后重试")
+    max_messages_per_second = fields.FloatField(null=True, description="每秒最多获取的邮件数，为空时使用默认值")
+    max_bytes_per_second = fields.BigIntField(null=True, description="每秒最多下载的字节数，为空时使用默认值")
+    error = fields.TextField(null=True, description="最近一次错误")
+    started_at = fields.DatetimeField(null=True, description="开始时间")
+    finished_at = fields.DatetimeField(null=True, description="完成时间")
+    created_at = fields.DatetimeField(auto_now_add=True, description="创建时间")
+    updated_at = fields.DatetimeField(auto_now=True, description="更新时间")
+
+    def __str__(self):
+        return f"<BackfillJob(account_id={self.account_id}, folder={self.folder}, {self.done}/{self.total})>"
@@ -6,6 +6,7 @@ LastEditors: XDTEAM
 Description: 用户模型 - Tortoise ORM
 '''
 from tortoise import fields
+from tortoise.indexes import Index
 from tortoise.models import Model
 import uuid
 
@@ -36,6 +37,14 @@ class AccessLog(Model):
     class Meta:
         table = "access_logs"
         ordering = ["-created_at"]
+        indexes = (
+            # 日志列表按时间倒序分页、按时间清理旧日志
+            Index(fields=("created_at", "id"), name="idx_access_logs_created_id"),
+            # 当前用户的日志
+            Index(fields=("user_id", "created_at", "id"), name="idx_access_logs_user_created_id"),
+            # 按路径前缀（开放接口、认证接口）筛选
+            Index(fields=("path", "created_at"), name="idx_access_logs_path_created"),
+        )
     
     id = fields.CharField(pk=True, max_length=36, default=lambda: str(uuid.uuid4()))
     user_id = fields.CharField(max_length=36, null=True, description="用户ID")
@@ -31,6 +31,9 @@ class AccountBase(BaseModel):
     smtp_host: str = Field(..., alias="smtpHost", description="SMTP服务器地址")
     smtp_port: int = Field(587, alias="smtpPort", description="SMTP端口")
     use_ssl: bool = Field(True, alias="useSSL", description="是否使用SSL")
+    imap_compress: bool = Field(True, alias="imapCompress", description="服务器支持时是否启用 IMAP 压缩（COMPRESS=DEFLATE）")
+    sync_interval: int = Field(300, ge=0, alias="syncInterval", description="自动同步间隔(秒)，0 表示不自动同步")
+    sync_folders: Optional[List[str]] = Field(None, alias="syncFolders", description="同步的文件夹（inbox/sent/drafts/archive/junk/trash 或服务器文件夹名），为空时使用默认配置")
 
     class Config:
         populate_by_name = True
@@ -50,7 +53,10 @@ class AccountUpdate(BaseModel):
     smtp_host: Optional[str] = Field(None, alias="smtpHost", description="SMTP服务器地址")
     smtp_port: Optional[int] = Field(None, alias="smtpPort", description="SMTP端口")
     use_ssl: Optional[bool] = Field(None, alias="useSSL", description="是否使用SSL")
+    imap_compress: Optional[bool] = Field(None, alias="imapCompress", description="是否启用 IMAP 压缩")
     is_active: Optional[bool] = Field(None, alias="isActive", description="是否启用")
+    sync_interval: Optional[int] = Field(None, ge=0, alias="syncInterval", description="自动同步间隔(秒)")
+    sync_folders: Optional[List[str]] = Field(None, alias="syncFolders", description="同步的文件夹")
 
     class Config:
         populate_by_name = True
@@ -67,7 +73,10 @@ class AccountResponse(BaseModel):
     smtpHost: str
     smtpPort: int
     useSSL: bool
+    imapCompress: bool = True
     isActive: bool
+    syncInterval: int = 300
+    syncFolders: Optional[List[str]] = None
     createdAt: Optional[str] = None
     updatedAt: Optional[str] = None
 
@@ -85,6 +94,21 @@ class TestConnectionResponse(BaseModel):
 class SyncResponse(BaseModel):
     """同步响应"""
     syncedCount: int
+    fetched: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class BackfillCreate(BaseModel):
+    """创建历史邮件回填任务请求"""
+    account_id: str = Field(..., alias="accountId", description="账户ID")
+    folder: str = Field("INBOX", min_length=1, description="文件夹")
+    max_messages_per_second: Optional[float] = Field(None, gt=0, alias="maxMessagesPerSecond", description="每秒最多获取的邮件数")
+    max_bytes_per_second: Optional[int] = Field(None, gt=0, alias="maxBytesPerSecond", description="每秒最多下载的字节数")
+
+    class Config:
+        populate_by_name = True
 
 
 # ==================== 文件夹响应 ====================
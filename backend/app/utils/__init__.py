@@ -1,10 +1,13 @@
 from app.utils.crypto import encrypt_password, decrypt_password
 from app.utils.email_service import EmailService
+from app.utils.async_email_service import AsyncEmailService
 from app.utils.auth import (
     verify_password,
     get_password_hash,
     create_access_token,
     decode_token,
+    create_blob_signature,
+    verify_blob_signature,
     get_current_user,
     get_client_ip
 )
@@ -13,10 +16,13 @@ __all__ = [
     "encrypt_password",
     "decrypt_password",
     "EmailService",
+    "AsyncEmailService",
     "verify_password",
     "get_password_hash",
     "create_access_token",
     "decode_token",
+    "create_blob_signature",
+    "verify_blob_signature",
     "get_current_user",
     "get_client_ip"
 ]
@@ -0,0 +1,331 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 异步邮件服务 - 在有界线程池中执行阻塞的 IMAP 操作，避免阻塞事件循环
+'''
+import asyncio
+import contextlib
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.utils.crypto import decrypt_password
+from app.utils.email_service import (
+    IMAP_READ_TIMEOUT,
+    TIMEOUT_MESSAGES,
+    EmailService,
+    IMAPTimeoutError,
+    imap_timeouts
+)
+
+# IMAP 线程池大小（同时执行阻塞 IMAP 操作的最大线程数）
+IMAP_WORKER_POOL_SIZE = int(os.getenv("IMAP_WORKER_POOL_SIZE", "16"))
+# 单个 IMAP 操作（获取文件夹、获取一批邮件等）的最长时间（秒）
+IMAP_OPERATION_TIMEOUT = float(os.getenv("IMAP_OPERATION_TIMEOUT", "120"))
+# 线程中的操作超过截止时间后仍未返回（如 DNS 解析阻塞）时，额外等待的时间（秒）
+IMAP_DEADLINE_GRACE = 5
+
+_executor: Optional[ThreadPoolExecutor] = None
+# 调用方设置的截止时间（time.monotonic），范围内的所有 IMAP 操作都不会超过
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("imap_deadline", default=None)
+
+
+@contextlib.contextmanager
+def imap_deadline(seconds: float):
+    """限制范围内所有 IMAP 操作的总耗时，可以嵌套（取最早的截止时间）
+
+    用法:
+        with imap_deadline(30):
+            async with imap_pool.acquire(account) as email_service:
+                await email_service.get_folders()
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_imap_executor() -> ThreadPoolExecutor:
+    """获取 IMAP 线程池"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=IMAP_WORKER_POOL_SIZE,
+            thread_name_prefix="imap"
+        )
+    return _executor
+
+
+def shutdown_imap_executor():
+    """关闭 IMAP 线程池"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class AsyncEmailService:
+    """EmailService 的异步包装，所有 IMAP 调用都在线程池中执行"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_ssl: bool = True,
+        compress: bool = True
+    ):
+        self.service = EmailService(
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            use_ssl=use_ssl,
+            compress=compress
+        )
+        # imaplib 连接不是线程安全的，同一实例的操作需要串行执行
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_account(cls, account) -> "AsyncEmailService":
+        """根据邮箱账户创建服务实例（自动解密密码）"""
+        return cls(
+            host=account.imap_host,
+            port=account.imap_port,
+            username=account.email,
+            password=decrypt_password(account.password),
+            use_ssl=account.use_ssl,
+            compress=account.imap_compress
+        )
+
+    async def _run(self, func, *args, **kwargs):
+        """在 IMAP 线程池中执行阻塞调用"""
+        return await self._run_in(get_imap_executor(), func, *args, **kwargs)
+
+    async def _run_in(
+        self,
+        executor: ThreadPoolExecutor,
+        func,
+        *args,
+        operation_timeout: float = IMAP_OPERATION_TIMEOUT,
+        **kwargs
+    ):
+        """在指定线程池中执行阻塞调用，不超过 operation_timeout 秒和调用方设置的截止时间
+
+        operation_timeout 从线程开始执行操作时计算，在线程池中排队等待的时间不计入；
+        排队期间只受调用方截止时间限制。截止时间传入 EmailService，线程中的读写到期即中断；
+        线程仍未返回时直接关闭 socket。超时抛出 IMAPTimeoutError，连接已关闭。
+        """
+        async with self._lock:
+            outer = _deadline.get()
+            loop = asyncio.get_running_loop()
+            started = asyncio.Event()
+            deadlines: List[float] = []
+
+            def run():
+                deadline = time.monotonic() + operation_timeout
+                if outer is not None and outer < deadline:
+                    deadline = outer
+                deadlines.append(deadline)
+                loop.call_soon_threadsafe(started.set)
+                return self.service.call_with_deadline(deadline, func, *args, **kwargs)
+
+            future = loop.run_in_executor(executor, run)
+            waiter = asyncio.ensure_future(started.wait())
+            try:
+                queue_timeout = None if outer is None else max(outer - time.monotonic(), 0)
+                await asyncio.wait({future, waiter}, timeout=queue_timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            try:
+                if not deadlines:
+                    # 排队到调用方截止时间仍未开始执行
+                    future.cancel()
+                    raise asyncio.TimeoutError()
+                return await asyncio.wait_for(
+                    future, max(deadlines[0] - time.monotonic(), 0) + IMAP_DEADLINE_GRACE
+                )
+            except IMAPTimeoutError:
+                raise
+            except asyncio.TimeoutError:
+                imap_timeouts.record(self.service.host, "operation")
+                self.service._drop_connection()
+                raise IMAPTimeoutError(
+                    self.service.host, "operation", f"IMAP {TIMEOUT_MESSAGES['operation']}: {self.service.host}"
+                )
+
+    async def connect(self) -> bool:
+        """连接到 IMAP 服务器（连接过程不超过 IMAP_CONNECT_TIMEOUT 秒）"""
+        return await self._run(self.service.connect)
+
+    async def disconnect(self):
+        """断开连接（LOGOUT 超时时直接关闭连接）"""
+        try:
+            await self._run(self.service.disconnect, operation_timeout=IMAP_READ_TIMEOUT)
+        except IMAPTimeoutError:
+            pass
+
+    async def noop(self) -> bool:
+        """发送 NOOP 保活，超时视为连接不可用"""
+        try:
+            return await self._run(self.service.noop, operation_timeout=IMAP_READ_TIMEOUT)
+        except IMAPTimeoutError:
+            return False
+
+    def is_connected(self) -> bool:
+        """连接是否处于已登录状态"""
+        return self.service.is_connected()
+
+    def has_capability(self, name: str) -> bool:
+        """服务器是否支持指定扩展"""
+        return self.service.has_capability(name)
+
+    def capabilities(self) -> frozenset:
+        """服务器公布的全部扩展"""
+        return self.service.capabilities()
+
+    def transfer_stats(self) -> Tuple[int, int]:
+        """当前连接累计接收的字节数：(网络传输的字节数, 解压后的字节数)"""
+        return self.service.transfer_stats()
+
+    @property
+    def fetch_failures(self) -> int:
+        """累计获取失败的邮件数"""
+        return self.service.fetch_failures
+
+    async def select_folder(self, folder: str = "INBOX") -> bool:
+        """选择文件夹"""
+        return await self._run(self.service.select_folder, folder)
+
+    async def idle(self, timeout: float, executor: ThreadPoolExecutor) -> bool:
+        """进入 IDLE 等待新邮件通知
+
+        IDLE 会长时间占用线程，必须使用独立的线程池，避免占满 IMAP 线程池。
+        """
+        # IDLE 开始和结束时各最多等待 30 秒响应
+        return await self._run_in(
+            executor, self.service.idle, timeout, operation_timeout=timeout + 60 + IMAP_READ_TIMEOUT
+        )
+
+    def abort(self):
+        """立即关闭底层 socket，用于中断正在阻塞的 IDLE 等操作"""
+        self.service._drop_connection()
+
+    async def test_connection(self) -> Tuple[bool, str]:
+        """测试连接"""
+        try:
+            return await self._run(self.service.test_connection)
+        except IMAPTimeoutError as e:
+            return False, str(e)
+
+    async def get_folders(self) -> List[Dict[str, Any]]:
+        """获取邮件文件夹列表"""
+        return await self._run(self.service.get_folders)
+
+    async def get_emails(
+        self,
+        folder: str = "INBOX",
+        limit: int = 20,
+        offset: int = 0,
+        fetch_body: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """获取邮件列表"""
+        return await self._run(
+            self.service.get_emails,
+            folder=folder,
+            limit=limit,
+            offset=offset,
+            fetch_body=fetch_body
+        )
+
+    async def get_new_emails(
+        self,
+        folder: str = "INBOX",
+        uid_validity: Optional[int] = None,
+        last_uid: int = 0,
+        limit: int = 20,
+        fetch_body: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], int]:
+        """基于 UID 水位线增量获取新邮件"""
+        return await self._run(
+            self.service.get_new_emails,
+            folder=folder,
+            uid_validity=uid_validity,
+            last_uid=last_uid,
+            limit=limit,
+            fetch_body=fetch_body
+        )
+
+    async def get_flag_changes(
+        self,
+        folder: str = "INBOX",
+        uid_validity: Optional[int] = None,
+        highest_modseq: Optional[int] = None,
+        last_uid: int = 0,
+        full_sweep: bool = False,
+        local_count: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """获取已同步邮件的标志变化和已删除的 UID（CONDSTORE/QRESYNC，不支持时分段扫描）"""
+        return await self._run(
+            self.service.get_flag_changes,
+            folder=folder,
+            uid_validity=uid_validity,
+            highest_modseq=highest_modseq,
+            last_uid=last_uid,
+            full_sweep=full_sweep,
+            local_count=local_count
+        )
+
+    async def list_uids(
+        self,
+        folder: str = "INBOX",
+        below_uid: Optional[int] = None,
+        above_uid: Optional[int] = None
+    ) -> Tuple[Optional[int], List[int]]:
+        """列出文件夹中的 UID（升序），用于历史邮件回填和重新绑定 UID"""
+        return await self._run(self.service.list_uids, folder, below_uid, above_uid)
+
+    async def fetch_uids(
+        self,
+        folder: str,
+        uids: List[int],
+        uid_validity: Optional[int] = None,
+        fetch_body: bool = True
+    ) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+        """按 UID 获取一组邮件，返回 (邮件列表, 接收的字节数)"""
+        return await self._run(self.service.fetch_uids, folder, uids, uid_validity, fetch_body)
+
+    async def fetch_key_headers(
+        self,
+        folder: str,
+        uids: List[int],
+        uid_validity: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """按 UID 只获取组成去重键的邮件头"""
+        return await self._run(self.service.fetch_key_headers, folder, uids, uid_validity)
+
+    async def get_email_by_id(self, folder: str, msg_id: str) -> Optional[Dict[str, Any]]:
+        """获取单封邮件详情"""
+        return await self._run(self.service.get_email_by_id, folder, msg_id)
+
+    async def fetch_parts_to_blobs(
+        self,
+        folder: str,
+        uid: int,
+        parts: Dict[str, Optional[str]],
+        message_id: Optional[str] = None
+    ) -> Dict[str, Tuple[str, int]]:
+        """按 UID 获取邮件的指定部分并写入 blob 存储，返回 {部分编号: (SHA-256, 字节数)}"""
+        return await self._run(self.service.fetch_parts_to_blobs, folder, uid, parts, message_id)
+
+    async def __aenter__(self) -> "AsyncEmailService":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
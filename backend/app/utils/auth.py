@@ -5,6 +5,8 @@ LastEditTime: 2026-01-29 22:59:15
 LastEditors: XDTEAM
 Description: JWT 认证工具
 '''
+import hashlib
+import hmac
 import os
 from datetime import datetime, timedelta
 from typing import Optional
@@ -52,6 +54,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_blob_signature(value: str) -> str:
+    """为 blob 地址生成签名，用于 <img> 等无法携带令牌的请求"""
+    digest = hmac.new(SECRET_KEY.encode("utf-8"), f"blob:{value}".encode("utf-8"), hashlib.sha256)
+    return digest.hexdigest()[:32]
+
+
+def verify_blob_signature(value: str, signature: str) -> bool:
+    """校验 blob 地址的签名"""
+    return hmac.compare_digest(create_blob_signature(value), signature or "")
+
+
 def decode_token(token: str) -> dict:
     """解码令牌"""
     try:
@@ -0,0 +1,293 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 历史邮件回填 - 按 UID 从新到旧分段导入整个文件夹，每段完成后记录断点，重启后继续，按邮件数和字节数限速
+'''
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models import BackfillJob, EmailAccount
+from app.utils.imap_pool import imap_pool
+from app.utils.mail_sync import resolve_folder_path, store_emails
+from app.logger import logger
+
+# 每段回填的邮件数量（每段完成后记录一次断点）
+BACKFILL_CHUNK_SIZE = int(os.getenv("BACKFILL_CHUNK_SIZE", "200"))
+# 同时运行的最大回填任务数
+BACKFILL_MAX_JOBS = int(os.getenv("BACKFILL_MAX_JOBS", "2"))
+# 默认每秒最多获取的邮件数，0 表示不限制
+BACKFILL_MAX_MESSAGES_PER_SECOND = float(os.getenv("BACKFILL_MAX_MESSAGES_PER_SECOND", "20"))
+# 默认每秒最多下载的字节数，0 表示不限制
+BACKFILL_MAX_BYTES_PER_SECOND = int(os.getenv("BACKFILL_MAX_BYTES_PER_SECOND", str(2 * 1024 * 1024)))
+# 连续失败多少次后任务标记为失败
+BACKFILL_MAX_RETRIES = int(os.getenv("BACKFILL_MAX_RETRIES", "5"))
+# 失败重试的最大间隔（秒）
+BACKFILL_MAX_BACKOFF = 300
+
+# 未结束的任务状态，重启后自动继续
+ACTIVE_STATUSES = ("pending", "running")
+# 断点保存的字段（不包含 status，避免覆盖暂停操作）
+CHECKPOINT_FIELDS = [
+    "uid_validity", "cursor_uid", "total", "done", "imported", "bytes_fetched", "failed_uids", "error", "updated_at"
+]
+
+
+def pace_delay(count: int, size: int, elapsed: float, max_messages: float, max_bytes: int) -> float:
+    """按限速计算本段结束后需要等待的时间（秒）
+
+    处理 count 封邮件、size 字节至少需要 count / max_messages 和 size / max_bytes 秒，
+    实际耗时不足时补足差值。限速按段平均，段内不做平滑。
+    """
+    needed = 0.0
+    if max_messages > 0:
+        needed = max(needed, count / max_messages)
+    if max_bytes > 0:
+        needed = max(needed, size / max_bytes)
+    return max(0.0, needed - elapsed)
+
+
+class BackfillManager:
+    """回填任务管理器"""
+
+    def __init__(self, max_jobs: int = BACKFILL_MAX_JOBS, chunk_size: int = BACKFILL_CHUNK_SIZE):
+        self.max_jobs = max_jobs
+        self.chunk_size = chunk_size
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._resume_task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # 本次运行的起始时间和起始进度，用于计算速率
+        self._runs: Dict[str, Tuple[float, int]] = {}
+
+    def start(self):
+        """继续重启前未完成的任务（在 lifespan 中调用）"""
+        self._slots = asyncio.Semaphore(self.max_jobs)
+        self._resume_task = asyncio.create_task(self._resume_all())
+
+    async def stop(self):
+        """停止所有任务，任务状态保持不变，下次启动时继续"""
+        tasks = list(self._tasks.values())
+        if self._resume_task:
+            tasks.append(self._resume_task)
+            self._resume_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._runs.clear()
+
+    async def _resume_all(self):
+        try:
+            jobs = await BackfillJob.filter(status__in=ACTIVE_STATUSES)
+        except Exception as e:
+            logger.error(f"加载回填任务失败: {e}")
+            return
+        for job in jobs:
+            logger.info(f"继续回填任务 {job.id}: 已完成 {job.done}/{job.total}")
+            self._schedule(job)
+
+    def _schedule(self, job: BackfillJob):
+        if job.id in self._tasks and not self._tasks[job.id].done():
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_jobs)
+        task = asyncio.create_task(self._run(job.id))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _, job_id=job.id: self._tasks.pop(job_id, None))
+
+    async def create(
+        self,
+        account: EmailAccount,
+        folder: str = "INBOX",
+        max_messages_per_second: Optional[float] = None,
+        max_bytes_per_second: Optional[int] = None
+    ) -> BackfillJob:
+        """创建回填任务；该文件夹已有未完成的任务时继续该任务"""
+        job = await BackfillJob.filter(
+            account_id=account.id, folder=folder, status__in=ACTIVE_STATUSES + ("paused", "failed")
+        ).order_by("-created_at").first()
+        if job is None:
+            job = await BackfillJob.create(account_id=account.id, folder=folder)
+        # 新的限速在任务下次开始运行时生效
+        if max_messages_per_second is not None:
+            job.max_messages_per_second = max_messages_per_second
+        if max_bytes_per_second is not None:
+            job.max_bytes_per_second = max_bytes_per_second
+        await job.save(update_fields=["max_messages_per_second", "max_bytes_per_second", "updated_at"])
+        return await self.resume(job)
+
+    async def pause(self, job: BackfillJob) -> BackfillJob:
+        """暂停任务，已完成的段不受影响"""
+        if job.status in ACTIVE_STATUSES:
+            job.status = "paused"
+            await job.save(update_fields=["status", "updated_at"])
+            task = self._tasks.get(job.id)
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        return job
+
+    async def resume(self, job: BackfillJob) -> BackfillJob:
+        """从断点继续暂停或失败的任务"""
+        if job.status in ("paused", "failed"):
+            job.status = "pending"
+            job.error = None
+            await job.save(update_fields=["status", "error", "updated_at"])
+        if job.status in ACTIVE_STATUSES:
+            self._schedule(job)
+        return job
+
+    async def _run(self, job_id: str):
+        async with self._slots:
+            job = await BackfillJob.get_or_none(id=job_id).prefetch_related("account")
+            if job is None or job.status not in ACTIVE_STATUSES:
+                return
+            job.status = "running"
+            job.started_at = job.started_at or datetime.now()
+            await job.save(update_fields=["status", "started_at", "updated_at"])
+            self._runs[job.id] = (time.monotonic(), job.done)
+            try:
+                await self._backfill(job)
+            finally:
+                self._runs.pop(job.id, None)
+
+    async def _backfill(self, job: BackfillJob):
+        account = job.account
+        max_messages = job.max_messages_per_second or BACKFILL_MAX_MESSAGES_PER_SECOND
+        max_bytes = job.max_bytes_per_second or BACKFILL_MAX_BYTES_PER_SECOND
+        remaining: Optional[List[int]] = None
+        retried = False
+        failures = 0
+        # job.folder 为本地文件夹名，IMAP 操作使用服务器上的文件夹名
+        path = await resolve_folder_path(account, job.folder)
+
+        while True:
+            try:
+                started = time.monotonic()
+                async with imap_pool.acquire(account) as email_service:
+                    if remaining is None:
+                        remaining = await self._list_remaining(job, email_service, path)
+                    if not remaining and job.failed_uids and not retried:
+                        # 全部分段完成后重试一次获取失败的邮件
+                        retried = True
+                        remaining = await self._list_failed(job, email_service, path)
+                    if not remaining:
+                        break
+                    chunk = remaining[-self.chunk_size:]
+                    emails_data, received = await email_service.fetch_uids(path, chunk, job.uid_validity)
+
+                if emails_data is None:
+                    # UIDVALIDITY 变化，断点失效，重新列出 UID
+                    remaining = None
+                    continue
+
+                # 获取或解析失败的邮件记录下来稍后重试，断点照常前进
+                fetched = {email_data["uid"] for email_data in emails_data}
+                failed = [uid for uid in chunk if uid not in fetched]
+                new_count = await store_emails(account, emails_data, folder=job.folder)
+                del remaining[-len(chunk):]
+                job.cursor_uid = min(job.cursor_uid or chunk[0], chunk[0])
+                job.failed_uids = sorted(set(job.failed_uids or []).difference(chunk).union(failed)) or None
+                job.done += len(chunk) - len(failed)
+                job.imported += new_count
+                job.bytes_fetched += received
+                job.error = None
+                await job.save(update_fields=CHECKPOINT_FIELDS)
+                failures = 0
+
+                await asyncio.sleep(pace_delay(len(chunk), received, time.monotonic() - started, max_messages, max_bytes))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                job.error = str(e) or e.__class__.__name__
+                if failures >= BACKFILL_MAX_RETRIES:
+                    job.status = "failed"
+                    await job.save(update_fields=CHECKPOINT_FIELDS + ["status"])
+                    logger.error(f"回填任务 {job.id} 连续失败 {failures} 次，已停止: {job.error}")
+                    return
+                await job.save(update_fields=CHECKPOINT_FIELDS)
+                delay = min(5 * 2 ** failures, BACKFILL_MAX_BACKOFF)
+                logger.warning(f"回填任务 {job.id} 失败，{delay} 秒后重试: {job.error}")
+                await asyncio.sleep(delay)
+
+        if job.failed_uids:
+            job.status = "failed"
+            job.error = f"{len(job.failed_uids)} 封邮件获取失败，继续任务时重试"
+            await job.save(update_fields=CHECKPOINT_FIELDS + ["status"])
+            logger.error(f"回填任务 {job.id}: {job.error}")
+            return
+
+        job.status = "completed"
+        job.finished_at = datetime.now()
+        job.total = job.done
+        await job.save(update_fields=CHECKPOINT_FIELDS + ["status", "finished_at"])
+        logger.success(
+            f"账户 {account.email} 文件夹 {job.folder} 回填完成: 处理 {job.done} 封，新增 {job.imported} 封"
+        )
+
+    async def _list_remaining(self, job: BackfillJob, email_service, path: str) -> List[int]:
+        """列出断点之前（更旧）的全部 UID，并更新任务总数"""
+        uid_validity, uids = await email_service.list_uids(path, job.cursor_uid)
+        if job.uid_validity is not None and uid_validity != job.uid_validity:
+            logger.warning(f"回填任务 {job.id}: 文件夹 {job.folder} 的 UIDVALIDITY 已变化，从头重新回填")
+            job.cursor_uid = None
+            job.done = 0
+            job.failed_uids = None
+            uid_validity, uids = await email_service.list_uids(path)
+        job.uid_validity = uid_validity
+        job.total = job.done + len(job.failed_uids or []) + len(uids)
+        await job.save(update_fields=CHECKPOINT_FIELDS)
+        return uids
+
+    async def _list_failed(self, job: BackfillJob, email_service, path: str) -> List[int]:
+        """列出仍在服务器上的获取失败的 UID，已被删除的从失败列表和任务总数中去掉"""
+        failed = job.failed_uids
+        uid_validity, uids = await email_service.list_uids(path, below_uid=failed[-1] + 1, above_uid=failed[0] - 1)
+        if uid_validity != job.uid_validity:
+            # 由 fetch_uids 检测到 UIDVALIDITY 变化后从头重新回填
+            return list(failed)
+        existing = set(uids)
+        job.failed_uids = [uid for uid in failed if uid in existing] or None
+        job.total -= len(failed) - len(job.failed_uids or [])
+        await job.save(update_fields=CHECKPOINT_FIELDS)
+        return list(job.failed_uids or [])
+
+    def to_response(self, job: BackfillJob) -> Dict[str, Any]:
+        """任务进度（速率按本次运行计算，用于估算剩余时间）"""
+        rate = None
+        eta = None
+        run = self._runs.get(job.id)
+        if run and job.status == "running":
+            elapsed = time.monotonic() - run[0]
+            if elapsed > 0 and job.done > run[1]:
+                rate = round((job.done - run[1]) / elapsed, 2)
+                eta = round(max(job.total - job.done, 0) / rate)
+        return {
+            "id": job.id,
+            "accountId": job.account_id,
+            "folder": job.folder,
+            "status": job.status,
+            "total": job.total,
+            "done": job.done,
+            "imported": job.imported,
+            "percent": round(job.done * 100 / job.total, 1) if job.total else (100.0 if job.status == "completed" else 0.0),
+            "bytesFetched": job.bytes_fetched,
+            "failedCount": len(job.failed_uids or []),
+            "rate": rate,
+            "etaSeconds": eta,
+            "maxMessagesPerSecond": job.max_messages_per_second or BACKFILL_MAX_MESSAGES_PER_SECOND,
+            "maxBytesPerSecond": job.max_bytes_per_second or BACKFILL_MAX_BYTES_PER_SECOND,
+            "error": job.error,
+            "startedAt": job.started_at.isoformat() if job.started_at else None,
+            "finishedAt": job.finished_at.isoformat() if job.finished_at else None,
+            "createdAt": job.created_at.isoformat() if job.created_at else None,
+            "updatedAt": job.updated_at.isoformat() if job.updated_at else None
+        }
+
+
+# 全局回填任务管理器
+backfill_manager = BackfillManager()
@@ -0,0 +1,156 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 内容寻址的 blob 存储 - 附件等二进制内容按 SHA-256 保存在磁盘上，相同内容只保存一份；支持 Range、ETag 的流式下载
+'''
+import hashlib
+import os
+import re
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+# blob 存储目录
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "./data/blobs")
+# 下载时每次从磁盘读取的字节数
+BLOB_CHUNK_SIZE = 64 * 1024
+
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class BlobStore:
+    """按 SHA-256 寻址的文件存储，路径为 <root>/<前2位>/<前2-4位>/<sha256>
+
+    写入先落到临时文件，计算哈希后原子重命名，并发写入相同内容时只保留一份。
+    """
+
+    def __init__(self, root: str = BLOB_STORE_DIR):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        if not DIGEST_PATTERN.match(digest or ""):
+            raise ValueError(f"无效的 blob 摘要: {digest}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: Optional[str]) -> bool:
+        return bool(digest) and os.path.isfile(self.path(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self.path(digest))
+
+    def write(self, chunks: Iterable[bytes]) -> Tuple[str, int]:
+        """流式写入内容，返回 (SHA-256, 字节数)，内容已存在时不重复保存"""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            hex_digest = digest.hexdigest()
+            path = self.path(hex_digest)
+            if os.path.isfile(path):
+                os.unlink(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return hex_digest, size
+
+    def write_bytes(self, data: bytes) -> Tuple[str, int]:
+        return self.write([data])
+
+    def iter_range(self, digest: str, start: int, end: int) -> Iterator[bytes]:
+        """逐块读取 [start, end] 范围内的内容（含 end）"""
+        with open(self.path(digest), "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(BLOB_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """解析单段 Range 头，返回 (start, end)；没有 Range 或格式不支持时返回 None（返回完整内容）
+
+    范围无法满足时抛出 ValueError。
+    """
+    match = RANGE_PATTERN.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # bytes=-n：最后 n 个字节
+        length = int(last)
+        if length == 0:
+            raise ValueError("无法满足的范围")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("无法满足的范围")
+    return start, end
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def blob_response(
+    request: Request,
+    digest: str,
+    media_type: str = "application/octet-stream",
+    headers: Optional[Dict[str, str]] = None,
+    store: Optional[BlobStore] = None
+) -> Response:
+    """从磁盘流式返回 blob，支持 ETag/If-None-Match（304）和单段 Range（206/416）
+
+    内容按 SHA-256 寻址不会变化，ETag 直接使用摘要。
+    """
+    store = store or blob_store
+    etag = f'"{digest}"'
+    base_headers = {"ETag": etag, "Accept-Ranges": "bytes", **(headers or {})}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=base_headers)
+
+    size = store.size(digest)
+    byte_range = None
+    if "range" in request.headers and _etag_matches(request.headers.get("if-range") or etag, etag):
+        try:
+            byte_range = parse_range(request.headers["range"], size)
+        except ValueError:
+            return Response(status_code=416, headers={**base_headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        base_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    base_headers["Content-Length"] = str(max(end - start + 1, 0))
+    # 同步生成器由 Starlette 在线程池中迭代，读取磁盘不阻塞事件循环
+    return StreamingResponse(
+        store.iter_range(digest, start, end) if size else iter(()),
+        status_code=status_code,
+        media_type=media_type,
+        headers=base_headers
+    )
+
+
+# 全局 blob 存储
+blob_store = BlobStore()
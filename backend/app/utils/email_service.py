@@ -1,11 +1,595 @@
 import imaplib
 import email
+import collections
+import base64
+import quopri
 from email.header import decode_header
+from email.message import Message
 from email.utils import parseaddr, parsedate_to_datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union, IO
 import ssl
+import re
+import os
+import contextlib
+import functools
+import io
+import socket
+import tempfile
+import threading
+import time
+import zlib
 
 from app.logger import logger
+from app.utils.imap_parser import (
+    parse_fetch_response,
+    parse_list_response,
+    parse_sequence_set,
+    parse_status_response,
+    tokenize,
+    walk_bodystructure
+)
+from app.utils.blob_store import blob_store
+from app.utils.mime_stream import MimePart, iter_chunks, iter_decoded, parse_stream
+from app.utils.mime_pool import mime_pool
+
+# 从 FETCH 响应中提取 UID
+UID_PATTERN = re.compile(rb"UID (\d+)")
+# FETCH 响应开头的邮件序号，如 b"1201 (UID 5 BODY[] {1234}"
+SEQ_PATTERN = re.compile(rb"^(\d+) \(")
+# 从 FETCH 响应中提取标志，如 b"FLAGS (\\Seen \\Flagged)"
+FLAGS_PATTERN = re.compile(rb"FLAGS \(([^)]*)\)")
+
+# FETCH 响应中字面量所属的部分，如 b"1 (UID 5 BODY[2] {1234}" 或 b" BODY[1.2]<0> {56}"
+BODY_SECTION_PATTERN = re.compile(rb"BODY\[([^\]]*)\](?:<\d+>)? \{\d+\}$")
+
+# IDLE 期间服务器推送的新邮件通知，如 b"* 23 EXISTS"
+EXISTS_PATTERN = re.compile(rb"^\* \d+ EXISTS")
+
+# 单条 FETCH 命令最多包含的邮件数量
+FETCH_BATCH_SIZE = int(os.getenv("IMAP_FETCH_BATCH_SIZE", "50"))
+
+# 获取正文的方式：structure 先取 BODYSTRUCTURE 再只下载文本部分，full 下载完整邮件
+IMAP_FETCH_MODE = os.getenv("IMAP_FETCH_MODE", "structure").lower()
+
+# 不支持 CONDSTORE 的服务器按 UID 分段全量拉取标志时，每条 FETCH 覆盖的 UID 数量
+IMAP_FLAG_SWEEP_CHUNK = int(os.getenv("IMAP_FLAG_SWEEP_CHUNK", "1000"))
+
+# 同一连接上同时在途的命令数（流水线深度），1 表示每条命令都等上一条完成再发送
+IMAP_PIPELINE_DEPTH = int(os.getenv("IMAP_PIPELINE_DEPTH", "4"))
+
+# 流水线发送 STATUS 时同时在途的命令数量（避免双方发送缓冲区同时写满）
+STATUS_PIPELINE_BATCH = 50
+# 不能 SELECT/STATUS 的文件夹属性
+NOSELECT_FLAGS = {"\\noselect", "\\nonexistent"}
+
+# 单个邮件部分在内存中保留的最大字节数，超出的部分和大邮件的原始内容写入临时文件
+IMAP_MIME_MAX_PART_MEMORY = int(os.getenv("IMAP_MIME_MAX_PART_MEMORY", str(1024 * 1024)))
+
+# IMAP ID 命令的客户端标识（RFC 2971）
+IMAP_ID = '("name" "EmailAdmin" "version" "1.0.0" "vendor" "EmailAdmin" "support-email" "admin@emailadmin.com")'
+
+# 服务器支持 COMPRESS=DEFLATE 时是否开启压缩（全局开关，也可以按账户关闭）
+IMAP_COMPRESS = os.getenv("IMAP_COMPRESS", "true").lower() == "true"
+
+# 重连同一服务器时恢复 TLS 会话（TLS 1.2 会话 ID / TLS 1.3 会话票据），跳过完整握手
+IMAP_TLS_SESSION_CACHE = os.getenv("IMAP_TLS_SESSION_CACHE", "true").lower() == "true"
+# 最多缓存 TLS 会话的服务器数量
+IMAP_TLS_SESSION_CACHE_SIZE = int(os.getenv("IMAP_TLS_SESSION_CACHE_SIZE", "256"))
+
+# 建立连接的最长时间（秒）：TCP 连接、TLS 握手、问候、登录及登录后的协商
+IMAP_CONNECT_TIMEOUT = float(os.getenv("IMAP_CONNECT_TIMEOUT", "15"))
+# 等待服务器响应的最长时间（秒），每次从 socket 读取都重新计时
+IMAP_READ_TIMEOUT = float(os.getenv("IMAP_READ_TIMEOUT", "30"))
+
+# imaplib 不认识 ID 和 COMPRESS 命令，注册后才能通过 _command/_simple_command 发送
+imaplib.Commands.setdefault("ID", ("NONAUTH", "AUTH", "SELECTED"))
+imaplib.Commands.setdefault("COMPRESS", ("AUTH", "SELECTED"))
+
+
+def build_message_set(msg_ids: List[int]) -> str:
+    """将序号/UID 列表压缩为 IMAP 消息集合，如 [1, 2, 3, 7] -> 1:3,7"""
+    ranges = []
+    for msg_id in sorted(set(msg_ids)):
+        if ranges and msg_id == ranges[-1][1] + 1:
+            ranges[-1][1] = msg_id
+        else:
+            ranges.append([msg_id, msg_id])
+    return ",".join(f"{a}:{b}" if a != b else str(a) for a, b in ranges)
+
+
+def split_message_sets(msg_ids: List[int], size: int = FETCH_BATCH_SIZE) -> List[str]:
+    """按每条 FETCH 最多 size 封邮件拆分为多个消息集合"""
+    return [build_message_set(msg_ids[start:start + size]) for start in range(0, len(msg_ids), size)]
+
+
+def split_fetch_response(msg_data: list) -> List[Dict[str, Any]]:
+    """将 imaplib 返回的多封邮件 FETCH 响应拆分为逐封记录
+
+    imaplib 把 "* n FETCH (... {size}" 与随后的字面量合成一个元组，
+    字面量之后的剩余部分（如 b" UID 12)" 或 b")"）作为单独的 bytes 返回。
+
+    Returns:
+        List[Dict]: [{seq, uid, flags, literals}]
+    """
+    records = []
+    for item in msg_data:
+        if isinstance(item, tuple):
+            header, literal = item[0], item[1]
+            seq_match = SEQ_PATTERN.match(header)
+            if seq_match or not records:
+                records.append({
+                    "seq": int(seq_match.group(1)) if seq_match else None,
+                    "uid": None,
+                    "flags": None,
+                    "literals": []
+                })
+            record = records[-1]
+            record["literals"].append(literal)
+        elif isinstance(item, bytes):
+            seq_match = SEQ_PATTERN.match(item)
+            if seq_match:
+                # 不含字面量的响应，如 b"5 (UID 12 FLAGS (\\Seen))"
+                records.append({"seq": int(seq_match.group(1)), "uid": None, "flags": None, "literals": []})
+            elif not records:
+                continue
+            header = item
+            record = records[-1]
+        else:
+            continue
+
+        if record["uid"] is None:
+            uid_match = UID_PATTERN.search(header)
+            if uid_match:
+                record["uid"] = int(uid_match.group(1))
+        if record["flags"] is None:
+            flags_match = FLAGS_PATTERN.search(header)
+            if flags_match:
+                record["flags"] = flags_match.group(1).decode(errors="ignore").split()
+
+    return records
+
+
+def decode_transfer_encoding(data: bytes, encoding: Optional[str]) -> bytes:
+    """按 Content-Transfer-Encoding 解码部分内容"""
+    encoding = (encoding or "").lower()
+    if encoding == "base64":
+        return base64.b64decode(data)
+    if encoding == "quoted-printable":
+        return quopri.decodestring(data)
+    return data
+
+
+def decode_text(data: bytes, charset: Optional[str]) -> str:
+    """按字符集解码文本，未知字符集时回退到 UTF-8"""
+    try:
+        return data.decode(charset or "utf-8", errors="ignore")
+    except LookupError:
+        return data.decode("utf-8", errors="ignore")
+
+
+def estimate_decoded_size(size: int, encoding: Optional[str]) -> int:
+    """根据编码后大小估算解码后的大小（base64 每 78 字节一行对应 57 字节原文）"""
+    if (encoding or "").lower() == "base64":
+        return size * 57 // 78
+    return size
+
+
+def classify_parts(
+    parts: List[Dict[str, Any]]
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """将 BODYSTRUCTURE 展开后的部分分类
+
+    Returns:
+        Tuple:
+            - text_part: 纯文本正文部分
+            - html_part: HTML 正文部分
+            - attachments: 附件列表（只含部分编号，不含内容）
+            - inline_images: 内嵌图片 {cid: {content_type, part, encoding}}（不含内容）
+    """
+    text_part = None
+    html_part = None
+    attachments = []
+    inline_images = {}
+
+    for part in parts:
+        content_type = part["content_type"]
+        if part["content_id"] and content_type.startswith("image/"):
+            inline_images[part["content_id"]] = {
+                "content_type": content_type,
+                "part": part["section"],
+                "encoding": part["encoding"]
+            }
+        elif part["disposition"] == "attachment":
+            if part["filename"]:
+                attachments.append({
+                    "filename": part["filename"],
+                    "content_type": content_type,
+                    "size": estimate_decoded_size(part["size"], part["encoding"]),
+                    "part": part["section"],
+                    "encoding": part["encoding"]
+                })
+        elif content_type == "text/plain" and text_part is None:
+            text_part = part
+        elif content_type == "text/html" and html_part is None:
+            html_part = part
+
+    return text_part, html_part, attachments, inline_images
+
+
+TIMEOUT_MESSAGES = {"connect": "建立连接超时", "read": "等待服务器响应超时", "operation": "操作超时"}
+
+
+class IMAPTimeoutError(TimeoutError):
+    """IMAP 操作超时，超时的连接已关闭，不会再被复用
+
+    kind: connect（建立连接）、read（等待响应）或 operation（超过操作的截止时间）
+    """
+
+    def __init__(self, host: str, kind: str, message: str):
+        super().__init__(message)
+        self.host = host
+        self.kind = kind
+
+
+class _TimeoutAbort(imaplib.IMAP4.abort):
+    """连接读写超时，连接已不可用（imaplib 层按连接中断处理）"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class IMAPTimeoutStats:
+    """按服务器统计超时次数"""
+
+    KINDS = ("connect", "read", "operation")
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, kind: str):
+        with self._lock:
+            counts = self._counts.setdefault(host, dict.fromkeys(self.KINDS, 0))
+            counts[kind] += 1
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """各服务器的超时次数（connect/read/operation 及合计）"""
+        with self._lock:
+            return [
+                {"host": host, **counts, "total": sum(counts.values())}
+                for host, counts in sorted(self._counts.items())
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+# 全局超时统计
+imap_timeouts = IMAPTimeoutStats()
+
+
+def reconnect_on_abort(func):
+    """连接被服务器中断（imaplib.IMAP4.abort）时自动重连并重试一次，超时不重试"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except imaplib.IMAP4.abort as e:
+            if self._connection_timeout_kind():
+                raise
+            logger.warning(f"IMAP 连接已中断，正在重连: {e}")
+            self._drop_connection()
+            try:
+                return func(self, *args, **kwargs)
+            except imaplib.IMAP4.abort:
+                self._drop_connection()
+                raise
+    return wrapper
+
+
+def close_literal(literal):
+    """释放写入临时文件的字面量"""
+    if hasattr(literal, "close"):
+        literal.close()
+
+
+class _LiteralSpoolMixin:
+    """超过阈值的字面量分块读入临时文件，避免大邮件整体读入内存
+
+    spool_threshold 为 None 时与 imaplib 行为一致；启用后超过阈值的字面量
+    以文件对象（已定位到开头）代替 bytes 返回。同时统计从服务器接收的字节数。
+    """
+
+    spool_threshold: Optional[int] = None
+    bytes_received: int = 0
+
+    def readline(self) -> bytes:
+        line = super().readline()
+        self.bytes_received += len(line)
+        return line
+
+    def read(self, size: int):
+        if self.spool_threshold is None or size <= self.spool_threshold:
+            data = super().read(size)
+            self.bytes_received += len(data)
+            return data
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        remaining = size
+        while remaining > 0:
+            chunk = super().read(min(remaining, 64 * 1024))
+            if not chunk:
+                spool.close()
+                raise imaplib.IMAP4.abort("socket error: EOF")
+            spool.write(chunk)
+            remaining -= len(chunk)
+            self.bytes_received += len(chunk)
+        spool.seek(0)
+        return spool
+
+
+class _DeflateReader(io.RawIOBase):
+    """从 socket 读取 DEFLATE 压缩的数据流并解压（RFC 4978），统计网络上实际接收的字节数"""
+
+    # 每次解压输出的最大字节数，避免一小段压缩数据在内存中展开过大
+    MAX_CHUNK = 256 * 1024
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.wire_bytes = 0
+        self.pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def feed(self, data: bytes) -> bytes:
+        """解压一段从 socket 读取的数据（供 IDLE 直接读取 socket 时使用）"""
+        self.wire_bytes += len(data)
+        out = self.pending + self.decompressor.decompress(self.decompressor.unconsumed_tail)
+        self.pending = b""
+        return out + self.decompressor.decompress(data)
+
+    def readinto(self, buffer) -> int:
+        while not self.pending:
+            if self.decompressor.unconsumed_tail:
+                data = self.decompressor.unconsumed_tail
+            else:
+                data = self.sock.recv(64 * 1024)
+                if not data:
+                    return 0
+                self.wire_bytes += len(data)
+            self.pending = self.decompressor.decompress(data, self.MAX_CHUNK)
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+class _DeflateMixin:
+    """COMPRESS DEFLATE 成功后，读写都经过 DEFLATE 压缩（RFC 4978）
+
+    读取时把 imaplib 的缓冲文件对象替换为解压流，发送时压缩并同步刷新，
+    对 imaplib 的其余逻辑透明。
+    """
+
+    inflater: Optional[_DeflateReader] = None
+    deflater = None
+
+    def start_compression(self):
+        """在 COMPRESS 命令返回 OK 后立即调用"""
+        self.inflater = _DeflateReader(self.sock)
+        self.file.close()
+        self.file = io.BufferedReader(self.inflater, buffer_size=64 * 1024)
+        self.deflater = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    def send(self, data: bytes):
+        if self.deflater is not None:
+            data = self.deflater.compress(data) + self.deflater.flush(zlib.Z_SYNC_FLUSH)
+        super().send(data)
+
+    @property
+    def wire_bytes_received(self) -> int:
+        """网络上实际接收的字节数，未压缩时与 bytes_received 相同"""
+        return self.inflater.wire_bytes if self.inflater else self.bytes_received
+
+
+_ssl_context: Optional[ssl.SSLContext] = None
+_ssl_context_lock = threading.Lock()
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """进程内共享的 SSL 上下文
+
+    create_default_context 每次都会重新加载系统 CA 证书，且 TLS 会话只能在创建它的上下文中恢复，
+    因此所有 IMAP 连接共用同一个上下文（SSLContext 可以跨线程使用）。
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        with _ssl_context_lock:
+            if _ssl_context is None:
+                _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+class TLSSessionCache:
+    """按服务器缓存最近一次的 TLS 会话，并统计完整握手和会话恢复的次数"""
+
+    def __init__(self, max_size: int = IMAP_TLS_SESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._sessions: "collections.OrderedDict[Tuple[str, int], ssl.SSLSession]" = collections.OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, port: int) -> Optional[ssl.SSLSession]:
+        """获取可用于恢复的会话，已过期的会话直接丢弃"""
+        with self._lock:
+            session = self._sessions.get((host, port))
+            if session is None:
+                return None
+            if session.time + session.timeout <= time.time():
+                del self._sessions[(host, port)]
+                return None
+            self._sessions.move_to_end((host, port))
+            return session
+
+    def put(self, host: str, port: int, session: Optional[ssl.SSLSession]):
+        """保存连接的会话（TLS 1.3 的会话票据在握手后才收到，应在读取过服务器响应后保存）"""
+        if session is None:
+            return
+        with self._lock:
+            self._sessions[(host, port)] = session
+            self._sessions.move_to_end((host, port))
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+
+    def record(self, host: str, port: int, resumed: bool):
+        """记录一次 TLS 握手"""
+        with self._lock:
+            stats = self._stats.setdefault(f"{host}:{port}", {"handshakes": 0, "resumed": 0})
+            stats["handshakes"] += 1
+            if resumed:
+                stats["resumed"] += 1
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """各服务器的握手次数和会话恢复率"""
+        with self._lock:
+            return [
+                {
+                    "host": host,
+                    "handshakes": stats["handshakes"],
+                    "resumed": stats["resumed"],
+                    "resumeRate": round(stats["resumed"] / stats["handshakes"], 3) if stats["handshakes"] else 0.0
+                }
+                for host, stats in sorted(self._stats.items())
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._stats.clear()
+
+
+# 全局 TLS 会话缓存
+tls_sessions = TLSSessionCache()
+
+
+class _DeadlineMixin:
+    """每次读写前按读取超时和操作截止时间设置 socket 超时，超时后关闭连接
+
+    read_timeout 为 None 时（构造连接期间）沿用创建 socket 时的连接超时。
+    超时抛出 _TimeoutAbort，连接随即关闭并标记 timeout_kind，之后不能再使用。
+    """
+
+    read_timeout: Optional[float] = None
+    # 当前操作的截止时间（time.monotonic），None 表示不限制
+    deadline: Optional[float] = None
+    # 截止时间来自建立连接（connect）还是操作本身（operation）
+    deadline_kind = "operation"
+    timeout_kind: Optional[str] = None
+
+    def _arm(self) -> str:
+        """设置本次读写的 socket 超时，返回超时后记录的类型"""
+        if self.timeout_kind:
+            raise _TimeoutAbort(self.timeout_kind, "连接已超时关闭")
+        if self.read_timeout is None:
+            return "connect"
+        timeout, kind = self.read_timeout, "read"
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                self._timed_out(self.deadline_kind)
+            if remaining < timeout:
+                timeout, kind = remaining, self.deadline_kind
+        self.sock.settimeout(timeout)
+        return kind
+
+    def _timed_out(self, kind: str):
+        self.timeout_kind = kind
+        imap_timeouts.record(self.host, kind)
+        try:
+            self.shutdown()
+        except Exception:
+            pass
+        raise _TimeoutAbort(kind, f"{TIMEOUT_MESSAGES[kind]}: {self.host}")
+
+    def readline(self) -> bytes:
+        kind = self._arm()
+        try:
+            return super().readline()
+        except (socket.timeout, ssl.SSLWantReadError):
+            self._timed_out(kind)
+
+    def read(self, size: int):
+        kind = self._arm()
+        try:
+            return super().read(size)
+        except (socket.timeout, ssl.SSLWantReadError):
+            self._timed_out(kind)
+
+    def send(self, data: bytes):
+        kind = self._arm()
+        try:
+            super().send(data)
+        except socket.timeout:
+            self._timed_out(kind)
+
+
+class IMAP4Client(_DeadlineMixin, _DeflateMixin, _LiteralSpoolMixin, imaplib.IMAP4):
+    """支持超时、字面量转存和压缩的 IMAP4 连接"""
+
+
+class IMAP4SSLClient(_DeadlineMixin, _DeflateMixin, _LiteralSpoolMixin, imaplib.IMAP4_SSL):
+    """支持超时、字面量转存、压缩和 TLS 会话恢复的 IMAP4_SSL 连接"""
+
+    def _create_socket(self, timeout):
+        sock = imaplib.IMAP4._create_socket(self, timeout)
+        session = tls_sessions.get(self.host, self.port) if IMAP_TLS_SESSION_CACHE else None
+        try:
+            return self.ssl_context.wrap_socket(sock, server_hostname=self.host, session=session)
+        except Exception:
+            sock.close()
+            raise
+
+    def remember_tls_session(self):
+        """记录本次握手是否恢复了会话，并保存新的会话供下次连接使用"""
+        tls_sessions.record(self.host, self.port, self.sock.session_reused)
+        if IMAP_TLS_SESSION_CACHE:
+            tls_sessions.put(self.host, self.port, self.sock.session)
+
+
+class _SocketLineReader:
+    """直接从 socket 按行读取，支持超时（绕过 imaplib 的缓冲文件对象）
+
+    imaplib 的 makefile 缓冲区在 socket 超时后状态不确定，
+    因此 IDLE 期间的读取不经过 imaplib.readline。
+    """
+
+    def __init__(self, sock, inflater: Optional[_DeflateReader] = None):
+        self.sock = sock
+        self.inflater = inflater
+        self.buffer = b""
+
+    def readline(self, timeout: float) -> Optional[bytes]:
+        """读取一行，超时返回 None"""
+        deadline = time.monotonic() + timeout
+        while b"\r\n" not in self.buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                chunk = self.sock.recv(4096)
+            except (socket.timeout, ssl.SSLWantReadError):
+                return None
+            if not chunk:
+                raise imaplib.IMAP4.abort("socket error: EOF")
+            if self.inflater is not None:
+                chunk = self.inflater.feed(chunk)
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\r\n", 1)
+        return line
 
 
 class EmailService:
@@ -17,72 +601,292 @@ class EmailService:
         port: int,
         username: str,
         password: str,
-        use_ssl: bool = True
+        use_ssl: bool = True,
+        compress: bool = True
     ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.use_ssl = use_ssl
+        self.compress = compress
         self.connection: Optional[imaplib.IMAP4] = None
+        # 已通过 ENABLE 启用的扩展
+        self.enabled: set = set()
+        # 当前连接是否已开启 COMPRESS=DEFLATE
+        self.compressed = False
+        # 累计获取失败的邮件数（FETCH 失败、解析失败或获取期间已被删除）
+        self.fetch_failures = 0
+        # 当前操作的截止时间（time.monotonic），由 call_with_deadline 设置
+        self.deadline: Optional[float] = None
+        # 建立连接期间发生的超时类型（连接对象创建之前的超时无法记录在连接上）
+        self.timeout_kind: Optional[str] = None
 
     def connect(self) -> bool:
-        """连接到 IMAP 服务器"""
+        """连接到 IMAP 服务器
+
+        整个连接过程（TCP、TLS 握手、登录及登录后的协商）不超过 IMAP_CONNECT_TIMEOUT 秒，
+        也不超过当前操作的截止时间。
+        """
+        started = time.monotonic()
+        deadline, deadline_kind = started + IMAP_CONNECT_TIMEOUT, "connect"
+        if self.deadline is not None and self.deadline < deadline:
+            deadline, deadline_kind = self.deadline, "operation"
         try:
+            timeout = deadline - started
+            if timeout <= 0:
+                imap_timeouts.record(self.host, deadline_kind)
+                raise _TimeoutAbort(deadline_kind, f"{TIMEOUT_MESSAGES[deadline_kind]}: {self.host}")
             if self.use_ssl:
-                context = ssl.create_default_context()
-                self.connection = imaplib.IMAP4_SSL(
-                    self.host, self.port, ssl_context=context
+                self.connection = IMAP4SSLClient(
+                    self.host, self.port, ssl_context=get_ssl_context(), timeout=timeout
                 )
             else:
-                self.connection = imaplib.IMAP4(self.host, self.port)
+                self.connection = IMAP4Client(self.host, self.port, timeout=timeout)
+            self.connection.read_timeout = IMAP_READ_TIMEOUT
+            self.connection.deadline = deadline
+            self.connection.deadline_kind = deadline_kind
 
             self.connection.login(self.username, self.password)
+            if self.use_ssl:
+                self.connection.remember_tls_session()
             
-            # 发送 IMAP ID 命令（163邮箱等需要此命令来标识客户端）
+            # 发送 IMAP ID 命令（163邮箱等需要此命令来标识客户端）并重新获取服务器能力
             self._send_id_command()
-            
+            self._enable_compression()
+            self._enable_extensions()
+
+            self.connection.deadline = self.deadline
+            self.connection.deadline_kind = "operation"
             return True
         except Exception as e:
+            if isinstance(e, _TimeoutAbort):
+                self.timeout_kind = e.kind
+            elif self._connection_timeout_kind():
+                self.timeout_kind = self._connection_timeout_kind()
+            elif isinstance(e, TimeoutError):
+                # TCP 连接或 TLS 握手超时（连接对象尚未创建）
+                self.timeout_kind = "connect" if deadline_kind == "connect" else "operation"
+                imap_timeouts.record(self.host, self.timeout_kind)
             logger.error(f"连接失败: {e}")
             return False
 
+    def call_with_deadline(self, deadline: Optional[float], func, *args, **kwargs):
+        """在截止时间（time.monotonic）之前执行一个操作
+
+        操作中任何一次读写超时或超过截止时间，连接都会被关闭（不再复用）并抛出 IMAPTimeoutError，
+        即使操作本身捕获了异常并返回了默认值。
+        """
+        self.deadline = deadline
+        self.timeout_kind = None
+        if self.connection is not None:
+            self.connection.deadline = deadline
+        try:
+            result = func(*args, **kwargs)
+        except imaplib.IMAP4.abort:
+            # imaplib 会把读取中的 abort 重新包装，超时以连接上的标记为准
+            if not (self.timeout_kind or self._connection_timeout_kind()):
+                raise
+            result = None
+        finally:
+            self.deadline = None
+            if self.connection is not None:
+                self.connection.deadline = None
+        kind = self.timeout_kind or self._connection_timeout_kind()
+        if kind:
+            self._drop_connection()
+            raise IMAPTimeoutError(self.host, kind, f"IMAP {TIMEOUT_MESSAGES[kind]}: {self.host}")
+        return result
+
     def _send_id_command(self):
-        """发送 IMAP ID 命令，用于标识客户端（163邮箱等需要）"""
+        """发送 IMAP ID 命令标识客户端（163邮箱等需要），同时重新获取服务器能力
+
+        Gmail 等在认证后才公布 CONDSTORE 等扩展，登录后需要重新获取；
+        ID 和 CAPABILITY 互不依赖，流水线发送只需一次网络往返。
+        """
         try:
-            id_string = '("name" "EmailAdmin" "version" "1.0.0" "vendor" "EmailAdmin" "support-email" "admin@emailadmin.com")'
-            
-            tag = self.connection._new_tag()
-            if isinstance(tag, bytes):
-                tag = tag.decode()
-            
-            cmd = f'{tag} ID {id_string}\r\n'
-            self.connection.send(cmd.encode())
-            
-            # 读取响应直到收到带有标签的响应行
-            while True:
-                line = self.connection.readline()
-                if not line:
-                    break
-                line_str = line.decode('utf-8', errors='ignore').strip()
-                
-                if line_str.startswith(tag):
-                    if 'OK' in line_str:
-                        logger.debug("IMAP ID 命令发送成功")
-                    break
-                    
+            results, data = self._pipeline([("ID", IMAP_ID), ("CAPABILITY",)], collect="CAPABILITY")
         except Exception as e:
             logger.warning(f"发送 ID 命令失败: {e}")
+            return
+        self.connection.untagged_responses.pop("ID", None)
+
+        if results[0] == "OK":
+            logger.debug("IMAP ID 命令发送成功")
+        if results[1] == "OK" and data and data[-1]:
+            self.connection.capabilities = tuple(data[-1].decode().upper().split())
+
+    def _enable_compression(self):
+        """服务器支持 COMPRESS=DEFLATE 时开启压缩（RFC 4978），之后的命令和响应都经过压缩"""
+        self.compressed = False
+        if not (self.compress and IMAP_COMPRESS) or not self.has_capability("COMPRESS=DEFLATE"):
+            return
+        try:
+            status, _ = self.connection._simple_command("COMPRESS", "DEFLATE")
+        except imaplib.IMAP4.abort:
+            raise
+        except Exception as e:
+            logger.debug(f"开启 COMPRESS=DEFLATE 失败: {e}")
+            return
+        if status == "OK":
+            self.connection.start_compression()
+            self.compressed = True
+
+    def transfer_stats(self) -> Tuple[int, int]:
+        """当前连接累计接收的字节数：(网络传输的字节数, 解压后的字节数)，未压缩时两者相同"""
+        if not self.connection:
+            return 0, 0
+        return self.connection.wire_bytes_received, self.connection.bytes_received
+
+    def _enable_extensions(self):
+        """启用 QRESYNC（包含 CONDSTORE），使 SELECT 返回 HIGHESTMODSEQ"""
+        self.enabled = set()
+        if not self.has_capability("ENABLE"):
+            return
+        for name in ("QRESYNC", "CONDSTORE"):
+            if self.has_capability(name):
+                try:
+                    status, _ = self.connection.enable(name)
+                    if status == "OK":
+                        self.enabled.add(name)
+                        if name == "QRESYNC":
+                            self.enabled.add("CONDSTORE")
+                        break
+                except imaplib.IMAP4.abort:
+                    raise
+                except Exception as e:
+                    logger.debug(f"启用 {name} 失败: {e}")
+
+    def _connection_timeout_kind(self) -> Optional[str]:
+        """当前连接因超时关闭时返回超时类型"""
+        return self.connection.timeout_kind if self.connection is not None else None
+
+    def _keep_timeout_kind(self):
+        """丢弃连接前保留其超时类型，供 call_with_deadline 判断"""
+        if self._connection_timeout_kind():
+            self.timeout_kind = self._connection_timeout_kind()
 
     def disconnect(self):
         """断开连接"""
         if self.connection:
+            self._keep_timeout_kind()
             try:
                 self.connection.logout()
             except Exception:
                 pass
             self.connection = None
 
+    def _drop_connection(self):
+        """丢弃已中断的连接（不发送 LOGOUT）"""
+        if self.connection:
+            self._keep_timeout_kind()
+            try:
+                self.connection.shutdown()
+            except Exception:
+                pass
+            self.connection = None
+
+    @contextlib.contextmanager
+    def _spooled_literals(self):
+        """在此范围内读取的大字面量写入临时文件"""
+        self.connection.spool_threshold = IMAP_MIME_MAX_PART_MEMORY
+        try:
+            yield
+        finally:
+            if self.connection:
+                self.connection.spool_threshold = None
+
+    def is_connected(self) -> bool:
+        """连接是否处于已登录状态"""
+        return self.connection is not None and self.connection.state in ("AUTH", "SELECTED")
+
+    def noop(self) -> bool:
+        """发送 NOOP 保活，连接失效时返回 False 并丢弃连接"""
+        if not self.is_connected():
+            return False
+        try:
+            status, _ = self.connection.noop()
+            return status == "OK"
+        except Exception as e:
+            logger.debug(f"NOOP 失败: {e}")
+            self._drop_connection()
+            return False
+
+    def has_capability(self, name: str) -> bool:
+        """服务器是否支持指定扩展"""
+        if not self.connection:
+            return False
+        return name.upper() in self.connection.capabilities
+
+    def capabilities(self) -> frozenset:
+        """服务器公布的全部扩展（登录后重新获取的结果）"""
+        if not self.connection:
+            return frozenset()
+        return frozenset(self.connection.capabilities)
+
+    def select_folder(self, folder: str = "INBOX") -> bool:
+        """选择文件夹"""
+        if not self.connection:
+            if not self.connect():
+                return False
+        return self._select_folder(folder) is not None
+
+    def idle(self, timeout: float) -> bool:
+        """进入 IDLE 等待服务器推送（RFC 2177），需先选择文件夹
+
+        收到 EXISTS 通知或超时后发送 DONE 退出 IDLE。
+
+        Args:
+            timeout: 最长等待时间（秒），建议小于 29 分钟
+
+        Returns:
+            bool: 是否收到新邮件通知
+        """
+        sock = self.connection.sock
+        old_timeout = sock.gettimeout()
+        reader = _SocketLineReader(sock, self.connection.inflater)
+        has_new = False
+
+        tag = self.connection._new_tag()
+        if isinstance(tag, bytes):
+            tag = tag.decode()
+
+        try:
+            self.connection.send(f"{tag} IDLE\r\n".encode())
+            line = reader.readline(30)
+            if line is None or not line.startswith(b"+"):
+                raise imaplib.IMAP4.error(f"IDLE 命令失败: {line}")
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                line = reader.readline(remaining)
+                if line is None:
+                    break
+                if line.startswith(b"* BYE"):
+                    raise imaplib.IMAP4.abort(line.decode(errors="ignore"))
+                if EXISTS_PATTERN.match(line):
+                    has_new = True
+                    break
+
+            self.connection.send(b"DONE\r\n")
+            while True:
+                line = reader.readline(30)
+                if line is None:
+                    raise imaplib.IMAP4.abort("等待 IDLE 结束响应超时")
+                if line.startswith(tag.encode()):
+                    if b" OK" not in line:
+                        raise imaplib.IMAP4.error(f"IDLE 结束失败: {line}")
+                    break
+                if EXISTS_PATTERN.match(line):
+                    has_new = True
+        finally:
+            sock.settimeout(old_timeout)
+
+        return has_new
+
     def test_connection(self) -> Tuple[bool, str]:
         """测试连接"""
         try:
@@ -95,8 +899,65 @@ class EmailService:
         except Exception as e:
             return False, f"连接错误: {str(e)}"
 
-    def get_folders(self) -> List[Dict[str, Any]]:
-        """获取邮件文件夹列表"""
+    def _pipeline(
+        self,
+        commands: List[Tuple[str, ...]],
+        collect: Optional[str] = None,
+        depth: Optional[int] = None
+    ) -> Tuple[List[str], list]:
+        """流水线执行多条互不依赖的命令：不等上一条完成就发送下一条，最多 depth 条同时在途
+
+        高延迟服务器上 N 条命令只需约 N / depth 次网络往返。各命令的结果按标签读取
+        （imaplib 会保存提前到达的其他标签的结果），未标记响应按类型合并，
+        由调用方按 UID、序号或文件夹名区分归属。某条命令失败时仍读取其余命令的结果，保持连接同步。
+
+        Args:
+            commands: [(命令名, 参数...)]，UID 命令为 ("UID", "FETCH", ...)
+            collect: 需要收集的未标记响应类型，如 "FETCH"、"STATUS"
+            depth: 同时在途的最大命令数，默认为 IMAP_PIPELINE_DEPTH（限制在途数量，避免双方发送缓冲区同时写满）
+
+        Returns:
+            Tuple[List[str], list]: (各命令的结果 OK/NO/BAD, 按到达顺序合并的 collect 类型未标记响应)
+        """
+        connection = self.connection
+        depth = max(depth or IMAP_PIPELINE_DEPTH, 1)
+        if collect:
+            connection.untagged_responses.pop(collect, None)
+        results: List[str] = []
+        collected: list = []
+        in_flight: collections.deque = collections.deque()
+
+        def complete():
+            name, tag = in_flight.popleft()
+            try:
+                status, _ = connection._command_complete(name, tag)
+            except imaplib.IMAP4.abort:
+                raise
+            except imaplib.IMAP4.error:
+                status = "BAD"
+            results.append(status)
+            if collect:
+                collected.extend(connection.untagged_responses.pop(collect, []))
+
+        for name, *args in commands:
+            in_flight.append((name, connection._command(name, *args)))
+            if len(in_flight) >= depth:
+                complete()
+        while in_flight:
+            complete()
+        return results, collected
+
+    @reconnect_on_abort
+    def get_folders(self, with_status: bool = True) -> List[Dict[str, Any]]:
+        """获取邮件文件夹列表
+
+        Args:
+            with_status: 是否通过 STATUS 获取每个文件夹的邮件数和未读数
+
+        Returns:
+            List[Dict]: [{name, path, delimiter, flags, count, unread_count, uid_next}]，
+                name 为解码后的名称，path 为服务器上的原始名称
+        """
         if not self.connection:
             if not self.connect():
                 return []
@@ -104,24 +965,39 @@ class EmailService:
         folders = []
         try:
             status, folder_list = self.connection.list()
-            if status == "OK":
-                for folder_data in folder_list:
-                    if folder_data:
-                        folder_str = folder_data.decode() if isinstance(folder_data, bytes) else folder_data
-                        parts = folder_str.split(' "/" ')
-                        if len(parts) >= 2:
-                            folder_name = parts[-1].strip('"')
-                            folders.append({
-                                "name": folder_name,
-                                "path": folder_name,
-                                "count": 0,
-                                "unread_count": 0
-                            })
+            if status != "OK":
+                return []
+            folders = parse_list_response(folder_list)
+            for folder in folders:
+                folder.update(count=0, unread_count=0, uid_next=None)
+            if with_status:
+                self._fill_folder_status(folders)
+        except imaplib.IMAP4.abort:
+            raise
         except Exception as e:
             logger.error(f"获取文件夹失败: {e}")
 
         return folders
 
+    def _fill_folder_status(self, folders: List[Dict[str, Any]]):
+        """流水线发送 STATUS (MESSAGES UNSEEN UIDNEXT)，填充文件夹的邮件数和未读数"""
+        selectable = [folder for folder in folders if not NOSELECT_FLAGS & set(folder["flags"])]
+        _, data = self._pipeline([
+            ("STATUS", self.connection._quote(folder["path"]), "(MESSAGES UNSEEN UIDNEXT)")
+            for folder in selectable
+        ], collect="STATUS", depth=STATUS_PIPELINE_BATCH)
+        statuses = parse_status_response(data)
+
+        for folder in selectable:
+            values = statuses.get(folder["path"])
+            if values is None and folder["path"].upper() == "INBOX":
+                values = statuses.get("INBOX")
+            if values:
+                folder["count"] = values.get("MESSAGES", 0)
+                folder["unread_count"] = values.get("UNSEEN", 0)
+                folder["uid_next"] = values.get("UIDNEXT")
+
+    @reconnect_on_abort
     def get_emails(
         self,
         folder: str = "INBOX",
@@ -138,18 +1014,8 @@ class EmailService:
         emails_list = []
         total = 0
         try:
-            status, select_data = self.connection.select(folder)
-            
-            if status != "OK":
-                logger.warning(f"选择文件夹 {folder} 失败，尝试重新连接")
-                self.disconnect()
-                if not self.connect():
-                    logger.error("重新连接失败")
-                    return [], 0
-                status, select_data = self.connection.select(folder)
-                if status != "OK":
-                    logger.error(f"重新连接后选择文件夹仍然失败")
-                    return [], 0
+            if self._select_folder(folder) is None:
+                return [], 0
 
             status, messages = self.connection.search(None, "ALL")
             if status != "OK":
@@ -169,20 +1035,391 @@ class EmailService:
             end = min(offset + limit, total)
             page_ids = message_ids[start:end]
 
-            for msg_id in page_ids:
-                try:
-                    email_data = self._fetch_email(msg_id, fetch_body=fetch_body)
-                    if email_data:
-                        emails_list.append(email_data)
-                except Exception as e:
-                    logger.error(f"获取单封邮件失败 {msg_id}: {e}")
-                    continue
+            # 一次 FETCH 获取整页邮件，避免每封邮件一次往返
+            emails_list = self._fetch_emails_batch(page_ids, fetch_body=fetch_body)
 
+        except imaplib.IMAP4.abort:
+            raise
         except Exception as e:
             logger.error(f"获取邮件失败: {e}")
 
         return emails_list, total
 
+    def _select_folder(self, folder: str) -> Optional[int]:
+        """选择文件夹，失败时重新连接后再试一次
+
+        Returns:
+            Optional[int]: 文件夹中的邮件数量，选择失败时返回 None
+        """
+        status, data = self.connection.select(self.connection._quote(folder))
+
+        if status != "OK":
+            logger.warning(f"选择文件夹 {folder} 失败，尝试重新连接")
+            self.disconnect()
+            if not self.connect():
+                logger.error("重新连接失败")
+                return None
+            status, data = self.connection.select(self.connection._quote(folder))
+            if status != "OK":
+                logger.error(f"重新连接后选择文件夹仍然失败")
+                return None
+
+        try:
+            return int(data[0])
+        except (TypeError, ValueError, IndexError):
+            return 0
+
+    def _get_uid_validity(self) -> Optional[int]:
+        """获取当前选中文件夹的 UIDVALIDITY"""
+        _, data = self.connection.response("UIDVALIDITY")
+        if data and data[-1]:
+            try:
+                return int(data[-1])
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    @reconnect_on_abort
+    def get_new_emails(
+        self,
+        folder: str = "INBOX",
+        uid_validity: Optional[int] = None,
+        last_uid: int = 0,
+        limit: int = 20,
+        fetch_body: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], int]:
+        """基于 UID 水位线增量获取新邮件
+
+        Args:
+            folder: 文件夹
+            uid_validity: 上次同步时记录的 UIDVALIDITY
+            last_uid: 上次同步时记录的最大 UID
+            limit: 单次最多获取的邮件数量。水位线有效时从最早的新邮件开始取，其余下次同步继续；
+                首次同步或 UIDVALIDITY 变化时只取最新的 limit 封，更早的邮件由历史回填导入
+            fetch_body: 是否获取正文
+
+        Returns:
+            Tuple[List[Dict], Optional[int], int]:
+                - emails: 新邮件列表（按 UID 从新到旧）
+                - uid_validity: 服务器当前的 UIDVALIDITY
+                - last_uid: 新的 UID 水位线，只推进到从旧到新连续获取成功的最后一封，
+                  获取失败的邮件及其之后的邮件下次同步时重新获取（已写入的由去重键跳过）
+        """
+        if not self.connection:
+            if not self.connect():
+                logger.error("连接失败")
+                return [], uid_validity, last_uid
+
+        emails_list = []
+        try:
+            exists = self._select_folder(folder)
+            if exists is None:
+                return [], uid_validity, last_uid
+
+            current_validity = self._get_uid_validity()
+            watermark_valid = uid_validity is not None and current_validity == uid_validity and last_uid
+
+            if not watermark_valid:
+                # 首次同步或 UIDVALIDITY 变化：水位线失效，只取最新的 limit 封
+                if uid_validity is not None and current_validity != uid_validity:
+                    logger.warning(f"文件夹 {folder} 的 UIDVALIDITY 已变化，重置同步水位线")
+                uids = sorted(self._latest_uids(exists, limit))
+                if not uids:
+                    return [], current_validity, 0
+                # 更早的邮件不在增量同步范围内，水位线从本次获取的第一封之前开始
+                base_uid = uids[0] - 1
+            else:
+                status, data = self.connection.uid("SEARCH", "UID", f"{last_uid + 1}:*")
+                if status != "OK":
+                    logger.error("搜索新邮件失败")
+                    return [], uid_validity, last_uid
+                # "n:*" 在没有新邮件时也会返回最后一封，需要过滤
+                uids = sorted(int(u) for u in (data[0] or b"").split() if int(u) > last_uid)
+                if not uids:
+                    return [], current_validity, last_uid
+                base_uid = last_uid
+                if len(uids) > limit:
+                    logger.info(f"文件夹 {folder} 有 {len(uids)} 封新邮件，本次获取最早的 {limit} 封，其余下次同步继续")
+                    uids = uids[:limit]
+
+            # 从旧到新分批获取（_fetch_emails_batch 每批一次流水线 FETCH）
+            emails_list = self._fetch_emails_batch(uids, fetch_body=fetch_body, by_uid=True)
+            fetched = {email_data.get("uid") for email_data in emails_list}
+            new_last_uid = base_uid
+            for uid in uids:
+                if uid not in fetched:
+                    logger.warning(f"文件夹 {folder} 的邮件 UID {uid} 获取失败，水位线停在 {new_last_uid}，下次同步重试")
+                    break
+                new_last_uid = uid
+
+            return emails_list[::-1], current_validity, new_last_uid
+
+        except imaplib.IMAP4.abort:
+            raise
+        except Exception as e:
+            logger.error(f"增量获取邮件失败: {e}")
+            return emails_list, uid_validity, last_uid
+
+    @reconnect_on_abort
+    def list_uids(
+        self,
+        folder: str = "INBOX",
+        below_uid: Optional[int] = None,
+        above_uid: Optional[int] = None
+    ) -> Tuple[Optional[int], List[int]]:
+        """列出文件夹中的 UID（升序），用于历史邮件回填和 UIDVALIDITY 变化后重新绑定 UID
+
+        Args:
+            folder: 文件夹
+            below_uid: 只列出小于该值的 UID，None 表示不限
+            above_uid: 只列出大于该值的 UID，None 表示不限
+
+        Returns:
+            Tuple[Optional[int], List[int]]: (UIDVALIDITY, UID 列表)，失败时抛出异常
+        """
+        if not self.connection and not self.connect():
+            raise imaplib.IMAP4.error("连接失败")
+        if self._select_folder(folder) is None:
+            raise imaplib.IMAP4.error(f"选择文件夹 {folder} 失败")
+        uid_validity = self._get_uid_validity()
+        low = (above_uid or 0) + 1
+        if below_uid is not None and below_uid <= low:
+            return uid_validity, []
+
+        criteria = f"{low}:{below_uid - 1}" if below_uid is not None else f"{low}:*"
+        status, data = self.connection.uid("SEARCH", "UID", criteria)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"搜索文件夹 {folder} 的 UID 失败")
+        # "n:m" 中的范围超过最大 UID 时服务器可能返回最后一封
+        uids = sorted(
+            uid for uid in {int(uid) for uid in (data[0] or b"").split()}
+            if uid >= low and (below_uid is None or uid < below_uid)
+        )
+        return uid_validity, uids
+
+    @reconnect_on_abort
+    def fetch_uids(
+        self,
+        folder: str,
+        uids: List[int],
+        uid_validity: Optional[int] = None,
+        fetch_body: bool = True
+    ) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+        """按 UID 获取一组邮件，用于历史邮件回填
+
+        Returns:
+            Tuple[Optional[List[Dict]], int]: (邮件列表（按 UID 从新到旧）, 接收的字节数)；
+                UIDVALIDITY 与 uid_validity 不一致时邮件列表为 None
+        """
+        if not self.connection and not self.connect():
+            raise imaplib.IMAP4.error("连接失败")
+        start = self.connection.bytes_received
+        if self._select_folder(folder) is None:
+            raise imaplib.IMAP4.error(f"选择文件夹 {folder} 失败")
+        if uid_validity is not None and self._get_uid_validity() != uid_validity:
+            return None, self.connection.bytes_received - start
+
+        emails_list = self._fetch_emails_batch(sorted(uids, reverse=True), fetch_body=fetch_body, by_uid=True)
+        return emails_list, self.connection.bytes_received - start
+
+    @reconnect_on_abort
+    def fetch_key_headers(
+        self,
+        folder: str,
+        uids: List[int],
+        uid_validity: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """按 UID 只获取组成去重键的邮件头（Message-ID、发件人、收件人、抄送、日期、主题），
+        用于 UIDVALIDITY 变化后按去重键重新对应本地邮件的 UID
+
+        Returns:
+            Optional[List[Dict]]: 邮件头数据（含 uid），解析失败的邮件被跳过；
+                UIDVALIDITY 与 uid_validity 不一致时为 None
+        """
+        if not self.connection and not self.connect():
+            raise imaplib.IMAP4.error("连接失败")
+        if self._select_folder(folder) is None:
+            raise imaplib.IMAP4.error(f"选择文件夹 {folder} 失败")
+        if uid_validity is not None and self._get_uid_validity() != uid_validity:
+            return None
+
+        status, msg_data = self._fetch_pipelined([
+            (message_set, "(UID BODY.PEEK[HEADER.FIELDS (MESSAGE-ID FROM TO CC DATE SUBJECT)])")
+            for message_set in split_message_sets(sorted(uids))
+        ], by_uid=True)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"获取文件夹 {folder} 的邮件头失败: {status}")
+
+        messages = [record for record in split_fetch_response(msg_data) if record["literals"] and record["uid"]]
+        parsed = self._parse_messages([(record["literals"][0], record["uid"], False) for record in messages])
+        return [email_data for email_data in parsed if isinstance(email_data, dict)]
+
+    def _latest_uids(self, exists: int, limit: int) -> List[int]:
+        """获取当前选中文件夹中最新 limit 封邮件的 UID"""
+        if exists <= 0:
+            return []
+
+        start = max(1, exists - limit + 1)
+        status, data = self.connection.fetch(f"{start}:{exists}", "(UID)")
+        if status != "OK":
+            return []
+
+        uids = []
+        for item in data:
+            line = item[0] if isinstance(item, tuple) else item
+            if not line:
+                continue
+            match = UID_PATTERN.search(line)
+            if match:
+                uids.append(int(match.group(1)))
+        return uids
+
+    @reconnect_on_abort
+    def get_flag_changes(
+        self,
+        folder: str = "INBOX",
+        uid_validity: Optional[int] = None,
+        highest_modseq: Optional[int] = None,
+        last_uid: int = 0,
+        full_sweep: bool = False,
+        local_count: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """获取已同步邮件（UID <= last_uid）的标志变化和已删除的 UID
+
+        - qresync: SELECT (QRESYNC ...) 一次返回 modseq 之后变化的标志和 VANISHED 的 UID
+        - condstore: UID FETCH (CHANGEDSINCE modseq) 只返回变化的标志；服务器的 EXISTS 与本地邮件数
+          local_count 不同或 full_sweep 为 True 时，再用 UID SEARCH 获取现存 UID 以发现已删除的邮件
+        - sweep: 服务器不支持 CONDSTORE 或还没有 modseq 基线时，按 UID 分段 FETCH FLAGS，
+          仅在 full_sweep 为 True 时执行
+        - reset: UIDVALIDITY 已变化，本地 UID 全部失效
+
+        Returns:
+            Optional[Dict]: {mode, uid_validity, highest_modseq, flags: {uid: [标志]},
+                vanished: 已删除的 UID 列表（qresync）, existing: 现存 UID 集合（condstore/sweep）}，
+                失败时返回 None
+        """
+        if not self.connection:
+            if not self.connect():
+                return None
+
+        try:
+            use_qresync = "QRESYNC" in self.enabled and uid_validity and highest_modseq
+            if use_qresync:
+                exists = self._select_qresync(folder, uid_validity, highest_modseq)
+            else:
+                exists = self._select_folder(folder)
+            if exists is None:
+                return None
+
+            result = {
+                "mode": "skip",
+                "uid_validity": self._get_uid_validity(),
+                "highest_modseq": self._get_highest_modseq(),
+                "flags": {},
+                "vanished": None,
+                "existing": None
+            }
+
+            if uid_validity is None or result["uid_validity"] != uid_validity or not last_uid:
+                result["mode"] = "reset"
+            elif use_qresync:
+                result["mode"] = "qresync"
+                _, fetches = self.connection.response("FETCH")
+                result["flags"] = self._collect_flags(fetches, last_uid)
+                _, vanished = self.connection.response("VANISHED")
+                result["vanished"] = self._collect_vanished(vanished)
+            elif "CONDSTORE" in self.enabled and highest_modseq and result["highest_modseq"]:
+                result["mode"] = "condstore"
+                # 邮件数与本地一致时认为没有删除，不列出整个文件夹的 UID；仍按 full_sweep 周期核对一次
+                check_existing = full_sweep or local_count is None or exists != local_count
+                commands = [("UID", "FETCH", f"1:{last_uid}", "(UID FLAGS)", f"(CHANGEDSINCE {highest_modseq})")]
+                if check_existing:
+                    # 变化的标志和现存的 UID 互不依赖，流水线发送
+                    commands.append(("UID", "SEARCH", "UID", f"1:{last_uid}"))
+                self.connection.untagged_responses.pop("SEARCH", None)
+                results, data = self._pipeline(commands, collect="FETCH")
+                search = self.connection.untagged_responses.pop("SEARCH", [])
+                if any(status != "OK" for status in results):
+                    # 搜索失败时不能返回空集合，否则会被当作所有邮件都已删除
+                    return None
+                result["flags"] = self._collect_flags(data, last_uid)
+                if check_existing:
+                    result["existing"] = {
+                        int(uid) for item in search if item for uid in item.split() if int(uid) <= last_uid
+                    }
+            elif full_sweep:
+                result["mode"] = "sweep"
+                results, data = self._pipeline([
+                    ("UID", "FETCH", f"{start}:{min(start + IMAP_FLAG_SWEEP_CHUNK - 1, last_uid)}", "(UID FLAGS)")
+                    for start in range(1, last_uid + 1, IMAP_FLAG_SWEEP_CHUNK)
+                ], collect="FETCH")
+                if any(status != "OK" for status in results):
+                    return None
+                result["flags"] = self._collect_flags(data, last_uid)
+                result["existing"] = set(result["flags"])
+
+            return result
+
+        except imaplib.IMAP4.abort:
+            raise
+        except Exception as e:
+            logger.error(f"获取标志变化失败: {e}")
+            return None
+
+    def _select_qresync(self, folder: str, uid_validity: int, modseq: int) -> Optional[int]:
+        """带 QRESYNC 参数选择文件夹（RFC 7162），返回邮件数量
+
+        imaplib.select 不支持 SELECT 参数，这里直接发送命令并更新连接状态。
+        """
+        connection = self.connection
+        connection.untagged_responses.clear()
+        status, _ = connection._simple_command(
+            "SELECT", connection._quote(folder), f"(QRESYNC ({uid_validity} {modseq}))"
+        )
+        if status != "OK":
+            logger.warning(f"QRESYNC 选择文件夹 {folder} 失败")
+            return None
+        connection.state = "SELECTED"
+        _, data = connection.response("EXISTS")
+        try:
+            return int(data[-1])
+        except (TypeError, ValueError, IndexError):
+            return 0
+
+    def _get_highest_modseq(self) -> Optional[int]:
+        """获取当前选中文件夹的 HIGHESTMODSEQ，服务器不支持时返回 None"""
+        _, data = self.connection.response("HIGHESTMODSEQ")
+        if data and data[-1]:
+            try:
+                return int(data[-1])
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    def _collect_flags(self, fetch_data: list, last_uid: int) -> Dict[int, List[str]]:
+        """从 FETCH 响应中提取 {UID: 标志列表}"""
+        flags = {}
+        for _, items in parse_fetch_response([item for item in fetch_data or [] if item]):
+            try:
+                uid = int(items.get("UID"))
+            except (TypeError, ValueError):
+                continue
+            if uid <= last_uid and isinstance(items.get("FLAGS"), list):
+                flags[uid] = items["FLAGS"]
+        return flags
+
+    def _collect_vanished(self, vanished_data: list) -> List[int]:
+        """解析 VANISHED (EARLIER) 响应中的 UID 集合"""
+        uids = []
+        for item in vanished_data or []:
+            if not item:
+                continue
+            tokens = tokenize(item if isinstance(item, bytes) else item.encode())
+            if tokens and isinstance(tokens[-1], str):
+                uids.extend(parse_sequence_set(tokens[-1]))
+        return uids
+
+    @reconnect_on_abort
     def get_email_by_id(self, folder: str, msg_id: str) -> Optional[Dict[str, Any]]:
         """获取单封邮件详情"""
         if not self.connection:
@@ -190,74 +1427,394 @@ class EmailService:
                 return None
 
         try:
-            status, _ = self.connection.select(folder)
+            status, _ = self.connection.select(self.connection._quote(folder))
             if status != "OK":
                 return None
 
             return self._fetch_email(msg_id.encode(), fetch_body=True)
+        except imaplib.IMAP4.abort:
+            raise
         except Exception as e:
             logger.error(f"获取邮件详情失败: {e}")
             return None
 
+    @reconnect_on_abort
+    def fetch_parts_to_blobs(
+        self,
+        folder: str,
+        uid: int,
+        parts: Dict[str, Optional[str]],
+        message_id: Optional[str] = None
+    ) -> Dict[str, Tuple[str, int]]:
+        """按 UID 获取邮件的指定部分，逐块解码写入 blob 存储（大部分先转存到临时文件，不整体读入内存）
+
+        Args:
+            parts: {部分编号: 传输编码}
+            message_id: 提供时校验服务器上该 UID 对应的 Message-ID
+
+        Returns:
+            Dict[str, Tuple[str, int]]: {部分编号: (SHA-256, 解码后的字节数)}，获取失败时返回空字典
+        """
+        if not parts:
+            return {}
+        if not self.connection:
+            if not self.connect():
+                return {}
+
+        msg_data = []
+        try:
+            if self._select_folder(folder) is None:
+                return {}
+
+            fetch_items = ["UID"] + [f"BODY.PEEK[{section}]" for section in parts]
+            if message_id:
+                fetch_items.append("BODY.PEEK[HEADER.FIELDS (MESSAGE-ID)]")
+            with self._spooled_literals():
+                status, msg_data = self.connection.uid("FETCH", str(uid), f"({' '.join(fetch_items)})")
+            if status != "OK":
+                logger.error(f"获取邮件部分失败: UID {uid}")
+                return {}
+
+            literals = {}
+            requested = True
+            for item in msg_data:
+                if not isinstance(item, tuple):
+                    continue
+                if SEQ_PATTERN.match(item[0]):
+                    # 跳过服务器夹带的其他邮件的未请求响应
+                    uid_match = UID_PATTERN.search(item[0])
+                    requested = uid_match is None or int(uid_match.group(1)) == uid
+                section_match = BODY_SECTION_PATTERN.search(item[0])
+                if requested and section_match:
+                    literals[section_match.group(1).decode()] = item[1]
+
+            if message_id:
+                header = next((v for k, v in literals.items() if k.upper().startswith("HEADER.FIELDS")), b"")
+                if not isinstance(header, bytes):
+                    header = b"".join(iter_chunks(header))
+                actual = email.message_from_bytes(header).get("Message-ID", "")
+                if actual.strip() != message_id.strip():
+                    logger.warning(f"文件夹 {folder} 中 UID {uid} 的 Message-ID 不匹配，邮件可能已被移动或删除")
+                    return {}
+
+            return {
+                section: blob_store.write(iter_decoded(literals[section], encoding))
+                for section, encoding in parts.items()
+                if section in literals
+            }
+        except imaplib.IMAP4.abort:
+            raise
+        except Exception as e:
+            logger.error(f"获取邮件部分失败: {e}")
+            return {}
+        finally:
+            for item in msg_data or []:
+                if isinstance(item, tuple):
+                    close_literal(item[1])
+
     def _fetch_email(
         self,
         msg_id: bytes,
-        fetch_body: bool = False
+        fetch_body: bool = False,
+        by_uid: bool = False
     ) -> Optional[Dict[str, Any]]:
-        """获取邮件数据"""
+        """获取邮件数据
+
+        Args:
+            msg_id: 邮件序号，by_uid 为 True 时为 UID
+            fetch_body: 是否获取正文
+            by_uid: 是否使用 UID FETCH
+        """
+        msg_data = []
         try:
-            fetch_type = "(RFC822)" if fetch_body else "(RFC822.HEADER)"
-            status, msg_data = self.connection.fetch(msg_id, fetch_type)
+            # BODY.PEEK 不会像 RFC822 那样把邮件标记为已读
+            fetch_type = "(UID FLAGS BODY.PEEK[])" if fetch_body else "(UID FLAGS BODY.PEEK[HEADER])"
+            with self._spooled_literals():
+                if by_uid:
+                    status, msg_data = self.connection.uid("FETCH", msg_id, fetch_type)
+                else:
+                    status, msg_data = self.connection.fetch(msg_id, fetch_type)
 
-            if status != "OK" or not msg_data[0]:
+            if status != "OK" or not msg_data[0] or not isinstance(msg_data[0], tuple):
                 return None
 
-            raw_email = msg_data[0][1]
-            msg = email.message_from_bytes(raw_email)
-            
-            from_header = msg.get("From", "")
-            from_name, from_addr = parseaddr(from_header)
-            from_name = self._decode_header(from_name) if from_name else None
+            record = split_fetch_response(msg_data)[0]
+            email_data = self._parse_message(record["literals"][0], uid=record["uid"], fetch_body=fetch_body)
+            email_data["flags"] = record["flags"]
+            return email_data
 
-            to_header = msg.get("To", "")
-            to_addresses = self._parse_addresses(to_header)
+        except imaplib.IMAP4.abort:
+            raise
+        except Exception as e:
+            logger.error(f"解析邮件失败: {e}")
+            return None
+        finally:
+            for item in msg_data or []:
+                if isinstance(item, tuple):
+                    close_literal(item[1])
 
-            cc_header = msg.get("Cc", "")
-            cc_addresses = self._parse_addresses(cc_header) if cc_header else None
+    def _fetch_emails_batch(
+        self,
+        msg_ids: List[Union[bytes, int]],
+        fetch_body: bool = False,
+        by_uid: bool = False
+    ) -> List[Dict[str, Any]]:
+        """批量获取邮件数据，每 FETCH_BATCH_SIZE 封邮件只发送一次 FETCH，
+        每 IMAP_PIPELINE_DEPTH 条 FETCH 流水线发送
 
-            subject = self._decode_header(msg.get("Subject", ""))
+        Args:
+            msg_ids: 邮件序号列表，by_uid 为 True 时为 UID 列表
+            fetch_body: 是否获取正文
+            by_uid: 是否使用 UID FETCH
 
-            date_str = msg.get("Date", "")
+        Returns:
+            List[Dict]: 邮件数据列表，顺序与 msg_ids 一致，获取失败的邮件会被跳过
+        """
+        emails_list = []
+        window = FETCH_BATCH_SIZE * max(IMAP_PIPELINE_DEPTH, 1)
+        for start in range(0, len(msg_ids), window):
+            chunk = [int(msg_id) for msg_id in msg_ids[start:start + window]]
             try:
-                date = parsedate_to_datetime(date_str) if date_str else None
-            except Exception:
-                date = None
+                fetched = self._fetch_chunk(chunk, fetch_body=fetch_body, by_uid=by_uid)
+            except imaplib.IMAP4.abort:
+                raise
+            except Exception as e:
+                # 批量获取失败时逐封重试，避免一封异常邮件影响整批
+                logger.warning(f"批量获取邮件失败，改为逐封获取: {e}")
+                fetched = {}
+                for msg_id in chunk:
+                    email_data = self._fetch_email(str(msg_id).encode(), fetch_body=fetch_body, by_uid=by_uid)
+                    if email_data:
+                        fetched[msg_id] = email_data
 
-            body = ""
-            body_html = ""
-            attachments = []
+            for msg_id in chunk:
+                email_data = fetched.get(msg_id)
+                if email_data:
+                    emails_list.append(email_data)
+                else:
+                    self.fetch_failures += 1
 
-            inline_images = {}
-            if fetch_body:
-                body, body_html, attachments, inline_images = self._parse_body(msg)
+        return emails_list
 
-            return {
-                "message_id": msg.get("Message-ID", ""),
-                "from": {"name": from_name, "address": from_addr},
-                "to": to_addresses,
-                "cc": cc_addresses,
-                "subject": subject,
-                "date": date,
-                "body": body,
-                "body_html": body_html,
-                "has_attachments": len(attachments) > 0,
-                "attachments": attachments,
-                "inline_images": inline_images
-            }
+    def _fetch_command(self, message_set: str, fetch_type: str, by_uid: bool = False):
+        """发送 FETCH 或 UID FETCH"""
+        if by_uid:
+            return self.connection.uid("FETCH", message_set, fetch_type)
+        return self.connection.fetch(message_set, fetch_type)
 
-        except Exception as e:
-            logger.error(f"解析邮件失败: {e}")
-            return None
+    def _fetch_pipelined(self, requests: List[Tuple[str, str]], by_uid: bool = False) -> Tuple[str, list]:
+        """流水线发送多条 FETCH 或 UID FETCH [(消息集合, 获取项)]
+
+        各条命令的消息集合互不重叠，响应中的序号和 UID 即可区分归属，这里直接合并。
+
+        Returns:
+            Tuple[str, list]: (全部成功时为 OK，否则为第一条失败命令的结果, 合并后的响应)
+        """
+        if len(requests) == 1:
+            return self._fetch_command(*requests[0], by_uid)
+        results, data = self._pipeline([
+            ("UID", "FETCH", message_set, fetch_type) if by_uid else ("FETCH", message_set, fetch_type)
+            for message_set, fetch_type in requests
+        ], collect="FETCH")
+        return next((status for status in results if status != "OK"), "OK"), data
+
+    def _fetch_chunk(
+        self,
+        msg_ids: List[int],
+        fetch_body: bool = False,
+        by_uid: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """获取一组邮件（每 FETCH_BATCH_SIZE 封一条 FETCH，流水线发送），返回 {序号或UID: 邮件数据}"""
+        if fetch_body and IMAP_FETCH_MODE == "structure":
+            return self._fetch_chunk_structure(msg_ids, by_uid=by_uid)
+
+        fetch_type = "(UID FLAGS BODY.PEEK[])" if fetch_body else "(UID FLAGS BODY.PEEK[HEADER])"
+        with self._spooled_literals():
+            status, msg_data = self._fetch_pipelined(
+                [(message_set, fetch_type) for message_set in split_message_sets(msg_ids)], by_uid
+            )
+
+        records = split_fetch_response(msg_data)
+        try:
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"FETCH {build_message_set(msg_ids)} 失败: {status}")
+
+            messages = [record for record in records if record["literals"]]
+            parsed = self._parse_messages([
+                (record["literals"][0], record["uid"], fetch_body) for record in messages
+            ])
+
+            result = {}
+            for record, email_data in zip(messages, parsed):
+                if isinstance(email_data, Exception):
+                    logger.error(f"解析邮件失败 {record['seq']}: {email_data}")
+                    continue
+                key = record["uid"] if by_uid else record["seq"]
+                if email_data and key is not None:
+                    email_data["flags"] = record["flags"]
+                    result[key] = email_data
+            return result
+        finally:
+            for record in records:
+                for literal in record["literals"]:
+                    close_literal(literal)
+
+    def _fetch_chunk_structure(
+        self,
+        msg_ids: List[int],
+        by_uid: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """先获取 BODYSTRUCTURE 和邮件头，再只下载正文文本部分
+
+        附件和内嵌图片只记录部分编号，在下载附件或查看详情时再按需获取。
+        """
+        status, msg_data = self._fetch_pipelined([
+            (message_set, "(UID FLAGS BODYSTRUCTURE BODY.PEEK[HEADER])")
+            for message_set in split_message_sets(msg_ids)
+        ], by_uid)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"FETCH {build_message_set(msg_ids)} 失败: {status}")
+
+        fetched = []
+        for seq, items in parse_fetch_response(msg_data):
+            uid = int(items["UID"]) if items.get("UID") else None
+            key = uid if by_uid else seq
+            if key is None or not isinstance(items.get("BODY[HEADER]"), bytes) or not isinstance(items.get("BODYSTRUCTURE"), list):
+                continue
+            fetched.append((key, uid, items))
+        parsed = self._parse_messages([(items["BODY[HEADER]"], uid, False) for _, uid, items in fetched])
+
+        result = {}
+        text_parts: Dict[int, List[Dict[str, Any]]] = {}
+        for (key, uid, items), email_data in zip(fetched, parsed):
+            try:
+                if isinstance(email_data, Exception):
+                    raise email_data
+                text_part, html_part, attachments, inline_images = classify_parts(walk_bodystructure(items["BODYSTRUCTURE"]))
+            except Exception as e:
+                logger.error(f"解析邮件结构失败 {key}: {e}")
+                continue
+            email_data["flags"] = items.get("FLAGS") if isinstance(items.get("FLAGS"), list) else None
+            email_data["attachments"] = attachments
+            email_data["inline_images"] = inline_images
+            email_data["has_attachments"] = len(attachments) > 0
+            result[key] = email_data
+            text_parts[key] = [part for part in (text_part, html_part) if part]
+
+        # 按需要的部分编号分组，结构相同的邮件用一条 FETCH 获取，各组的 FETCH 流水线发送
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for key, parts in text_parts.items():
+            if parts:
+                groups.setdefault(tuple(part["section"] for part in parts), []).append(key)
+
+        if groups:
+            status, msg_data = self._fetch_pipelined([
+                (message_set, "(UID " + " ".join(f"BODY.PEEK[{section}]" for section in sections) + ")")
+                for sections, keys in groups.items()
+                for message_set in split_message_sets(keys)
+            ], by_uid)
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"FETCH 正文失败: {status}")
+
+            for seq, items in parse_fetch_response(msg_data):
+                key = int(items["UID"]) if by_uid and items.get("UID") else seq
+                if key not in text_parts:
+                    continue
+                for part in text_parts[key]:
+                    data = items.get(f"BODY[{part['section']}]")
+                    if not isinstance(data, bytes):
+                        continue
+                    text = decode_text(decode_transfer_encoding(data, part["encoding"]), part["charset"])
+                    field = "body_html" if part["content_type"] == "text/html" else "body"
+                    result[key][field] = text
+
+        return result
+
+    def _parse_messages(
+        self,
+        jobs: List[Tuple[Union[bytes, IO[bytes]], Optional[int], bool]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """批量解析邮件 [(原始邮件, uid, fetch_body)]，返回顺序一致的结果，解析失败的位置为异常对象
+
+        内存中的邮件交给 MIME 解析进程池并行解析；已转存到临时文件的大邮件无法跨进程传递，
+        在当前线程流式解析。进程池未启用或不可用时全部在当前线程解析。
+        """
+        results: List[Union[Dict[str, Any], Exception, None]] = [None] * len(jobs)
+        pooled = [index for index, job in enumerate(jobs) if isinstance(job[0], bytes)]
+        outputs = mime_pool.map(parse_raw_messages, [jobs[index] for index in pooled])
+        if outputs is not None:
+            for index, output in zip(pooled, outputs):
+                results[index] = output
+
+        for index, (raw_email, uid, fetch_body) in enumerate(jobs):
+            if results[index] is None:
+                try:
+                    results[index] = self._parse_message(raw_email, uid=uid, fetch_body=fetch_body)
+                except Exception as e:
+                    results[index] = e
+        return results
+
+    def _parse_message(
+        self,
+        raw_email: Union[bytes, IO[bytes]],
+        uid: Optional[int] = None,
+        fetch_body: bool = False
+    ) -> Dict[str, Any]:
+        """将原始邮件解析为邮件数据字典
+
+        使用流式解析，原始邮件可以是 bytes 或临时文件，正文部分逐块解码，
+        只保留正文文本和内嵌图片的内容，附件只统计大小。
+        """
+        parser = parse_stream(
+            iter_chunks(raw_email),
+            keep=self._keep_part if fetch_body else (lambda part: False),
+            max_part_memory=IMAP_MIME_MAX_PART_MEMORY
+        )
+        msg = parser.headers if parser.headers is not None else Message()
+        
+        from_header = msg.get("From", "")
+        from_name, from_addr = parseaddr(from_header)
+        from_name = self._decode_header(from_name) if from_name else None
+
+        to_header = msg.get("To", "")
+        to_addresses = self._parse_addresses(to_header)
+
+        cc_header = msg.get("Cc", "")
+        cc_addresses = self._parse_addresses(cc_header) if cc_header else None
+
+        subject = self._decode_header(msg.get("Subject", ""))
+
+        date_str = msg.get("Date", "")
+        try:
+            date = parsedate_to_datetime(date_str) if date_str else None
+        except Exception:
+            date = None
+
+        body = ""
+        body_html = ""
+        attachments = []
+
+        inline_images = {}
+        if fetch_body:
+            body, body_html, attachments, inline_images = self._parse_body(parser.parts, parser.is_multipart)
+        else:
+            for part in parser.parts:
+                part.release()
+
+        return {
+            "uid": uid,
+            "message_id": msg.get("Message-ID", ""),
+            "from": {"name": from_name, "address": from_addr},
+            "to": to_addresses,
+            "cc": cc_addresses,
+            "subject": subject,
+            "date": date,
+            "body": body,
+            "body_html": body_html,
+            "has_attachments": len(attachments) > 0,
+            "attachments": attachments,
+            "inline_images": inline_images
+        }
 
     def _decode_header(self, header: str) -> str:
         """解码邮件头部"""
@@ -297,65 +1854,106 @@ class EmailService:
 
         return addresses
 
-    def _parse_body(self, msg) -> Tuple[str, str, List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    def _keep_part(self, part: MimePart) -> bool:
+        """流式解析时需要保留内容的部分：正文文本和内嵌图片，附件只统计大小"""
+        if part.content_id and part.content_type.startswith("image/"):
+            return True
+        if "attachment" in part.disposition:
+            return False
+        return part.content_type in ("text/plain", "text/html") or part.section == "1"
+
+    def _parse_body(
+        self,
+        parts: List[MimePart],
+        is_multipart: bool = True
+    ) -> Tuple[str, str, List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
         """解析邮件正文、附件和内嵌图片
+
+        超过 IMAP_MIME_MAX_PART_MEMORY 的内嵌图片不内联，只记录部分编号，查看详情时按需获取。
         
         Returns:
             Tuple[str, str, List[Dict], Dict[str, Dict]]: 
                 - body: 纯文本正文
                 - body_html: HTML正文
                 - attachments: 附件列表
-                - inline_images: 内嵌图片字典 {cid: {content_type, data}}
+                - inline_images: 内嵌图片字典 {cid: {content_type, data, part, encoding}}
         """
         body = ""
         body_html = ""
         attachments = []
         inline_images = {}  # 存储内嵌图片 {cid: {content_type, data}}
 
-        if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-                content_id = part.get("Content-ID", "")
-                
+        try:
+            for part in parts:
+                content_type = part.content_type
+
+                if not is_multipart:
+                    payload = part.read()
+                    if payload:
+                        if content_type == "text/html":
+                            body_html = decode_text(payload, part.charset)
+                        else:
+                            body = decode_text(payload, part.charset)
+                    continue
+
                 # 处理内嵌图片 (通过 Content-ID 标识)
-                if content_id and content_type.startswith("image/"):
+                if part.content_id and content_type.startswith("image/"):
+                    if not part.size:
+                        continue
                     # 移除 Content-ID 的尖括号
-                    cid = content_id.strip("<>")
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        import base64
-                        inline_images[cid] = {
-                            "content_type": content_type,
-                            "data": base64.b64encode(payload).decode("utf-8")
-                        }
-                elif "attachment" in content_disposition:
-                    filename = part.get_filename()
+                    cid = part.content_id.strip("<>")
+                    inline_images[cid] = {
+                        "content_type": content_type,
+                        "part": part.section,
+                        "encoding": part.encoding
+                    }
+                    if part.size <= IMAP_MIME_MAX_PART_MEMORY:
+                        inline_images[cid]["data"] = base64.b64encode(part.read()).decode("utf-8")
+                elif "attachment" in part.disposition:
+                    filename = part.filename
                     if filename:
                         filename = self._decode_header(filename)
                         attachments.append({
                             "filename": filename,
                             "content_type": content_type,
-                            "size": len(part.get_payload(decode=True) or b"")
+                            "size": part.size,
+                            "part": part.section,
+                            "encoding": part.encoding
                         })
                 elif content_type == "text/plain" and not body:
-                    payload = part.get_payload(decode=True)
+                    payload = part.read()
                     if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        body = payload.decode(charset, errors="ignore")
+                        body = decode_text(payload, part.charset)
                 elif content_type == "text/html" and not body_html:
-                    payload = part.get_payload(decode=True)
+                    payload = part.read()
                     if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        body_html = payload.decode(charset, errors="ignore")
-        else:
-            content_type = msg.get_content_type()
-            payload = msg.get_payload(decode=True)
-            if payload:
-                charset = msg.get_content_charset() or "utf-8"
-                if content_type == "text/html":
-                    body_html = payload.decode(charset, errors="ignore")
-                else:
-                    body = payload.decode(charset, errors="ignore")
+                        body_html = decode_text(payload, part.charset)
+        finally:
+            for part in parts:
+                part.release()
 
         return body, body_html, attachments, inline_images
+
+
+_message_parser: Optional[EmailService] = None
+
+
+def parse_raw_messages(
+    jobs: List[Tuple[bytes, Optional[int], bool]]
+) -> List[Union[Dict[str, Any], Exception]]:
+    """MIME 解析进程池中执行的任务：解析一组邮件 [(原始邮件, uid, fetch_body)]
+
+    需要是模块级函数才能被子进程按名称导入。解析失败的位置返回 ValueError，
+    避免不可序列化的异常导致整批结果无法传回。
+    """
+    global _message_parser
+    if _message_parser is None:
+        _message_parser = EmailService("", 0, "", "", use_ssl=False)
+
+    results = []
+    for raw_email, uid, fetch_body in jobs:
+        try:
+            results.append(_message_parser._parse_message(raw_email, uid=uid, fetch_body=fetch_body))
+        except Exception as e:
+            results.append(ValueError(str(e)))
+    return results
@@ -0,0 +1,397 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: IMAP 响应解析 - 解析括号列表、字面量、FETCH/LIST/STATUS 响应和 BODYSTRUCTURE
+'''
+import base64
+import re
+from email.header import decode_header, make_header
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import unquote_to_bytes
+
+# FETCH 响应开头的邮件序号，如 b"12 (UID 5 ..."
+FETCH_START_PATTERN = re.compile(rb"^(\d+) \(")
+LITERAL_PATTERN = re.compile(rb"\{(\d+)\+?\}\r\n")
+
+
+def tokenize(data: bytes) -> list:
+    """将 IMAP 数据解析为嵌套列表
+
+    - 括号列表 -> list
+    - 引号字符串 -> str
+    - 字面量 {n} -> bytes
+    - NIL -> None
+    - 其他原子（包括 BODY[1.2]<0> 这类带方括号的原子） -> str
+    """
+    pos = 0
+    length = len(data)
+    stack: list = [[]]
+    while pos < length:
+        ch = data[pos:pos + 1]
+        if ch in (b" ", b"\r", b"\n"):
+            pos += 1
+        elif ch == b"(":
+            stack.append([])
+            pos += 1
+        elif ch == b")":
+            if len(stack) == 1:
+                raise ValueError("IMAP 响应括号不匹配")
+            item = stack.pop()
+            stack[-1].append(item)
+            pos += 1
+        elif ch == b'"':
+            end = pos + 1
+            buf = bytearray()
+            while end < length and data[end:end + 1] != b'"':
+                if data[end:end + 1] == b"\\":
+                    end += 1
+                buf += data[end:end + 1]
+                end += 1
+            stack[-1].append(bytes(buf).decode("utf-8", errors="replace"))
+            pos = end + 1
+        elif ch == b"{":
+            match = LITERAL_PATTERN.match(data, pos)
+            if not match:
+                raise ValueError("IMAP 字面量格式错误")
+            start = match.end()
+            size = int(match.group(1))
+            stack[-1].append(data[start:start + size])
+            pos = start + size
+        else:
+            end = pos
+            depth = 0
+            while end < length:
+                c = data[end:end + 1]
+                if c == b"[":
+                    depth += 1
+                elif c == b"]":
+                    depth -= 1
+                elif depth == 0 and c in (b" ", b"(", b")", b"\r", b"\n"):
+                    break
+                end += 1
+            atom = data[pos:end].decode("utf-8", errors="replace")
+            stack[-1].append(None if atom.upper() == "NIL" else atom)
+            pos = end
+    if len(stack) != 1:
+        raise ValueError("IMAP 响应括号不匹配")
+    return stack[0]
+
+
+def join_fetch_response(msg_data: list) -> List[bytes]:
+    """将 imaplib 拆开的 FETCH 响应重新拼接为每封邮件一条完整数据
+
+    imaplib 把 "... {n}" 与字面量合成一个元组（去掉了 CRLF），
+    其余部分作为单独的 bytes 返回。
+    """
+    messages: List[bytearray] = []
+    for item in msg_data:
+        if isinstance(item, tuple):
+            piece = item[0] + b"\r\n" + item[1]
+            head = item[0]
+        elif isinstance(item, bytes):
+            piece = head = item
+        else:
+            continue
+        if FETCH_START_PATTERN.match(head) or not messages:
+            messages.append(bytearray())
+        messages[-1] += piece
+    return [bytes(m) for m in messages]
+
+
+def parse_fetch_items(line: bytes) -> Tuple[Optional[int], Dict[str, Any]]:
+    """解析单封邮件的 FETCH 响应
+
+    Args:
+        line: 如 b"12 (UID 5 FLAGS (\\Seen) BODY[1] {3}\\r\\nabc)"
+
+    Returns:
+        Tuple[Optional[int], Dict]: (序号, {数据项名(大写): 值})
+    """
+    match = FETCH_START_PATTERN.match(line)
+    seq = int(match.group(1)) if match else None
+    tokens = tokenize(line[match.end() - 1:] if match else line)
+    items = tokens[0] if tokens and isinstance(tokens[0], list) else tokens
+
+    result = {}
+    for i in range(0, len(items) - 1, 2):
+        key = items[i]
+        if isinstance(key, str):
+            key = key.upper()
+            # BODY.PEEK[1] 在响应中写作 BODY[1]，去掉部分获取的起始偏移 <0>
+            key = re.sub(r"<\d+>$", "", key)
+            result[key] = items[i + 1]
+    return seq, result
+
+
+def parse_fetch_response(msg_data: list) -> List[Tuple[Optional[int], Dict[str, Any]]]:
+    """解析多封邮件的 FETCH 响应"""
+    return [parse_fetch_items(line) for line in join_fetch_response(msg_data)]
+
+
+def parse_sequence_set(value: str) -> List[int]:
+    """展开 UID 集合，如 "1:3,7" -> [1, 2, 3, 7]（忽略 *）"""
+    result = []
+    for item in value.split(","):
+        if ":" in item:
+            start, _, end = item.partition(":")
+            if start.isdigit() and end.isdigit():
+                low, high = sorted((int(start), int(end)))
+                result.extend(range(low, high + 1))
+        elif item.isdigit():
+            result.append(int(item))
+    return result
+
+
+# ==================== LIST / STATUS ====================
+
+# RFC 6154 SPECIAL-USE 属性 -> 文件夹用途
+SPECIAL_USE_ATTRIBUTES = {
+    "\\sent": "sent",
+    "\\drafts": "drafts",
+    "\\archive": "archive",
+    "\\junk": "junk",
+    "\\trash": "trash",
+    "\\all": "all",
+    "\\flagged": "flagged"
+}
+# 不支持 SPECIAL-USE 的服务器按常见文件夹名（最后一级，小写）识别用途
+SPECIAL_USE_NAMES = {
+    "sent": "sent",
+    "sent items": "sent",
+    "sent messages": "sent",
+    "sent mail": "sent",
+    "已发送": "sent",
+    "已发送邮件": "sent",
+    "drafts": "drafts",
+    "draft": "drafts",
+    "草稿箱": "drafts",
+    "archive": "archive",
+    "archives": "archive",
+    "归档": "archive",
+    "junk": "junk",
+    "junk e-mail": "junk",
+    "junk email": "junk",
+    "spam": "junk",
+    "bulk mail": "junk",
+    "垃圾邮件": "junk",
+    "trash": "trash",
+    "deleted items": "trash",
+    "deleted messages": "trash",
+    "已删除": "trash",
+    "已删除邮件": "trash"
+}
+
+
+def detect_special_use(flags: List[str], name: str, delimiter: Optional[str]) -> Optional[str]:
+    """识别文件夹用途（inbox/sent/drafts/archive/junk/trash/all/flagged），优先使用 SPECIAL-USE 属性"""
+    if name.upper() == "INBOX":
+        return "inbox"
+    for flag in flags:
+        if flag in SPECIAL_USE_ATTRIBUTES:
+            return SPECIAL_USE_ATTRIBUTES[flag]
+    leaf = name.rsplit(delimiter, 1)[-1] if delimiter else name
+    return SPECIAL_USE_NAMES.get(leaf.strip().lower())
+
+def decode_modified_utf7(name: str) -> str:
+    """解码 IMAP 文件夹名使用的修改版 UTF-7（RFC 3501 5.1.3），如 "&UXZO1mWHTvZZOQ-" -> "其他文件夹"
+
+    "&" 与 "-" 之间是用 "," 代替 "/" 的 UTF-16BE base64，"&-" 表示 "&"。
+    """
+    if "&" not in name:
+        return name
+    result = []
+    pos = 0
+    while pos < len(name):
+        start = name.find("&", pos)
+        if start == -1:
+            result.append(name[pos:])
+            break
+        end = name.find("-", start)
+        if end == -1:
+            # 格式错误，保留原文
+            result.append(name[pos:])
+            break
+        result.append(name[pos:start])
+        encoded = name[start + 1:end]
+        if not encoded:
+            result.append("&")
+        else:
+            data = encoded.replace(",", "/")
+            try:
+                result.append(base64.b64decode(data + "=" * (-len(data) % 4)).decode("utf-16-be"))
+            except (ValueError, UnicodeDecodeError):
+                result.append(name[start:end + 1])
+        pos = end + 1
+    return "".join(result)
+
+
+def _join_untagged_lines(data: list) -> List[bytes]:
+    """将 imaplib 拆开的未标记响应（包含字面量时为元组）拼接为完整的行"""
+    lines: List[bytes] = []
+    continued = False
+    for item in data or []:
+        if isinstance(item, tuple):
+            lines.append(item[0] + b"\r\n" + item[1])
+            continued = True
+        elif isinstance(item, bytes):
+            if continued:
+                # 字面量之后的剩余部分
+                lines[-1] += item
+            elif item:
+                lines.append(item)
+            continued = False
+    return lines
+
+
+def parse_list_response(data: list) -> List[Dict[str, Any]]:
+    """解析 LIST/LSUB 响应
+
+    Returns:
+        List[Dict]: [{name, path, delimiter, flags, special_use}]，path 为服务器上的原始名称（用于 SELECT/STATUS），
+            name 为解码后的名称，flags 为小写的属性列表（如 "\\noselect"、"\\sent"），
+            special_use 为识别出的用途（见 detect_special_use）
+    """
+    folders = []
+    for line in _join_untagged_lines(data):
+        try:
+            tokens = tokenize(line)
+        except ValueError:
+            continue
+        if len(tokens) < 3 or not isinstance(tokens[0], list):
+            continue
+        flags, delimiter, path = tokens[0], tokens[1], tokens[2]
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", errors="replace")
+        if not isinstance(path, str):
+            continue
+        name = decode_modified_utf7(path)
+        flags = [flag.lower() for flag in flags if isinstance(flag, str)]
+        folders.append({
+            "name": name,
+            "path": path,
+            "delimiter": delimiter,
+            "flags": flags,
+            "special_use": detect_special_use(flags, name, delimiter)
+        })
+    return folders
+
+
+def parse_status_response(data: list) -> Dict[str, Dict[str, int]]:
+    """解析 STATUS 响应，返回 {原始文件夹名: {MESSAGES, UNSEEN, UIDNEXT, ...}}"""
+    result = {}
+    for line in _join_untagged_lines(data):
+        try:
+            tokens = tokenize(line)
+        except ValueError:
+            continue
+        if len(tokens) < 2 or not isinstance(tokens[-1], list):
+            continue
+        path = tokens[0]
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", errors="replace")
+        items = tokens[-1]
+        values = {}
+        for i in range(0, len(items) - 1, 2):
+            try:
+                values[str(items[i]).upper()] = int(items[i + 1])
+            except (TypeError, ValueError):
+                continue
+        result[path] = values
+    return result
+
+
+# ==================== BODYSTRUCTURE ====================
+
+def _params_to_dict(params) -> Dict[str, str]:
+    """将 ("CHARSET" "utf-8" "NAME" "a.pdf") 转为字典（键小写）"""
+    result = {}
+    if isinstance(params, list):
+        for i in range(0, len(params) - 1, 2):
+            key, value = params[i], params[i + 1]
+            if isinstance(key, str) and value is not None:
+                if isinstance(value, bytes):
+                    value = value.decode("utf-8", errors="replace")
+                result[key.lower()] = value
+    return result
+
+
+def _decode_param(params: Dict[str, str], name: str) -> Optional[str]:
+    """读取参数值，支持 RFC 2231（filename*）和 RFC 2047 编码"""
+    if f"{name}*" in params:
+        value = params[f"{name}*"]
+        try:
+            charset, _, encoded = value.split("'", 2)
+            return unquote_to_bytes(encoded).decode(charset or "utf-8", errors="replace")
+        except (ValueError, LookupError):
+            return value
+    value = params.get(name)
+    if value and "=?" in value:
+        try:
+            return str(make_header(decode_header(value)))
+        except Exception:
+            return value
+    return value
+
+
+def walk_bodystructure(structure: list, prefix: str = "") -> List[Dict[str, Any]]:
+    """展开 BODYSTRUCTURE 为叶子部分列表
+
+    Returns:
+        List[Dict]: [{section, content_type, charset, encoding, size, content_id, disposition, filename}]
+            section 为可用于 BODY[section] 的部分编号，如 "1"、"1.2"
+    """
+    if not isinstance(structure, list) or not structure:
+        return []
+
+    # 多部分：若干子结构后跟子类型
+    if isinstance(structure[0], list):
+        parts = []
+        index = 0
+        for child in structure:
+            if not isinstance(child, list):
+                break
+            index += 1
+            section = f"{prefix}.{index}" if prefix else str(index)
+            parts.extend(walk_bodystructure(child, section))
+        return parts
+
+    main_type = (structure[0] or "text").lower()
+    sub_type = (structure[1] or "plain").lower() if len(structure) > 1 else "plain"
+    params = _params_to_dict(structure[2] if len(structure) > 2 else None)
+    content_id = structure[3] if len(structure) > 3 else None
+    encoding = (structure[5] or "7bit").lower() if len(structure) > 5 else "7bit"
+    try:
+        size = int(structure[6]) if len(structure) > 6 else 0
+    except (TypeError, ValueError):
+        size = 0
+
+    # 扩展字段中 disposition 的位置取决于类型
+    if main_type == "text":
+        disposition_index = 9
+    elif main_type == "message" and sub_type == "rfc822":
+        disposition_index = 11
+    else:
+        disposition_index = 8
+
+    disposition = None
+    disposition_params: Dict[str, str] = {}
+    if len(structure) > disposition_index and isinstance(structure[disposition_index], list):
+        disposition_data = structure[disposition_index]
+        if disposition_data and isinstance(disposition_data[0], str):
+            disposition = disposition_data[0].lower()
+        if len(disposition_data) > 1:
+            disposition_params = _params_to_dict(disposition_data[1])
+
+    filename = _decode_param(disposition_params, "filename") or _decode_param(params, "name")
+
+    return [{
+        # 单部分邮件的正文部分编号为 1
+        "section": prefix or "1",
+        "content_type": f"{main_type}/{sub_type}",
+        "charset": params.get("charset"),
+        "encoding": encoding,
+        "size": size,
+        "content_id": content_id.strip("<>") if isinstance(content_id, str) else None,
+        "disposition": disposition,
+        "filename": filename
+    }]
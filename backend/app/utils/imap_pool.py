@@ -0,0 +1,231 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: IMAP 连接池 - 按账户复用已登录的 IMAP 会话，支持 NOOP 保活、空闲回收和每主机连接数限制
+'''
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.async_email_service import AsyncEmailService
+from app.logger import logger
+
+# 每个 IMAP 主机允许同时打开的最大连接数（包括空闲连接）
+IMAP_POOL_MAX_PER_HOST = int(os.getenv("IMAP_POOL_MAX_PER_HOST", "8"))
+# 每个账户最多保留的空闲连接数
+IMAP_POOL_MAX_IDLE_PER_ACCOUNT = int(os.getenv("IMAP_POOL_MAX_IDLE_PER_ACCOUNT", "2"))
+# 空闲连接超过该时间（秒）后关闭
+IMAP_POOL_IDLE_TIMEOUT = int(os.getenv("IMAP_POOL_IDLE_TIMEOUT", "600"))
+# 空闲连接超过该时间（秒）未使用时发送 NOOP 保活
+IMAP_POOL_KEEPALIVE_INTERVAL = int(os.getenv("IMAP_POOL_KEEPALIVE_INTERVAL", "120"))
+
+
+class PooledConnection:
+    """连接池中的一个连接"""
+
+    def __init__(self, key: Tuple, host: str, service: AsyncEmailService):
+        self.key = key
+        self.host = host
+        self.service = service
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class ImapConnectionPool:
+    """按账户分组的 IMAP 连接池"""
+
+    def __init__(
+        self,
+        max_per_host: int = IMAP_POOL_MAX_PER_HOST,
+        max_idle_per_account: int = IMAP_POOL_MAX_IDLE_PER_ACCOUNT,
+        idle_timeout: int = IMAP_POOL_IDLE_TIMEOUT,
+        keepalive_interval: int = IMAP_POOL_KEEPALIVE_INTERVAL
+    ):
+        self.max_per_host = max_per_host
+        self.max_idle_per_account = max_idle_per_account
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._idle: Dict[Tuple, List[PooledConnection]] = {}
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        # {连接池键: 最近一次新建连接时服务器公布的扩展}
+        self._capabilities: Dict[Tuple, frozenset] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def account_key(account) -> Tuple:
+        """连接池键：账户ID + 连接参数，账户信息修改后旧连接不会被复用"""
+        return (
+            account.id,
+            account.imap_host,
+            account.imap_port,
+            account.email,
+            account.password,
+            account.use_ssl,
+            account.imap_compress
+        )
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    def _take_idle(self, key: Tuple) -> Optional[PooledConnection]:
+        connections = self._idle.get(key)
+        if connections:
+            # 优先使用最近用过的连接
+            return connections.pop()
+        return None
+
+    def _take_idle_on_host(self, host: str) -> Optional[PooledConnection]:
+        """取出同一主机上空闲最久的其他账户连接，用于腾出主机连接名额"""
+        candidates = [
+            conn
+            for connections in self._idle.values()
+            for conn in connections
+            if conn.host == host
+        ]
+        if not candidates:
+            return None
+        oldest = max(candidates, key=lambda c: c.idle_seconds)
+        self._idle[oldest.key].remove(oldest)
+        return oldest
+
+    async def _close(self, conn: PooledConnection):
+        """关闭连接并释放主机连接名额"""
+        try:
+            await conn.service.disconnect()
+        except Exception as e:
+            logger.debug(f"关闭 IMAP 连接失败: {e}")
+        finally:
+            self._host_slot(conn.host).release()
+
+    def _abort(self, conn: PooledConnection):
+        """立即关闭 socket 并释放名额（不发送 LOGOUT）
+
+        超时或取消时线程池中的操作可能仍在使用该连接，不能再排队执行 LOGOUT。
+        """
+        conn.service.abort()
+        self._host_slot(conn.host).release()
+
+    async def _open(self, account, key: Tuple) -> PooledConnection:
+        """新建连接，主机连接数已满时先关闭该主机上的空闲连接"""
+        slot = self._host_slot(account.imap_host)
+        if slot.locked():
+            idle_conn = self._take_idle_on_host(account.imap_host)
+            if idle_conn:
+                await self._close(idle_conn)
+        await slot.acquire()
+
+        conn = PooledConnection(key, account.imap_host, AsyncEmailService.from_account(account))
+        try:
+            if not await conn.service.connect():
+                raise ConnectionError(f"连接邮箱服务器失败: {account.email}")
+        except BaseException:
+            slot.release()
+            raise
+        self._capabilities[key] = conn.service.capabilities()
+        return conn
+
+    def capabilities(self, account) -> Optional[frozenset]:
+        """账户所在服务器最近一次公布的扩展，连接池还没有为该账户建立过连接时返回 None"""
+        return self._capabilities.get(self.account_key(account))
+
+    async def _is_usable(self, conn: PooledConnection) -> bool:
+        """检查空闲连接是否可用，空闲较久的连接先发送 NOOP"""
+        if not conn.service.is_connected():
+            return False
+        if conn.idle_seconds >= self.keepalive_interval:
+            return await conn.service.noop()
+        return True
+
+    @asynccontextmanager
+    async def acquire(self, account):
+        """从连接池获取账户的已登录连接，使用完毕后自动归还
+
+        用法:
+            async with imap_pool.acquire(account) as email_service:
+                await email_service.get_new_emails(...)
+        """
+        key = self.account_key(account)
+        conn = None
+        while conn is None:
+            conn = self._take_idle(key)
+            if conn is None:
+                conn = await self._open(account, key)
+            elif not await self._is_usable(conn):
+                await self._close(conn)
+                conn = None
+
+        try:
+            yield conn.service
+        except BaseException:
+            # 出错、超时或被取消的连接状态未知，直接丢弃
+            self._abort(conn)
+            raise
+        else:
+            await self._release(conn)
+
+    async def _release(self, conn: PooledConnection):
+        """归还连接"""
+        if not conn.service.is_connected():
+            await self._close(conn)
+            return
+
+        connections = self._idle.setdefault(conn.key, [])
+        if len(connections) >= self.max_idle_per_account:
+            await self._close(conn)
+            return
+
+        conn.last_used = time.monotonic()
+        connections.append(conn)
+
+    async def _reap(self):
+        """关闭超时的空闲连接，并对其余空闲连接发送 NOOP 保活"""
+        for key in list(self._idle.keys()):
+            for conn in list(self._idle.get(key, [])):
+                if conn.idle_seconds >= self.idle_timeout:
+                    self._idle[key].remove(conn)
+                    await self._close(conn)
+                elif conn.idle_seconds >= self.keepalive_interval:
+                    # 保活期间从空闲列表中移除，避免同时被取用
+                    self._idle[key].remove(conn)
+                    if await conn.service.noop():
+                        conn.last_used = time.monotonic()
+                        self._idle[key].append(conn)
+                    else:
+                        await self._close(conn)
+            if not self._idle.get(key):
+                self._idle.pop(key, None)
+
+    async def _reaper_loop(self):
+        interval = max(1, min(self.keepalive_interval, self.idle_timeout) // 2)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._reap()
+            except Exception as e:
+                logger.error(f"IMAP 连接池回收失败: {e}")
+
+    def start(self):
+        """启动空闲连接回收任务"""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+
+    async def close(self):
+        """关闭所有空闲连接"""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        for key in list(self._idle.keys()):
+            for conn in self._idle.pop(key, []):
+                await self._close(conn)
+
+
+# 全局连接池
+imap_pool = ImapConnectionPool()
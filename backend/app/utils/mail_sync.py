@@ -0,0 +1,812 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 邮件同步 - 从 IMAP 服务器增量拉取新邮件并写入数据库
+'''
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
+
+from app.models import EmailAccount, Email, Attachment, SyncState
+from app.utils.async_email_service import imap_deadline
+from app.utils.blob_store import blob_store
+from app.utils.email_service import IMAPTimeoutError
+from app.utils.imap_parser import SPECIAL_USE_ATTRIBUTES
+from app.utils.imap_pool import imap_pool
+from app.logger import logger
+
+# 同时同步的最大账户数
+SYNC_MAX_CONCURRENCY = int(os.getenv("SYNC_MAX_CONCURRENCY", "16"))
+# 同一 IMAP 主机同时同步的最大账户数（Gmail、163 等会限制并发登录）
+SYNC_MAX_PER_HOST = int(os.getenv("SYNC_MAX_PER_HOST", "4"))
+# 单个账户的同步超时时间（秒）
+SYNC_ACCOUNT_TIMEOUT = float(os.getenv("SYNC_ACCOUNT_TIMEOUT", "120"))
+# 不支持 CONDSTORE 的服务器全量扫描标志的最小间隔（秒）
+SYNC_FLAG_SWEEP_INTERVAL = int(os.getenv("SYNC_FLAG_SWEEP_INTERVAL", "3600"))
+# 按 UID 批量更新/删除时每条 SQL 包含的 UID 数量
+SYNC_UID_BATCH = 500
+# UIDVALIDITY 变化后单次同步用于重新绑定 UID 的最长时间（秒），剩余部分下次同步继续
+SYNC_REMAP_BUDGET = float(os.getenv("SYNC_REMAP_BUDGET", "60"))
+# 每批写入数据库的邮件数量（一次 IN 查询已存在的邮件，新邮件和附件各一次批量插入）
+SYNC_STORE_BATCH = int(os.getenv("SYNC_STORE_BATCH", "200"))
+# 内嵌图片按需获取失败后的重试间隔（秒），期间查看邮件不再连接服务器
+INLINE_IMAGE_RETRY_INTERVAL = int(os.getenv("INLINE_IMAGE_RETRY_INTERVAL", "86400"))
+# 文件夹列表（含邮件数和未读数）的缓存时间（秒），过期后先返回缓存再在后台刷新
+FOLDER_CACHE_TTL = int(os.getenv("FOLDER_CACHE_TTL", "300"))
+# 账户未单独配置时同步的文件夹（用途或服务器文件夹名，逗号分隔）
+SYNC_DEFAULT_FOLDERS = [
+    name.strip() for name in os.getenv("SYNC_DEFAULT_FOLDERS", "inbox,sent,archive,junk").split(",") if name.strip()
+]
+# 同一账户同时同步的最大文件夹数（每个文件夹占用一个连接池连接）
+SYNC_FOLDER_CONCURRENCY = int(os.getenv("SYNC_FOLDER_CONCURRENCY", "3"))
+
+# 同步进度回调，参数为 {"event": ..., ...}
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# 文件夹用途 -> 本地文件夹名（不同服务商的 "Sent Items"、"已发送" 等统一保存为 "Sent"）
+SPECIAL_USE_LOCAL_NAMES = {
+    "inbox": "INBOX",
+    "sent": "Sent",
+    "drafts": "Drafts",
+    "archive": "Archive",
+    "junk": "Junk",
+    "trash": "Trash",
+    "all": "All",
+    "flagged": "Flagged"
+}
+
+_global_slots: Optional[asyncio.Semaphore] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+# {连接池键: (加载时间, 文件夹列表)}
+_folder_cache: Dict[tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+_folder_locks: Dict[tuple, asyncio.Lock] = {}
+_folder_refresh_tasks: set = set()
+# 正在同步的 (账户ID, 本地文件夹名)
+_syncing: set = set()
+# 正在从服务器获取内嵌图片的邮件ID，同一封邮件的并发查看只获取一次
+_hydrating: set = set()
+# {(账户ID, 本地文件夹名): 锁}，同一文件夹的增量同步串行执行
+_sync_locks: Dict[tuple, asyncio.Lock] = {}
+
+
+def _get_global_slots() -> asyncio.Semaphore:
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(SYNC_MAX_CONCURRENCY)
+    return _global_slots
+
+
+def _get_host_slots(host: str) -> asyncio.Semaphore:
+    if host not in _host_slots:
+        _host_slots[host] = asyncio.Semaphore(SYNC_MAX_PER_HOST)
+    return _host_slots[host]
+
+
+def _get_sync_lock(account_id: str, folder: str) -> asyncio.Lock:
+    key = (account_id, folder)
+    if key not in _sync_locks:
+        _sync_locks[key] = asyncio.Lock()
+    return _sync_locks[key]
+
+
+def compression_ratio(wire_bytes: int, raw_bytes: int) -> Optional[float]:
+    """压缩比（解压后字节数 / 网络传输字节数），没有传输数据时为 None"""
+    return round(raw_bytes / wire_bytes, 2) if wire_bytes else None
+
+
+def _transfer_delta(before: Tuple[int, int], after: Tuple[int, int]) -> Tuple[int, int]:
+    """两次 transfer_stats 之间接收的字节数；期间重新连接时计数从零开始，取新连接的计数"""
+    if after[0] < before[0] or after[1] < before[1]:
+        return after
+    return after[0] - before[0], after[1] - before[1]
+
+
+def _flag_state(flags: Optional[List[str]]):
+    """将 IMAP 标志转换为 (is_read, is_starred)"""
+    flags = {flag.lower() for flag in flags or []}
+    return "\\seen" in flags, "\\flagged" in flags
+
+
+def normalize_message_id(message_id: Optional[str]) -> str:
+    """规范化 Message-ID：去掉折行空白和两侧的尖括号"""
+    return " ".join(str(message_id or "").split()).strip("<>").strip()
+
+
+def email_message_key(email_data: Dict[str, Any]) -> str:
+    """邮件去重键
+
+    有 Message-ID 时为规范化 Message-ID 的 SHA-256；缺失时使用发件人、收件人、抄送、日期和主题的 SHA-256，
+    只取邮件头，同一封邮件只获取邮件头或同时获取正文时得到的键相同。
+    日期去掉时区（与数据库中保存的值相同），已入库的邮件可以按行中的字段重新计算出相同的键。
+    """
+    message_id = normalize_message_id(email_data.get("message_id"))
+    if message_id:
+        source = f"id:{message_id}"
+    else:
+        date = email_data.get("date")
+        headers = [
+            (email_data.get("from") or {}).get("address"),
+            sorted(address.get("address") or "" for address in email_data.get("to") or []),
+            sorted(address.get("address") or "" for address in email_data.get("cc") or []),
+            date.replace(tzinfo=None) if isinstance(date, datetime) else date,
+            email_data.get("subject")
+        ]
+        source = "headers:" + json.dumps(headers, ensure_ascii=False, default=str)
+    return hashlib.sha256(source.encode("utf-8", errors="replace")).hexdigest()
+
+
+async def store_emails(
+    account: EmailAccount,
+    emails_data: List[Dict[str, Any]],
+    folder: str = "INBOX",
+    progress: Optional[ProgressCallback] = None
+) -> int:
+    """将获取到的邮件写入数据库，返回新增数量（其余为已存在而跳过的邮件）
+
+    每 SYNC_STORE_BATCH 封为一批写入，每批只需几条 SQL（不随邮件数增加）；
+    传入 progress 时每批写入后报告 {"event": "stored", folder, stored, total, inserted}。
+    """
+    new_count = 0
+    for start in range(0, len(emails_data), SYNC_STORE_BATCH):
+        batch = emails_data[start:start + SYNC_STORE_BATCH]
+        new_count += await _store_batch(account, batch, folder)
+        if progress:
+            progress({
+                "event": "stored",
+                "folder": folder,
+                "stored": start + len(batch),
+                "total": len(emails_data),
+                "inserted": new_count
+            })
+    return new_count
+
+
+async def _store_batch(account: EmailAccount, emails_data: List[Dict[str, Any]], folder: str) -> int:
+    """写入一批邮件：一次 IN 查询已存在的去重键，新邮件和附件各一次批量插入
+
+    (账户, 文件夹, 去重键) 唯一，回填和同步同时写入同一封邮件时，后插入的行被忽略。
+    去重只在文件夹内进行：邮件的 UID 和同步水位都按文件夹记录，移动到其他文件夹的邮件
+    在新文件夹中作为新邮件写入，原文件夹中的行由已删除邮件同步清理。
+    """
+    # 同一批中重复的邮件只保留第一封
+    pending: Dict[str, Dict[str, Any]] = {}
+    for email_data in emails_data:
+        pending.setdefault(email_message_key(email_data), email_data)
+
+    existing = await Email.filter(
+        account_id=account.id, folder=folder, message_key__in=list(pending)
+    ).values("id", "message_key", "uid")
+    for row in existing:
+        email_data = pending.pop(row["message_key"])
+        if row["uid"] is None:
+            # UIDVALIDITY 变化后重新下载的邮件，绑定新的 UID
+            await Email.filter(id=row["id"]).update(uid=email_data.get("uid"))
+    if not pending:
+        return 0
+
+    # 完整下载模式下内嵌图片带有内容，先转存到 blob 存储，邮件行只保留摘要
+    for email_data in pending.values():
+        if _has_inline_data(email_data.get("inline_images")):
+            await asyncio.to_thread(store_inline_image_data, email_data["inline_images"])
+
+    emails = []
+    for key, email_data in pending.items():
+        is_read, is_starred = _flag_state(email_data.get("flags"))
+        emails.append(Email(
+            account_id=account.id,
+            message_id=email_data.get("message_id"),
+            message_key=key,
+            uid=email_data.get("uid"),
+            from_address=email_data.get("from"),
+            to_addresses=email_data.get("to", []),
+            cc_addresses=email_data.get("cc"),
+            subject=email_data.get("subject"),
+            body=email_data.get("body"),
+            body_html=email_data.get("body_html"),
+            date=email_data.get("date"),
+            has_attachments=email_data.get("has_attachments", False),
+            inline_images=email_data.get("inline_images"),
+            is_read=is_read,
+            is_starred=is_starred,
+            folder=folder
+        ))
+
+    async with in_transaction() as connection:
+        await Email.bulk_create(emails, ignore_conflicts=True, using_db=connection)
+        # 忽略冲突时无法得知哪些行被跳过，按主键查询实际写入的邮件
+        inserted = set(await Email.filter(
+            id__in=[email.id for email in emails]
+        ).using_db(connection).values_list("id", flat=True))
+
+        # 附件只记录 IMAP 部分编号，下载时再从服务器获取内容
+        attachments = [
+            Attachment(
+                email_id=email.id,
+                filename=attachment.get("filename") or "attachment",
+                content_type=attachment.get("content_type"),
+                size=attachment.get("size", 0),
+                part=attachment.get("part"),
+                encoding=attachment.get("encoding")
+            )
+            for email, email_data in zip(emails, pending.values())
+            if email.id in inserted
+            for attachment in email_data.get("attachments") or []
+        ]
+        if attachments:
+            await Attachment.bulk_create(attachments, using_db=connection)
+
+    return len(inserted)
+
+
+async def store_attachment_blob(attachment: Attachment, email: Email) -> Optional[str]:
+    """返回附件内容在 blob 存储中的 SHA-256，获取失败时返回 None
+
+    首次下载时写入 blob 存储：旧数据从 content 字段转存，其余从 IMAP 服务器逐块获取，
+    不经过数据库和内存；相同内容的附件（跨邮件、跨账户）只保存一份。
+    """
+    if blob_store.exists(attachment.blob_sha256):
+        return attachment.blob_sha256
+
+    if attachment.content:
+        data = base64.b64decode(attachment.content)
+        digest, size = await asyncio.to_thread(blob_store.write_bytes, data)
+    elif attachment.part and email.uid:
+        account = await EmailAccount.get_or_none(id=email.account_id)
+        if not account:
+            return None
+        path = await resolve_folder_path(account, email.folder)
+        async with imap_pool.acquire(account) as email_service:
+            blobs = await email_service.fetch_parts_to_blobs(
+                path,
+                email.uid,
+                {attachment.part: attachment.encoding},
+                message_id=email.message_id
+            )
+        if attachment.part not in blobs:
+            return None
+        digest, size = blobs[attachment.part]
+    else:
+        return None
+
+    attachment.blob_sha256 = digest
+    attachment.size = size
+    attachment.content = None
+    await attachment.save(update_fields=["blob_sha256", "size", "content"])
+    return digest
+
+
+def _has_inline_data(images: Optional[Dict[str, Dict[str, Any]]]) -> bool:
+    return any(info.get("data") for info in (images or {}).values())
+
+
+def store_inline_image_data(images: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """将内嵌图片的 base64 内容写入 blob 存储，替换为 sha256 和 size（同步执行，会写磁盘）"""
+    for info in (images or {}).values():
+        data = info.pop("data", None)
+        if data:
+            info["sha256"], info["size"] = blob_store.write_bytes(base64.b64decode(data))
+
+
+async def hydrate_inline_images(email: Email) -> None:
+    """将尚未保存的内嵌图片写入 blob 存储并更新邮件，失败时保持原样
+
+    旧数据中的 base64 内容直接转存，只记录了部分编号的从 IMAP 服务器获取。
+    获取失败的图片记录 failed_at，INLINE_IMAGE_RETRY_INTERVAL 秒内再次查看不再连接服务器。
+    """
+    images = email.inline_images or {}
+    changed = False
+    if _has_inline_data(images):
+        await asyncio.to_thread(store_inline_image_data, images)
+        changed = True
+
+    now = int(time.time())
+    missing = {
+        info["part"]: info.get("encoding")
+        for info in images.values()
+        if info.get("part") and not blob_store.exists(info.get("sha256"))
+        and now - info.get("failed_at", 0) >= INLINE_IMAGE_RETRY_INTERVAL
+    }
+    if missing and email.uid and email.id not in _hydrating:
+        _hydrating.add(email.id)
+        try:
+            account = await EmailAccount.get(id=email.account_id)
+            path = await resolve_folder_path(account, email.folder)
+            async with imap_pool.acquire(account) as email_service:
+                blobs = await email_service.fetch_parts_to_blobs(
+                    path,
+                    email.uid,
+                    missing,
+                    message_id=email.message_id
+                )
+        except Exception as e:
+            logger.warning(f"获取邮件 {email.id} 的内嵌图片失败: {e}")
+            blobs = {}
+        finally:
+            _hydrating.discard(email.id)
+        for info in images.values():
+            if info.get("part") in blobs:
+                info["sha256"], info["size"] = blobs[info["part"]]
+                info.pop("failed_at", None)
+            elif info.get("part") in missing:
+                info["failed_at"] = now
+            else:
+                continue
+            changed = True
+
+    if changed:
+        email.inline_images = images
+        await email.save(update_fields=["inline_images"])
+
+
+async def _load_folders(account: EmailAccount, key: tuple, since: float) -> List[Dict[str, Any]]:
+    """从服务器加载文件夹列表，同一账户同时只有一个请求，等待期间已被刷新时直接使用结果"""
+    lock = _folder_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _folder_cache.get(key)
+        if cached and cached[0] >= since:
+            return cached[1]
+        async with imap_pool.acquire(account) as email_service:
+            folders = await email_service.get_folders()
+        if folders:
+            _folder_cache[key] = (time.monotonic(), folders)
+        return folders
+
+
+async def _refresh_folders(account: EmailAccount, key: tuple):
+    try:
+        await _load_folders(account, key, time.monotonic())
+    except Exception as e:
+        logger.warning(f"后台刷新账户 {account.email} 的文件夹列表失败: {e}")
+
+
+async def list_account_folders(account: EmailAccount, refresh: bool = False) -> List[Dict[str, Any]]:
+    """获取账户的文件夹列表（含邮件数和未读数），按账户缓存 FOLDER_CACHE_TTL 秒
+
+    缓存过期时立即返回旧数据，同时在后台刷新；refresh 为 True 时等待服务器返回最新数据。
+    """
+    key = imap_pool.account_key(account)
+    cached = _folder_cache.get(key)
+    now = time.monotonic()
+    if cached and not refresh:
+        lock = _folder_locks.get(key)
+        if now - cached[0] >= FOLDER_CACHE_TTL and not (lock and lock.locked()):
+            task = asyncio.create_task(_refresh_folders(account, key))
+            _folder_refresh_tasks.add(task)
+            task.add_done_callback(_folder_refresh_tasks.discard)
+        return cached[1]
+    return await _load_folders(account, key, now)
+
+
+def _is_selectable(folder: Dict[str, Any]) -> bool:
+    return not {"\\noselect", "\\nonexistent"} & set(folder["flags"])
+
+
+async def resolve_sync_folders(
+    account: EmailAccount,
+    folders: Optional[List[str]] = None
+) -> List[Tuple[str, str]]:
+    """将要同步的文件夹（用途或服务器文件夹名）解析为 [(本地文件夹名, 服务器文件夹名)]
+
+    用途（inbox/sent/archive/junk 等）按 SPECIAL-USE 属性匹配，没有属性时按常见文件夹名匹配，
+    本地统一保存为 SPECIAL_USE_LOCAL_NAMES 中的名称；其他名称按服务器文件夹名原样同步。
+    获取文件夹列表失败时只同步 INBOX。
+    """
+    wanted = folders or account.sync_folders or SYNC_DEFAULT_FOLDERS
+    if [name.lower() for name in wanted] == ["inbox"]:
+        return [("INBOX", "INBOX")]
+    
+    try:
+        listed = [folder for folder in await list_account_folders(account) if _is_selectable(folder)]
+    except Exception as e:
+        logger.warning(f"获取账户 {account.email} 的文件夹列表失败，只同步收件箱: {e}")
+        listed = []
+    
+    resolved: Dict[str, str] = {}
+    for name in wanted:
+        role = name.lower()
+        if role == "inbox":
+            resolved.setdefault("INBOX", "INBOX")
+            continue
+        if role in SPECIAL_USE_LOCAL_NAMES:
+            candidates = [folder for folder in listed if folder.get("special_use") == role]
+            # 服务器声明了 SPECIAL-USE 属性的文件夹优先于按名称识别的文件夹
+            candidates.sort(key=lambda folder: not SPECIAL_USE_ATTRIBUTES.keys() & set(folder["flags"]))
+            if candidates:
+                resolved.setdefault(SPECIAL_USE_LOCAL_NAMES[role], candidates[0]["path"])
+            continue
+        match = next((folder for folder in listed if name in (folder["path"], folder["name"])), None)
+        if match:
+            resolved.setdefault(match["name"], match["path"])
+        else:
+            logger.warning(f"账户 {account.email} 没有文件夹 {name}，已跳过")
+    
+    if not resolved:
+        resolved["INBOX"] = "INBOX"
+    return list(resolved.items())
+
+
+async def resolve_folder_path(account: EmailAccount, folder: str) -> str:
+    """本地文件夹名对应的服务器文件夹名（同步时记录在 SyncState.path 中）"""
+    state = await SyncState.get_or_none(account_id=account.id, folder=folder)
+    return state.path if state and state.path else folder
+
+
+def invalidate_folder_cache(account: EmailAccount):
+    """标记文件夹缓存过期（邮件数变化后调用），下次读取时在后台刷新"""
+    key = imap_pool.account_key(account)
+    if key in _folder_cache:
+        _folder_cache[key] = (float("-inf"), _folder_cache[key][1])
+
+
+async def sync_folder_flags(account: EmailAccount, email_service, state: SyncState) -> Dict[str, int]:
+    """同步已下载邮件的已读/星标状态，并删除服务器上已不存在的邮件
+
+    支持 QRESYNC/CONDSTORE 的服务器只拉取 modseq 之后的变化，QRESYNC 的删除由 VANISHED 返回；
+    只支持 CONDSTORE 时，服务器邮件数与本地不同或到达 SYNC_FLAG_SWEEP_INTERVAL 时才核对现存 UID；
+    不支持的服务器每 SYNC_FLAG_SWEEP_INTERVAL 秒分段全量拉取一次标志。
+
+    Returns:
+        Dict[str, int]: {updated, vanished}
+    """
+    stats = {"updated": 0, "vanished": 0}
+    if not state.last_uid:
+        return stats
+    
+    now = datetime.now()
+    full_sweep = (
+        state.flags_synced_at is None
+        or (now - state.flags_synced_at).total_seconds() >= SYNC_FLAG_SWEEP_INTERVAL
+        or (state.highest_modseq is None and email_service.has_capability("CONDSTORE"))
+    )
+    local = Email.filter(account_id=account.id, folder=state.folder)
+    # 只比较邮件数（索引计数），不读取本地全部 UID
+    local_count = await local.exclude(uid=None).count() if email_service.has_capability("CONDSTORE") else None
+    changes = await email_service.get_flag_changes(
+        folder=state.path or state.folder,
+        uid_validity=state.uid_validity,
+        highest_modseq=state.highest_modseq,
+        last_uid=state.last_uid,
+        full_sweep=full_sweep,
+        local_count=local_count
+    )
+    if changes is None or changes["mode"] in ("skip", "reset"):
+        return stats
+    
+    groups: Dict[tuple, List[int]] = {}
+    for uid, flags in changes["flags"].items():
+        groups.setdefault(_flag_state(flags), []).append(uid)
+    for (is_read, is_starred), uids in groups.items():
+        for start in range(0, len(uids), SYNC_UID_BATCH):
+            stats["updated"] += await local.filter(
+                uid__in=uids[start:start + SYNC_UID_BATCH]
+            ).filter(
+                Q(is_read=not is_read) | Q(is_starred=not is_starred)
+            ).update(is_read=is_read, is_starred=is_starred)
+    
+    vanished = changes["vanished"] or []
+    if changes["existing"] is not None:
+        local_uids = await local.filter(uid__lte=state.last_uid).exclude(uid=None).values_list("uid", flat=True)
+        vanished = [uid for uid in local_uids if uid not in changes["existing"]]
+    for start in range(0, len(vanished), SYNC_UID_BATCH):
+        stats["vanished"] += await local.filter(uid__in=vanished[start:start + SYNC_UID_BATCH]).delete()
+    
+    state.highest_modseq = changes["highest_modseq"]
+    state.flags_synced_at = now
+    
+    if stats["updated"] or stats["vanished"]:
+        logger.info(
+            f"账户 {account.email} 文件夹 {state.folder} 标志同步（{changes['mode']}）: "
+            f"更新 {stats['updated']} 封，删除 {stats['vanished']} 封"
+        )
+    return stats
+
+
+async def remap_folder_uids(account: EmailAccount, email_service, state: SyncState) -> bool:
+    """UIDVALIDITY 变化后按去重键为文件夹中的本地邮件重新绑定 UID，全部完成时返回 True
+
+    按 UID 从小到大每 SYNC_UID_BATCH 封一段：获取组成去重键的邮件头，先清空 UID 落在本段
+    但去重键不符的本地邮件（旧 UID 恰好与新 UID 相同），再按去重键绑定新 UID，
+    每段完成后将断点保存到 state.remap_cursor_uid。单次同步最多执行 SYNC_REMAP_BUDGET 秒，
+    剩余部分由下次同步从断点继续，大文件夹不会因同步超时反复从头开始。
+    绑定前本地邮件保留旧 UID；全部完成后清空服务器上已不存在的邮件的 UID。
+    期间 UIDVALIDITY 再次变化时抛出异常，下次同步重新开始。
+    """
+    path = state.path or state.folder
+    local = Email.filter(account_id=account.id, folder=state.folder)
+    start = time.monotonic()
+    _, uids = await email_service.list_uids(path, above_uid=state.remap_cursor_uid)
+    for offset in range(0, len(uids), SYNC_UID_BATCH):
+        chunk = uids[offset:offset + SYNC_UID_BATCH]
+        headers = await email_service.fetch_key_headers(path, chunk, state.remap_uid_validity)
+        if headers is None:
+            raise RuntimeError(f"文件夹 {path} 的 UIDVALIDITY 在重新绑定 UID 期间再次变化")
+        new_uids = {email_message_key(email_data): email_data["uid"] for email_data in headers}
+        server_keys = {uid: key for key, uid in new_uids.items()}
+        stale = [
+            row["id"]
+            for row in await local.filter(uid__in=chunk).values("id", "uid", "message_key")
+            if server_keys.get(row["uid"]) != row["message_key"]
+        ]
+        if stale:
+            await Email.filter(id__in=stale).update(uid=None)
+        rows = await local.filter(message_key__in=list(new_uids)).values("id", "message_key")
+        if rows:
+            await Email.bulk_update(
+                [Email(id=row["id"], uid=new_uids[row["message_key"]]) for row in rows],
+                fields=["uid"]
+            )
+        state.remap_cursor_uid = chunk[-1]
+        await state.save(update_fields=["remap_cursor_uid"])
+        remaining = len(uids) - offset - len(chunk)
+        if remaining and time.monotonic() - start >= SYNC_REMAP_BUDGET:
+            logger.info(
+                f"账户 {account.email} 文件夹 {state.folder} 重新绑定 UID 已处理到 UID {state.remap_cursor_uid}，"
+                f"剩余 {remaining} 封下次同步继续"
+            )
+            return False
+
+    # 服务器上已不存在的邮件：旧 UID 不在当前 UID 列表中
+    _, server_uids = await email_service.list_uids(path)
+    server_uids = set(server_uids)
+    gone = [
+        row["id"]
+        for row in await local.exclude(uid=None).values("id", "uid")
+        if row["uid"] not in server_uids
+    ]
+    for offset in range(0, len(gone), SYNC_UID_BATCH):
+        await Email.filter(id__in=gone[offset:offset + SYNC_UID_BATCH]).update(uid=None)
+    state.remap_uid_validity = None
+    state.remap_cursor_uid = None
+    await state.save(update_fields=["remap_uid_validity", "remap_cursor_uid"])
+    logger.info(
+        f"账户 {account.email} 文件夹 {state.folder} 按去重键重新绑定 UID 完成"
+        f"（服务器上共 {len(server_uids)} 封，{len(gone)} 封本地邮件已不在服务器上）"
+    )
+    return True
+
+
+async def sync_account_emails(
+    account: EmailAccount,
+    folder: str = "INBOX",
+    limit: int = 20,
+    path: Optional[str] = None,
+    stats: Optional[Dict[str, int]] = None,
+    progress: Optional[ProgressCallback] = None
+) -> int:
+    """增量同步账户的一个文件夹，只下载 UID 水位线之后的新邮件
+
+    Args:
+        folder: 本地文件夹名（邮件保存到该文件夹）
+        path: 服务器上的文件夹名，为空时与 folder 相同
+        stats: 传入时写入本次同步的获取数、失败数和接收的字节数
+            {fetched, failed, bytesReceived, bytesUncompressed}
+        progress: 进度回调，见 store_emails
+
+    Returns:
+        int: 新增邮件数量
+    """
+    # 调度器、推送监听和手动刷新可能同时同步同一文件夹，逐个执行以免重复下载同一批 UID
+    async with _get_sync_lock(account.id, folder):
+        state, _ = await SyncState.get_or_create(account_id=account.id, folder=folder)
+        if path and path != folder:
+            state.path = path
+        
+        # 复用连接池中已登录的会话，跳过 TCP/TLS 握手和 LOGIN
+        async with imap_pool.acquire(account) as email_service:
+            transfer_start = email_service.transfer_stats()
+            failures_start = email_service.fetch_failures
+            emails_data, uid_validity, last_uid = await email_service.get_new_emails(
+                folder=state.path or folder,
+                uid_validity=state.uid_validity,
+                last_uid=state.last_uid,
+                limit=limit,
+                fetch_body=True
+            )
+        
+            if (
+                state.uid_validity is not None
+                and uid_validity != state.uid_validity
+                and uid_validity != state.remap_uid_validity
+            ):
+                # UIDVALIDITY 变化后本地记录的 UID 全部失效，记录断点后分段按去重键重新对应整个文件夹
+                state.remap_uid_validity = uid_validity
+                state.remap_cursor_uid = 0
+                state.highest_modseq = None
+                state.flags_synced_at = None
+                await state.save(
+                    update_fields=["remap_uid_validity", "remap_cursor_uid", "highest_modseq", "flags_synced_at"]
+                )
+            if state.remap_uid_validity is not None:
+                await remap_folder_uids(account, email_service, state)
+        
+            new_count = await store_emails(account, emails_data, folder=folder, progress=progress)
+        
+            state.uid_validity = uid_validity
+            state.last_uid = last_uid
+            state.last_synced_at = datetime.now()
+            state.last_new_count = new_count
+            state.last_error = None
+        
+            # 在同一连接上同步已有邮件的标志变化（重新绑定 UID 完成前本地 UID 不可靠，暂不同步）
+            if state.remap_uid_validity is None:
+                await sync_folder_flags(account, email_service, state)
+        
+            wire_bytes, raw_bytes = _transfer_delta(transfer_start, email_service.transfer_stats())
+            state.bytes_received += wire_bytes
+            state.bytes_uncompressed += raw_bytes
+            if stats is not None:
+                stats.update(
+                    fetched=len(emails_data),
+                    failed=email_service.fetch_failures - failures_start,
+                    bytesReceived=wire_bytes,
+                    bytesUncompressed=raw_bytes
+                )
+        
+        await state.save()
+        if new_count:
+            invalidate_folder_cache(account)
+        
+        logger.success(f"账户 {account.email} 文件夹 {folder} 获取到 {len(emails_data)} 封新邮件，新增 {new_count} 封")
+        
+        return new_count
+
+
+async def _sync_folder(
+    account: EmailAccount,
+    folder: str,
+    path: str,
+    limit: int,
+    slots: asyncio.Semaphore,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """同步一个文件夹，异常记录在结果和 SyncState.last_error 中而不抛出
+
+    fetched 为获取到的新邮件数，其中 newCount 封写入数据库，skipped 封已存在而跳过；
+    failed 为获取或解析失败的邮件数。
+    """
+    result = {
+        "folder": folder,
+        "path": path,
+        "success": False,
+        "fetched": 0,
+        "newCount": 0,
+        "skipped": 0,
+        "failed": 0,
+        "bytesReceived": 0,
+        "bytesUncompressed": 0,
+        "error": None,
+        "duration": 0.0
+    }
+    
+    async with slots:
+        start = time.monotonic()
+        key = (account.id, folder)
+        _syncing.add(key)
+        try:
+            result["newCount"] = await sync_account_emails(
+                account, folder=folder, limit=limit, path=path, stats=result, progress=progress
+            )
+            result["skipped"] = result["fetched"] - result["newCount"]
+            result["success"] = True
+        except Exception as e:
+            result["error"] = str(e) or e.__class__.__name__
+            logger.error(f"账户 {account.email} 文件夹 {path} 同步失败: {e}")
+            await SyncState.filter(account_id=account.id, folder=folder).update(last_error=result["error"])
+        finally:
+            _syncing.discard(key)
+        result["duration"] = round(time.monotonic() - start, 3)
+    
+    if progress:
+        progress({"event": "folder", **result})
+    return result
+
+
+async def sync_account_folders(
+    account: EmailAccount,
+    folders: Optional[List[str]] = None,
+    limit: int = 20,
+    progress: Optional[ProgressCallback] = None
+) -> List[Dict[str, Any]]:
+    """并发同步账户的多个文件夹（每个文件夹使用一个连接池连接），返回每个文件夹的结果
+
+    传入 progress 时依次报告 {"event": "folders"}（要同步的文件夹）、
+    {"event": "stored"}（每批写入）和 {"event": "folder"}（文件夹完成）。
+    """
+    targets = await resolve_sync_folders(account, folders)
+    if progress:
+        progress({"event": "folders", "folders": [{"folder": folder, "path": path} for folder, path in targets]})
+    slots = asyncio.Semaphore(max(SYNC_FOLDER_CONCURRENCY, 1))
+    return await asyncio.gather(*(
+        _sync_folder(account, folder, path, limit, slots, progress)
+        for folder, path in targets
+    ))
+
+
+def is_folder_syncing(account_id: str, folder: str) -> bool:
+    """文件夹是否正在同步"""
+    return (account_id, folder) in _syncing
+
+
+async def sync_account_safely(
+    account: EmailAccount,
+    folders: Optional[List[str]] = None,
+    limit: int = 20,
+    timeout: float = SYNC_ACCOUNT_TIMEOUT,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """在全局和主机并发限制内同步单个账户的文件夹，超时和异常记录在结果中而不抛出
+
+    任一文件夹同步成功即视为成功，各文件夹的结果在 folders 中；
+    fetched/newCount/skipped/failed 为各文件夹获取、新增、已存在跳过和获取失败的邮件数之和；
+    bytesReceived 为网络传输的字节数，compressionRatio 为开启 COMPRESS=DEFLATE 后的压缩比。
+    """
+    result = {
+        "accountId": account.id,
+        "email": account.email,
+        "success": False,
+        "fetched": 0,
+        "newCount": 0,
+        "skipped": 0,
+        "failed": 0,
+        "bytesReceived": 0,
+        "bytesUncompressed": 0,
+        "compressionRatio": None,
+        "error": None,
+        "duration": 0.0,
+        "folders": []
+    }
+    
+    async with _get_global_slots(), _get_host_slots(account.imap_host):
+        start = time.monotonic()
+        try:
+            # IMAP 操作使用同一截止时间，超时后线程中的读写随即中断，不会在后台继续占用连接
+            with imap_deadline(timeout):
+                folder_results = await asyncio.wait_for(
+                    sync_account_folders(account, folders=folders, limit=limit, progress=progress),
+                    timeout=timeout
+                )
+            result["folders"] = folder_results
+            for name in ("fetched", "newCount", "skipped", "failed"):
+                result[name] = sum(r[name] for r in folder_results)
+            result["bytesReceived"] = sum(r["bytesReceived"] for r in folder_results)
+            result["bytesUncompressed"] = sum(r["bytesUncompressed"] for r in folder_results)
+            result["compressionRatio"] = compression_ratio(result["bytesReceived"], result["bytesUncompressed"])
+            result["success"] = any(r["success"] for r in folder_results)
+            errors = [f"{r['folder']}: {r['error']}" for r in folder_results if r["error"]]
+            result["error"] = "；".join(errors) or None
+        except IMAPTimeoutError as e:
+            result["error"] = str(e)
+            logger.warning(f"账户 {account.email} 同步超时: {e}")
+        except asyncio.TimeoutError:
+            result["error"] = f"同步超时（{timeout:.0f} 秒）"
+            logger.warning(f"账户 {account.email} 同步超时")
+        except Exception as e:
+            result["error"] = str(e) or e.__class__.__name__
+            logger.error(f"账户 {account.email} 同步失败: {e}")
+        result["duration"] = round(time.monotonic() - start, 3)
+    
+    return result
+
+
+async def sync_accounts(
+    accounts: List[EmailAccount],
+    folders: Optional[List[str]] = None,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """并发同步多个账户，总耗时接近最慢的账户而不是所有账户之和
+
+    folders 为空时使用各账户配置的文件夹（未配置时为 SYNC_DEFAULT_FOLDERS）。
+    """
+    return await asyncio.gather(*(
+        sync_account_safely(account, folders=folders, limit=limit)
+        for account in accounts
+    ))
@@ -0,0 +1,81 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: MIME 解析进程池 - 批量同步时把邮件解析（字符集解码、头部解码、内嵌图片 base64）交给子进程，不占用服务进程的 GIL
+'''
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+from app.logger import logger
+
+# 解析进程数量，0 表示不使用进程池，在 IMAP 线程中解析
+MIME_POOL_WORKERS = int(os.getenv("MIME_POOL_WORKERS", "2"))
+# 一批少于该数量的邮件直接在当前线程解析（进程间传输的开销大于收益）
+MIME_POOL_MIN_BATCH = int(os.getenv("MIME_POOL_MIN_BATCH", "4"))
+
+
+class MimeParsePool:
+    """按需创建的 MIME 解析进程池
+
+    使用 spawn 启动子进程：服务进程中有事件循环和 IMAP 线程，fork 后可能继承被占用的锁。
+    进程池异常退出时返回 None，由调用方回退到当前线程解析，下次使用时重新创建。
+    """
+
+    def __init__(self, workers: int = MIME_POOL_WORKERS, min_batch: int = MIME_POOL_MIN_BATCH):
+        self.workers = workers
+        self.min_batch = min_batch
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def map(self, func: Callable[[List[Any]], List[Any]], jobs: List[Any]) -> Optional[List[Any]]:
+        """将任务平均分给各进程，func 接收一组任务并返回等长的结果列表
+
+        Returns:
+            Optional[List]: 与 jobs 顺序一致的结果；进程池未启用、任务太少或进程池异常时返回 None
+        """
+        if not self.enabled or len(jobs) < max(self.min_batch, 1):
+            return None
+
+        size = -(-len(jobs) // self.workers)
+        try:
+            executor = self._get_executor()
+            futures = [executor.submit(func, jobs[start:start + size]) for start in range(0, len(jobs), size)]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+            return results
+        except BrokenProcessPool as e:
+            logger.error(f"MIME 解析进程池异常，改为在当前线程解析: {e}")
+            with self._lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            return None
+
+    def shutdown(self):
+        """关闭进程池（在 lifespan 中调用）"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# 全局 MIME 解析进程池
+mime_pool = MimeParsePool()
@@ -0,0 +1,337 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 流式 MIME 解析 - 按块解析邮件，逐部分增量解码，大部分写入临时文件，内存占用与邮件大小无关
+'''
+import binascii
+import tempfile
+from email.message import Message
+from email.parser import BytesHeaderParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union, IO
+
+# 每次读取/解析的块大小
+CHUNK_SIZE = 64 * 1024
+# 头部超过此大小视为异常邮件，剩余内容按正文处理
+MAX_HEADER_SIZE = 256 * 1024
+# 默认单个部分在内存中保留的最大字节数，超出后写入临时文件
+DEFAULT_MAX_PART_MEMORY = 1024 * 1024
+
+
+class _IdentityDecoder:
+    """7bit/8bit/binary，无需解码"""
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _Base64Decoder:
+    """增量 base64 解码，保留不足 4 字符的尾部等待下一块"""
+
+    def __init__(self):
+        self.pending = b""
+
+    def decode(self, data: bytes) -> bytes:
+        data = self.pending + data.translate(None, b" \t\r\n")
+        cut = len(data) - len(data) % 4
+        self.pending = data[cut:]
+        try:
+            return binascii.a2b_base64(data[:cut])
+        except binascii.Error:
+            return b""
+
+    def flush(self) -> bytes:
+        if not self.pending:
+            return b""
+        data = self.pending + b"=" * (-len(self.pending) % 4)
+        self.pending = b""
+        try:
+            return binascii.a2b_base64(data)
+        except binascii.Error:
+            return b""
+
+
+class _QuotedPrintableDecoder:
+    """增量 quoted-printable 解码，按整行解码以正确处理软换行"""
+
+    def __init__(self):
+        self.pending = b""
+
+    def decode(self, data: bytes) -> bytes:
+        data = self.pending + data
+        cut = data.rfind(b"\n") + 1
+        if not cut and len(data) > CHUNK_SIZE:
+            # 超长行：保留最后 2 字节，避免截断 =XX 转义
+            cut = len(data) - 2
+        self.pending = data[cut:]
+        return binascii.a2b_qp(data[:cut]) if cut else b""
+
+    def flush(self) -> bytes:
+        data, self.pending = self.pending, b""
+        return binascii.a2b_qp(data) if data else b""
+
+
+def _make_decoder(encoding: str):
+    if encoding == "base64":
+        return _Base64Decoder()
+    if encoding == "quoted-printable":
+        return _QuotedPrintableDecoder()
+    return _IdentityDecoder()
+
+
+class MimePart:
+    """流式解析得到的叶子部分
+
+    内容解码后写入 SpooledTemporaryFile：不超过内存上限时留在内存，超出后自动转存到临时文件。
+    不需要内容的部分（如附件）只统计大小，不保存内容。
+    """
+
+    def __init__(self, section: str, headers: Message):
+        self.section = section
+        self.headers = headers
+        self.content_type = headers.get_content_type()
+        self.encoding = str(headers.get("Content-Transfer-Encoding", "7bit")).strip().lower()
+        self.size = 0
+        self.file: Optional[IO[bytes]] = None
+        self._decoder = _make_decoder(self.encoding)
+
+    @property
+    def content_id(self) -> str:
+        return str(self.headers.get("Content-ID", "")).strip()
+
+    @property
+    def disposition(self) -> str:
+        return str(self.headers.get("Content-Disposition", ""))
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self.headers.get_filename()
+
+    @property
+    def charset(self) -> Optional[str]:
+        return self.headers.get_content_charset()
+
+    def open(self, max_memory: int):
+        """保留该部分的内容"""
+        self.file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+
+    def write(self, data: bytes):
+        self._emit(self._decoder.decode(data))
+
+    def _emit(self, decoded: bytes):
+        self.size += len(decoded)
+        if self.file is not None and decoded:
+            self.file.write(decoded)
+
+    def close(self):
+        self._emit(self._decoder.flush())
+        if self.file is not None:
+            self.file.seek(0)
+
+    def read(self) -> bytes:
+        """读取解码后的全部内容"""
+        if self.file is None:
+            return b""
+        self.file.seek(0)
+        return self.file.read()
+
+    def release(self):
+        """释放内容（关闭并删除临时文件）"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class StreamingMimeParser:
+    """按块解析 MIME 邮件
+
+    只缓存当前行和头部，正文逐块解码写入各部分，部分编号与 IMAP BODYSTRUCTURE 一致，
+    附带的 message/rfc822 邮件整体作为一个部分。
+
+    用法:
+        parser = StreamingMimeParser(keep=lambda part: ...)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+        parser.headers, parser.parts
+    """
+
+    def __init__(
+        self,
+        keep: Optional[Callable[[MimePart], bool]] = None,
+        max_part_memory: int = DEFAULT_MAX_PART_MEMORY
+    ):
+        self.keep = keep or (lambda part: True)
+        self.max_part_memory = max_part_memory
+        self.headers: Optional[Message] = None
+        self.parts: List[MimePart] = []
+        self._multiparts: List[Dict] = []
+        self._state = "header"
+        self._section = ""
+        self._header_buf = bytearray()
+        self._part: Optional[MimePart] = None
+        self._pending_eol = b""
+        self._line_buf = b""
+        self._continuation = False
+
+    @property
+    def is_multipart(self) -> bool:
+        return self.headers is not None and self.headers.get_content_maintype() == "multipart"
+
+    def feed(self, data: bytes):
+        data = self._line_buf + data
+        start = 0
+        while True:
+            if self._state == "body" and not self._continuation and not data.startswith(b"--", start):
+                # 快速路径：直到下一个可能是边界的行（以 "--" 开头）之前的整行一次写入
+                candidate = data.find(b"\n--", start)
+                end = candidate + 1 if candidate != -1 else data.rfind(b"\n") + 1
+                if end > start:
+                    self._body_block(data[start:end])
+                    start = end
+                    continue
+            end = data.find(b"\n", start) + 1
+            if not end:
+                break
+            self._line(data[start:end])
+            start = end
+        rest = data[start:]
+        if len(rest) > CHUNK_SIZE and self._state != "header":
+            # 没有换行的超长行直接作为片段处理，不在内存中累积
+            self._line(rest, complete=False)
+            rest = b""
+        self._line_buf = rest
+
+    def close(self):
+        if self._line_buf:
+            self._line(self._line_buf, complete=False)
+            self._line_buf = b""
+        if self._state == "header" and self._header_buf:
+            self._start_entity()
+        if self._part is not None:
+            # 没有结束边界（单部分邮件或截断的邮件），末尾换行属于正文
+            self._part.write(self._pending_eol)
+        self._end_part()
+
+    def _line(self, line: bytes, complete: bool = True):
+        continuation = self._continuation
+        self._continuation = not complete
+
+        if self._state == "header":
+            if line in (b"\r\n", b"\n") or len(self._header_buf) + len(line) > MAX_HEADER_SIZE:
+                self._start_entity()
+                if line in (b"\r\n", b"\n"):
+                    return
+            else:
+                self._header_buf += line
+                return
+
+        if self._multiparts and not continuation and line.startswith(b"--"):
+            index, closing = self._match_boundary(line)
+            if index is not None:
+                self._end_part()
+                del self._multiparts[index + 1:]
+                if closing:
+                    self._multiparts.pop()
+                    self._state = "skip"
+                else:
+                    multipart = self._multiparts[index]
+                    multipart["count"] += 1
+                    prefix = multipart["section"]
+                    self._section = f"{prefix}.{multipart['count']}" if prefix else str(multipart["count"])
+                    self._state = "header"
+                return
+
+        if self._state == "body":
+            content = line.rstrip(b"\r\n") if complete else line
+            # 边界前的换行属于边界，暂存到下一行再写入
+            self._part.write(self._pending_eol + content)
+            self._pending_eol = line[len(content):]
+
+    def _body_block(self, block: bytes):
+        """写入若干完整的正文行（均不是边界行）"""
+        eol = 2 if block.endswith(b"\r\n") else 1
+        self._part.write(self._pending_eol + block[:-eol])
+        self._pending_eol = block[-eol:]
+
+    def _match_boundary(self, line: bytes):
+        stripped = line.rstrip()
+        for index in range(len(self._multiparts) - 1, -1, -1):
+            boundary = self._multiparts[index]["boundary"]
+            if stripped == boundary:
+                return index, False
+            if stripped == boundary + b"--":
+                return index, True
+        return None, False
+
+    def _start_entity(self):
+        headers = BytesHeaderParser().parsebytes(bytes(self._header_buf))
+        self._header_buf.clear()
+        if self.headers is None:
+            self.headers = headers
+
+        boundary = headers.get_boundary() if headers.get_content_maintype() == "multipart" else None
+        if boundary:
+            self._multiparts.append({
+                "boundary": b"--" + boundary.encode("ascii", errors="surrogateescape"),
+                "section": self._section,
+                "count": 0
+            })
+            self._state = "skip"
+            return
+
+        part = MimePart(self._section or "1", headers)
+        if self.keep(part):
+            part.open(self.max_part_memory)
+        self.parts.append(part)
+        self._part = part
+        self._pending_eol = b""
+        self._state = "body"
+
+    def _end_part(self):
+        if self._part is not None:
+            self._part.close()
+            self._part = None
+        self._pending_eol = b""
+
+
+def iter_chunks(source: Union[bytes, IO[bytes]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """将 bytes 或文件对象按块迭代"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+    source.seek(0)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_decoded(source: Union[bytes, IO[bytes]], encoding: Optional[str]) -> Iterator[bytes]:
+    """按 Content-Transfer-Encoding 逐块解码 bytes 或文件对象"""
+    decoder = _make_decoder((encoding or "").lower())
+    for chunk in iter_chunks(source):
+        decoded = decoder.decode(chunk)
+        if decoded:
+            yield decoded
+    tail = decoder.flush()
+    if tail:
+        yield tail
+
+
+def parse_stream(
+    chunks: Iterable[bytes],
+    keep: Optional[Callable[[MimePart], bool]] = None,
+    max_part_memory: int = DEFAULT_MAX_PART_MEMORY
+) -> StreamingMimeParser:
+    """流式解析邮件，返回已完成解析的解析器（headers、parts）"""
+    parser = StreamingMimeParser(keep=keep, max_part_memory=max_part_memory)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser
@@ -0,0 +1,104 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 分页工具 - 按 (排序字段, id) 的游标分页，深翻页与第一页的开销相同；保留按页码分页兼容旧客户端
+'''
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+
+def encode_cursor(value: Optional[datetime], last_id: str) -> str:
+    """将最后一行的 (排序字段, id) 编码为不透明的游标"""
+    payload = json.dumps([value.isoformat() if value else None, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """解析游标，格式错误时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(last_id, str):
+            raise ValueError("id 格式错误")
+        return (datetime.fromisoformat(value) if value is not None else None), last_id
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("无效的分页游标") from e
+
+
+async def keyset_page(
+    query: QuerySet,
+    field: str,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """按 field 倒序、id 倒序取 cursor 之后的 limit 行，返回 (行, 下一页游标)
+
+    条件写成 field <= 值 并排除 (field = 值 且 id >= 上一页最后的 id)，可以直接使用
+    以 field 结尾的索引定位。field 为空的行排在最后（与数据库倒序时 NULL 的位置一致），
+    非空的行取完后再按 id 倒序读取。
+    """
+    value, last_id = decode_cursor(cursor) if cursor else (None, None)
+    rows: List[Any] = []
+    if not cursor or value is not None:
+        ranged = query.filter(**{f"{field}__isnull": False})
+        if cursor:
+            # exclude 的多个条件会拆成多个 NOT，这里需要 NOT (a AND b)
+            ranged = ranged.filter(**{f"{field}__lte": value}).filter(~Q(**{field: value, "id__gte": last_id}))
+        rows = list(await ranged.order_by(f"-{field}", "-id").limit(limit + 1))
+    if len(rows) <= limit:
+        nulls = query.filter(**{f"{field}__isnull": True})
+        if cursor and value is None:
+            nulls = nulls.filter(id__lt=last_id)
+        rows += await nulls.order_by("-id").limit(limit + 1 - len(rows))
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, field), last.id)
+
+
+async def paginate(
+    query: QuerySet,
+    field: str,
+    page_size: int,
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """按 field 倒序分页，返回 (当前页的行, 响应中的分页信息)
+
+    传入 cursor 时按游标分页，返回 nextCursor，总数只在 with_total 为 True 时统计；
+    否则按页码分页并返回总数，同时返回最后一行的 nextCursor，客户端可以从任意一页改用游标继续翻页。
+    """
+    if page is not None and not cursor:
+        total = await query.count()
+        offset = (page - 1) * page_size
+        rows = await query.order_by(f"-{field}", "-id").offset(offset).limit(page_size)
+        next_cursor = encode_cursor(getattr(rows[-1], field), rows[-1].id) if rows and offset + len(rows) < total else None
+        return rows, {
+            "total": total,
+            "page": page,
+            "pageSize": page_size,
+            "totalPages": math.ceil(total / page_size) if total > 0 else 0,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None
+        }
+
+    try:
+        rows, next_cursor = await keyset_page(query, field, cursor, page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return rows, {
+        "total": await query.count() if with_total else None,
+        "pageSize": page_size,
+        "nextCursor": next_cursor,
+        "hasMore": next_cursor is not None
+    }
@@ -0,0 +1,221 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 新邮件推送监听 - 为每个启用的账户保持一个 IMAP IDLE 会话，不支持 IDLE 的服务器由同步调度器定时轮询
+'''
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.models import EmailAccount
+from app.utils.async_email_service import AsyncEmailService
+from app.utils.imap_pool import ImapConnectionPool, imap_pool
+from app.utils.mail_sync import sync_account_emails
+from app.logger import logger
+
+# 是否启用推送监听
+IMAP_PUSH_ENABLED = os.getenv("IMAP_PUSH_ENABLED", "true").lower() in ("1", "true", "yes")
+# 同时保持的最大 IDLE 会话数，超出的账户由同步调度器轮询
+IMAP_IDLE_MAX_SESSIONS = int(os.getenv("IMAP_IDLE_MAX_SESSIONS", "64"))
+# 单次 IDLE 的最长时间（秒），RFC 2177 建议不超过 29 分钟
+IMAP_IDLE_TIMEOUT = int(os.getenv("IMAP_IDLE_TIMEOUT", "1500"))
+# 检查账户增删改的间隔（秒）
+IMAP_PUSH_RECONCILE_INTERVAL = int(os.getenv("IMAP_PUSH_RECONCILE_INTERVAL", "60"))
+# 连接失败后的最大重试间隔（秒）
+IMAP_PUSH_MAX_BACKOFF = 300
+
+# 监听结束的原因：服务器不支持 IDLE、IDLE 会话数已满
+ENDED_NO_IDLE = "no_idle"
+ENDED_SESSIONS_FULL = "sessions_full"
+
+
+class PushListener:
+    """IMAP IDLE 推送监听管理器"""
+
+    def __init__(
+        self,
+        max_idle_sessions: int = IMAP_IDLE_MAX_SESSIONS,
+        idle_timeout: int = IMAP_IDLE_TIMEOUT,
+        folder: str = "INBOX"
+    ):
+        self.max_idle_sessions = max_idle_sessions
+        self.idle_timeout = idle_timeout
+        self.folder = folder
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._keys: Dict[str, Tuple] = {}
+        self._idle_sessions = 0
+        # 当前处于 IDLE 的账户ID，同步调度器不再轮询这些账户
+        self._listening: set = set()
+        # {账户ID: (结束原因, 当时服务器公布的扩展)}，转为轮询的账户
+        self._ended: Dict[str, Tuple[str, frozenset]] = {}
+        # 监听任务异常退出的账户：{账户ID: 连续失败次数}、{账户ID: 允许重启的时间}
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """启动监听（在 lifespan 中调用）"""
+        if self._reconcile_task is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_idle_sessions,
+                thread_name_prefix="imap-idle"
+            )
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self):
+        """停止所有监听"""
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._keys.clear()
+        self._listening.clear()
+        self._ended.clear()
+        self._failures.clear()
+        self._retry_at.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def is_listening(self, account_id: str) -> bool:
+        """账户是否有可用的 IDLE 会话，新邮件会由推送监听同步"""
+        return account_id in self._listening
+
+    async def _reconcile_loop(self):
+        while True:
+            try:
+                await self._reconcile()
+            except Exception as e:
+                logger.error(f"推送监听同步账户列表失败: {e}")
+            await asyncio.sleep(IMAP_PUSH_RECONCILE_INTERVAL)
+
+    async def _reconcile(self):
+        """为新增账户启动监听，停止已删除、已禁用或连接信息已修改的账户
+
+        已结束的监听按结束原因决定是否重启，避免每次检查都为轮询账户新建连接：
+        不支持 IDLE 的账户在连接池观察到服务器扩展变化后重启；会话数已满的账户在有空闲会话名额时重启；
+        异常退出的监听按指数退避重启。
+        """
+        accounts = await EmailAccount.filter(is_active=True)
+        wanted = {account.id: account for account in accounts}
+
+        for account_id in list(self._tasks.keys()):
+            account = wanted.get(account_id)
+            if account is None or self._keys.get(account_id) != ImapConnectionPool.account_key(account):
+                self._tasks.pop(account_id).cancel()
+                self._forget(account_id)
+
+        free_sessions = self.max_idle_sessions - self._idle_sessions
+        for account_id, task in list(self._tasks.items()):
+            if not task.done():
+                continue
+            if self._should_restart(wanted[account_id], task, free_sessions > 0):
+                if self._ended.pop(account_id, (None,))[0] == ENDED_SESSIONS_FULL:
+                    free_sessions -= 1
+                self._tasks.pop(account_id)
+
+        for account_id, account in wanted.items():
+            if account_id not in self._tasks:
+                self._keys[account_id] = ImapConnectionPool.account_key(account)
+                self._tasks[account_id] = asyncio.create_task(self._listen(account))
+
+    def _forget(self, account_id: str):
+        self._keys.pop(account_id, None)
+        self._ended.pop(account_id, None)
+        self._failures.pop(account_id, None)
+        self._retry_at.pop(account_id, None)
+
+    def _should_restart(self, account: EmailAccount, task: asyncio.Task, has_free_session: bool) -> bool:
+        """已结束的监听是否需要重启"""
+        if task.cancelled():
+            return True
+        error = task.exception()
+        if error is not None:
+            now = time.monotonic()
+            if account.id not in self._retry_at:
+                failures = self._failures.get(account.id, 0) + 1
+                self._failures[account.id] = failures
+                delay = min(5 * 2 ** (failures - 1), IMAP_PUSH_MAX_BACKOFF)
+                self._retry_at[account.id] = now + delay
+                logger.error(f"推送监听: 账户 {account.email} 的监听异常退出，{delay} 秒后重启: {error}")
+            if now < self._retry_at[account.id]:
+                return False
+            self._retry_at.pop(account.id)
+            return True
+
+        reason, capabilities = self._ended.get(account.id, (None, frozenset()))
+        if reason == ENDED_NO_IDLE:
+            # 由同步调度器的连接池连接得知服务器扩展，不为检查扩展单独建立连接
+            current = imap_pool.capabilities(account)
+            return current is not None and "IDLE" in current and current != capabilities
+        if reason == ENDED_SESSIONS_FULL:
+            return has_free_session
+        return True
+
+    async def _sync(self, account: EmailAccount):
+        try:
+            new_count = await sync_account_emails(account, folder=self.folder)
+            if new_count:
+                logger.info(f"推送监听: 账户 {account.email} 新增 {new_count} 封邮件")
+        except Exception as e:
+            logger.error(f"推送监听: 账户 {account.email} 同步失败: {e}")
+
+    async def _listen(self, account: EmailAccount):
+        """单个账户的监听循环，连接断开后按指数退避重连"""
+        backoff = 5
+        while True:
+            service = AsyncEmailService.from_account(account)
+            reserved = False
+            try:
+                if not await service.connect():
+                    raise ConnectionError(f"连接邮箱服务器失败: {account.email}")
+
+                if not service.has_capability("IDLE") or self._idle_sessions >= self.max_idle_sessions:
+                    # 不支持 IDLE 或会话数已满，交给同步调度器按账户间隔轮询
+                    reason = ENDED_NO_IDLE if not service.has_capability("IDLE") else ENDED_SESSIONS_FULL
+                    self._ended[account.id] = (reason, service.capabilities())
+                    logger.info(f"推送监听: 账户 {account.email} 不使用 IDLE，由同步调度器定时轮询")
+                    await service.disconnect()
+                    return
+
+                self._idle_sessions += 1
+                reserved = True
+                if not await service.select_folder(self.folder):
+                    raise ConnectionError(f"选择文件夹 {self.folder} 失败: {account.email}")
+
+                # 进入 IDLE 前先补齐离线期间的新邮件
+                await self._sync(account)
+                backoff = 5
+                self._listening.add(account.id)
+                self._failures.pop(account.id, None)
+                logger.info(f"推送监听: 账户 {account.email} 已进入 IDLE")
+
+                while True:
+                    has_new = await service.idle(self.idle_timeout, self._executor)
+                    if has_new:
+                        await self._sync(account)
+
+            except asyncio.CancelledError:
+                # 关闭 socket 以中断线程中仍在等待的 IDLE
+                service.abort()
+                raise
+            except Exception as e:
+                logger.warning(f"推送监听: 账户 {account.email} 连接中断，{backoff} 秒后重连: {e}")
+                service.abort()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, IMAP_PUSH_MAX_BACKOFF)
+            finally:
+                self._listening.discard(account.id)
+                if reserved:
+                    self._idle_sessions -= 1
+
+
+# 全局推送监听
+push_listener = PushListener()
@@ -0,0 +1,237 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 后台同步调度器 - 按账户间隔定时同步，支持随机抖动、失败指数退避，用户刷新不排队
+'''
+import asyncio
+import os
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from app.models import EmailAccount
+from app.utils.mail_sync import SYNC_DEFAULT_FOLDERS, compression_ratio, sync_account_safely
+from app.utils.push_listener import push_listener
+from app.logger import logger
+
+# 是否启用后台同步调度
+SYNC_SCHEDULER_ENABLED = os.getenv("SYNC_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+# 调度器工作协程数量（只执行定时同步，用户刷新不占用）
+SYNC_SCHEDULER_WORKERS = int(os.getenv("SYNC_SCHEDULER_WORKERS", "8"))
+# 同步间隔随机抖动比例（0.1 表示 ±10%）
+SYNC_JITTER_RATIO = float(os.getenv("SYNC_JITTER_RATIO", "0.1"))
+# 失败退避的最大间隔（秒）
+SYNC_MAX_BACKOFF = int(os.getenv("SYNC_MAX_BACKOFF", "3600"))
+# 重新加载账户列表的间隔（秒）
+SYNC_RELOAD_INTERVAL = 60
+
+
+class AccountSyncStatus:
+    """单个账户的调度状态"""
+
+    def __init__(self, account: EmailAccount):
+        self.account = account
+        self.next_run: Optional[float] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_new_count = 0
+        self.last_bytes_received = 0
+        self.total_bytes_received = 0
+        self.total_bytes_uncompressed = 0
+        self.consecutive_failures = 0
+        self.total_runs = 0
+        # 正在执行的同步数（用户刷新可能与定时同步同时执行）
+        self.running = 0
+        self.queued = False
+
+    def to_response(self) -> Dict[str, Any]:
+        return {
+            "accountId": self.account.id,
+            "email": self.account.email,
+            "interval": self.account.sync_interval,
+            "running": self.running > 0,
+            "nextRunAt": datetime.fromtimestamp(self.next_run).isoformat() if self.next_run else None,
+            "lastRunAt": self.last_run_at.isoformat() if self.last_run_at else None,
+            "lastDuration": self.last_duration,
+            "lastNewCount": self.last_new_count,
+            "lastBytesReceived": self.last_bytes_received,
+            "totalBytesReceived": self.total_bytes_received,
+            "totalBytesUncompressed": self.total_bytes_uncompressed,
+            "compressionRatio": compression_ratio(self.total_bytes_received, self.total_bytes_uncompressed),
+            "lastError": self.last_error,
+            "consecutiveFailures": self.consecutive_failures,
+            "totalRuns": self.total_runs
+        }
+
+
+class SyncScheduler:
+    """后台同步调度器
+
+    到期的账户进入队列由 workers 个工作协程执行；用户手动刷新不进入队列，直接在
+    sync_account_safely 的全局和主机并发限制内执行，不受工作协程数量限制，也不排在定时同步之后。
+    已进入 IDLE 的账户由推送监听同步收件箱，定时同步只处理其余文件夹，没有其余文件夹时跳过。
+    """
+
+    def __init__(
+        self,
+        workers: int = SYNC_SCHEDULER_WORKERS,
+        jitter_ratio: float = SYNC_JITTER_RATIO,
+        max_backoff: int = SYNC_MAX_BACKOFF
+    ):
+        self.workers = workers
+        self.jitter_ratio = jitter_ratio
+        self.max_backoff = max_backoff
+        self._statuses: Dict[str, AccountSyncStatus] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """启动调度器（在 lifespan 中调用）"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks.append(asyncio.create_task(self._timer_loop()))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def stop(self):
+        """停止调度器"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queue = None
+
+    def _jitter(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.jitter_ratio, self.jitter_ratio))
+
+    async def _reload_accounts(self):
+        """同步账户列表，新账户在一个间隔内随机分散首次运行时间，避免同时启动"""
+        accounts = await EmailAccount.filter(is_active=True)
+        now = time.time()
+        wanted = {account.id: account for account in accounts}
+
+        for account_id in list(self._statuses.keys()):
+            if account_id not in wanted:
+                self._statuses.pop(account_id)
+
+        for account_id, account in wanted.items():
+            status = self._statuses.get(account_id)
+            if status is None:
+                status = AccountSyncStatus(account)
+                self._statuses[account_id] = status
+                if account.sync_interval > 0:
+                    status.next_run = now + random.uniform(0, account.sync_interval)
+            else:
+                interval_changed = status.account.sync_interval != account.sync_interval
+                status.account = account
+                if interval_changed:
+                    status.next_run = now + self._jitter(account.sync_interval) if account.sync_interval > 0 else None
+
+    async def _timer_loop(self):
+        """每秒检查到期账户并放入队列"""
+        last_reload = 0.0
+        while True:
+            now = time.time()
+            if now - last_reload >= SYNC_RELOAD_INTERVAL:
+                try:
+                    await self._reload_accounts()
+                except Exception as e:
+                    logger.error(f"调度器加载账户失败: {e}")
+                last_reload = now
+
+            for status in self._statuses.values():
+                if status.next_run and status.next_run <= now and not status.queued and not status.running:
+                    folders = self._routine_folders(status.account)
+                    if folders == []:
+                        status.next_run = now + self._jitter(status.account.sync_interval)
+                        continue
+                    self._enqueue(status.account, folders)
+
+            await asyncio.sleep(1)
+
+    @staticmethod
+    def _routine_folders(account: EmailAccount) -> Optional[List[str]]:
+        """定时同步的文件夹，None 表示账户配置的全部文件夹；推送监听已覆盖的文件夹不再轮询"""
+        if not push_listener.is_listening(account.id):
+            return None
+        return [
+            name for name in account.sync_folders or SYNC_DEFAULT_FOLDERS
+            if name.lower() != push_listener.folder.lower()
+        ]
+
+    def _enqueue(self, account: EmailAccount, folders: Optional[List[str]] = None):
+        status = self._statuses.get(account.id)
+        if status:
+            status.queued = True
+        self._queue.put_nowait((account, folders))
+
+    async def _worker(self):
+        while True:
+            account, folders = await self._queue.get()
+            status = self._statuses.get(account.id)
+            if status:
+                status.queued = False
+            try:
+                await self._run(account, folders)
+            except Exception as e:
+                logger.error(f"调度器执行同步失败: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, account: EmailAccount, folders: Optional[List[str]] = None) -> Dict[str, Any]:
+        """执行一次同步并更新调度状态"""
+        status = self._statuses.get(account.id)
+        if status is None:
+            status = AccountSyncStatus(account)
+            if account.is_active:
+                self._statuses[account.id] = status
+        status.running += 1
+        try:
+            result = await sync_account_safely(account, folders=folders)
+        finally:
+            status.running -= 1
+
+        status.total_runs += 1
+        status.last_run_at = datetime.now()
+        status.last_duration = result["duration"]
+        status.last_new_count = result["newCount"]
+        status.last_bytes_received = result["bytesReceived"]
+        status.total_bytes_received += result["bytesReceived"]
+        status.total_bytes_uncompressed += result["bytesUncompressed"]
+        status.last_error = result["error"]
+
+        interval = account.sync_interval
+        if result["success"]:
+            status.consecutive_failures = 0
+            delay = interval
+        else:
+            # 失败后指数退避，避免反复连接故障服务器
+            status.consecutive_failures += 1
+            base = interval or 60
+            delay = min(base * (2 ** status.consecutive_failures), self.max_backoff)
+        status.next_run = time.time() + self._jitter(delay) if interval > 0 else None
+
+        return result
+
+    async def run_now(self, accounts: List[EmailAccount]) -> List[Dict[str, Any]]:
+        """用户触发的立即同步：不经过队列直接并发执行（并发数由 SYNC_MAX_CONCURRENCY 和
+        SYNC_MAX_PER_HOST 限制），并更新调度状态，等待全部完成后返回结果"""
+        return list(await asyncio.gather(*(self._run(account) for account in accounts)))
+
+    def get_statuses(self, account_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """各账户的调度状态，指定 account_id 时只返回该账户"""
+        return [
+            status.to_response() for status in self._statuses.values()
+            if account_id is None or status.account.id == account_id
+        ]
+
+
+# 全局同步调度器
+sync_scheduler = SyncScheduler()
@@ -10,8 +10,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import time
 
-from app.api import accounts, emails, auth, logs, stats, open as open_api, tokens
-from app.database import init_db, close_db
+from app.api import accounts, emails, auth, logs, stats, open as open_api, tokens, sync
+from app.database import init_db, close_db, storage_status
+from app.utils.async_email_service import shutdown_imap_executor
+from app.utils.backfill import backfill_manager
+from app.utils.imap_pool import imap_pool
+from app.utils.mime_pool import mime_pool
+from app.utils.push_listener import push_listener, IMAP_PUSH_ENABLED
+from app.utils.scheduler import sync_scheduler, SYNC_SCHEDULER_ENABLED
 from app.logger import logger
 
 
@@ -19,7 +25,24 @@ from app.logger import logger
 async def lifespan(app: FastAPI):
     # 启动时初始化数据库
     await init_db()
+    # 启动 IMAP 连接池空闲回收
+    imap_pool.start()
+    # 启动新邮件推送监听（IMAP IDLE）
+    if IMAP_PUSH_ENABLED:
+        push_listener.start()
+    # 启动后台同步调度器
+    if SYNC_SCHEDULER_ENABLED:
+        sync_scheduler.start()
+    # 继续重启前未完成的历史邮件回填任务
+    backfill_manager.start()
     yield
+    # 停止回填任务、调度器和推送监听，关闭连接池中的空闲连接、IMAP 线程池和 MIME 解析进程池
+    await backfill_manager.stop()
+    await sync_scheduler.stop()
+    await push_listener.stop()
+    await imap_pool.close()
+    shutdown_imap_executor()
+    mime_pool.shutdown()
     # 关闭时断开数据库连接
     await close_db()
 
@@ -109,6 +132,7 @@ app.include_router(emails.router, prefix="/api/emails", tags=["邮件管理"])
 app.include_router(logs.router, prefix="/api/logs", tags=["访问日志"])
 app.include_router(stats.router, prefix="/api/stats", tags=["统计数据"])
 app.include_router(tokens.router, prefix="/api/tokens", tags=["令牌管理"])
+app.include_router(sync.router, prefix="/api/sync", tags=["同步管理"])
 app.include_router(open_api.router, prefix="/api/v1/open", tags=["开放API"])
 
 
@@ -119,7 +143,12 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy"}
+    try:
+        storage = await storage_status()
+    except Exception as e:
+        logger.error(f"获取数据库状态失败: {e}")
+        return {"status": "unhealthy", "storage": None}
+    return {"status": "healthy", "storage": storage}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 迁移 - 初始表结构（引入迁移前 init_db 用 generate_schemas 创建的表）
+
+全部使用 CREATE TABLE IF NOT EXISTS，已有数据库执行时不做任何修改，只记录迁移版本。
+'''
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+SQLITE_SQL = """
+CREATE TABLE IF NOT EXISTS "email_accounts" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL /* 账户名称 */,
+    "email" VARCHAR(255) NOT NULL UNIQUE /* 邮箱地址 */,
+    "provider" VARCHAR(50) NOT NULL /* 邮箱提供商 */,
+    "password" VARCHAR(500) NOT NULL /* 加密后的密码 */,
+    "imap_host" VARCHAR(255) NOT NULL /* IMAP服务器地址 */,
+    "imap_port" INT NOT NULL /* IMAP端口 */,
+    "smtp_host" VARCHAR(255) NOT NULL /* SMTP服务器地址 */,
+    "smtp_port" INT NOT NULL /* SMTP端口 */,
+    "use_ssl" INT NOT NULL /* 是否使用SSL */,
+    "is_active" INT NOT NULL /* 是否启用 */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */
+) /* 邮箱账户模型 */;
+CREATE TABLE IF NOT EXISTS "emails" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "message_id" VARCHAR(255) /* 邮件消息ID */,
+    "from_address" JSON NOT NULL /* 发件人 */,
+    "to_addresses" JSON NOT NULL /* 收件人列表 */,
+    "cc_addresses" JSON /* 抄送列表 */,
+    "bcc_addresses" JSON /* 密送列表 */,
+    "subject" VARCHAR(500) /* 邮件主题 */,
+    "body" TEXT /* 邮件正文(纯文本) */,
+    "body_html" TEXT /* 邮件正文(HTML) */,
+    "date" TIMESTAMP /* 邮件日期 */,
+    "is_read" INT NOT NULL /* 是否已读 */,
+    "is_starred" INT NOT NULL /* 是否星标 */,
+    "has_attachments" INT NOT NULL /* 是否有附件 */,
+    "inline_images" JSON /* 内嵌图片 {cid: {content_type, data}} */,
+    "folder" VARCHAR(100) NOT NULL /* 文件夹 */,
+    "labels" JSON /* 标签列表 */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */,
+    "account_id" VARCHAR(36) NOT NULL REFERENCES "email_accounts" ("id") ON DELETE CASCADE /* 账户ID */
+) /* 邮件模型 */;
+CREATE TABLE IF NOT EXISTS "attachments" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "filename" VARCHAR(255) NOT NULL /* 文件名 */,
+    "content_type" VARCHAR(100) /* 内容类型 */,
+    "size" INT NOT NULL /* 文件大小(字节) */,
+    "content" TEXT /* 文件内容(Base64) */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "email_id" VARCHAR(36) NOT NULL REFERENCES "emails" ("id") ON DELETE CASCADE /* 邮件ID */
+) /* 附件模型 */;
+CREATE TABLE IF NOT EXISTS "access_logs" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "user_id" VARCHAR(36) /* 用户ID */,
+    "username" VARCHAR(50) /* 用户名 */,
+    "ip_address" VARCHAR(45) NOT NULL /* IP地址 */,
+    "method" VARCHAR(10) NOT NULL /* 请求方法 */,
+    "path" VARCHAR(500) NOT NULL /* 请求路径 */,
+    "status_code" INT /* 响应状态码 */,
+    "user_agent" VARCHAR(500) /* 用户代理 */,
+    "created_at" TIMESTAMP NOT NULL /* 访问时间 */
+) /* 访问日志模型 */;
+CREATE TABLE IF NOT EXISTS "users" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "username" VARCHAR(50) NOT NULL UNIQUE /* 用户名 */,
+    "password_hash" VARCHAR(255) NOT NULL /* 密码哈希 */,
+    "email" VARCHAR(255) /* 邮箱 */,
+    "is_active" INT NOT NULL /* 是否启用 */,
+    "is_admin" INT NOT NULL /* 是否管理员 */,
+    "last_login" TIMESTAMP /* 最后登录时间 */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */
+) /* 用户模型 */;
+CREATE TABLE IF NOT EXISTS "api_tokens" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL /* 令牌名称 */,
+    "token" VARCHAR(32) NOT NULL UNIQUE /* 令牌值 */,
+    "is_active" INT NOT NULL /* 是否启用 */,
+    "ip_whitelist" TEXT /* IP白名单，多个IP用逗号分隔 */,
+    "expires_at" TIMESTAMP /* 过期时间 */,
+    "created_by" VARCHAR(36) /* 创建者ID */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */,
+    "last_used_at" TIMESTAMP /* 最后使用时间 */
+) /* API令牌模型 */;
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);"""
+
+MYSQL_SQL = """
+CREATE TABLE IF NOT EXISTS `email_accounts` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `name` VARCHAR(100) NOT NULL COMMENT '账户名称',
+    `email` VARCHAR(255) NOT NULL UNIQUE COMMENT '邮箱地址',
+    `provider` VARCHAR(50) NOT NULL COMMENT '邮箱提供商',
+    `password` VARCHAR(500) NOT NULL COMMENT '加密后的密码',
+    `imap_host` VARCHAR(255) NOT NULL COMMENT 'IMAP服务器地址',
+    `imap_port` INT NOT NULL COMMENT 'IMAP端口',
+    `smtp_host` VARCHAR(255) NOT NULL COMMENT 'SMTP服务器地址',
+    `smtp_port` INT NOT NULL COMMENT 'SMTP端口',
+    `use_ssl` BOOL NOT NULL COMMENT '是否使用SSL',
+    `is_active` BOOL NOT NULL COMMENT '是否启用',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间'
+) CHARACTER SET utf8mb4 COMMENT='邮箱账户模型';
+CREATE TABLE IF NOT EXISTS `emails` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `message_id` VARCHAR(255) COMMENT '邮件消息ID',
+    `from_address` JSON NOT NULL COMMENT '发件人',
+    `to_addresses` JSON NOT NULL COMMENT '收件人列表',
+    `cc_addresses` JSON COMMENT '抄送列表',
+    `bcc_addresses` JSON COMMENT '密送列表',
+    `subject` VARCHAR(500) COMMENT '邮件主题',
+    `body` LONGTEXT COMMENT '邮件正文(纯文本)',
+    `body_html` LONGTEXT COMMENT '邮件正文(HTML)',
+    `date` DATETIME(6) COMMENT '邮件日期',
+    `is_read` BOOL NOT NULL COMMENT '是否已读',
+    `is_starred` BOOL NOT NULL COMMENT '是否星标',
+    `has_attachments` BOOL NOT NULL COMMENT '是否有附件',
+    `inline_images` JSON COMMENT '内嵌图片 {cid: {content_type, data}}',
+    `folder` VARCHAR(100) NOT NULL COMMENT '文件夹',
+    `labels` JSON COMMENT '标签列表',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间',
+    `account_id` VARCHAR(36) NOT NULL COMMENT '账户ID',
+    CONSTRAINT `fk_emails_email_ac_43009c2d` FOREIGN KEY (`account_id`) REFERENCES `email_accounts` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4 COMMENT='邮件模型';
+CREATE TABLE IF NOT EXISTS `attachments` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `filename` VARCHAR(255) NOT NULL COMMENT '文件名',
+    `content_type` VARCHAR(100) COMMENT '内容类型',
+    `size` INT NOT NULL COMMENT '文件大小(字节)',
+    `content` LONGTEXT COMMENT '文件内容(Base64)',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `email_id` VARCHAR(36) NOT NULL COMMENT '邮件ID',
+    CONSTRAINT `fk_attachme_emails_aea42d45` FOREIGN KEY (`email_id`) REFERENCES `emails` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4 COMMENT='附件模型';
+CREATE TABLE IF NOT EXISTS `access_logs` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `user_id` VARCHAR(36) COMMENT '用户ID',
+    `username` VARCHAR(50) COMMENT '用户名',
+    `ip_address` VARCHAR(45) NOT NULL COMMENT 'IP地址',
+    `method` VARCHAR(10) NOT NULL COMMENT '请求方法',
+    `path` VARCHAR(500) NOT NULL COMMENT '请求路径',
+    `status_code` INT COMMENT '响应状态码',
+    `user_agent` VARCHAR(500) COMMENT '用户代理',
+    `created_at` DATETIME(6) NOT NULL COMMENT '访问时间'
+) CHARACTER SET utf8mb4 COMMENT='访问日志模型';
+CREATE TABLE IF NOT EXISTS `users` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `username` VARCHAR(50) NOT NULL UNIQUE COMMENT '用户名',
+    `password_hash` VARCHAR(255) NOT NULL COMMENT '密码哈希',
+    `email` VARCHAR(255) COMMENT '邮箱',
+    `is_active` BOOL NOT NULL COMMENT '是否启用',
+    `is_admin` BOOL NOT NULL COMMENT '是否管理员',
+    `last_login` DATETIME(6) COMMENT '最后登录时间',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间'
+) CHARACTER SET utf8mb4 COMMENT='用户模型';
+CREATE TABLE IF NOT EXISTS `api_tokens` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `name` VARCHAR(100) NOT NULL COMMENT '令牌名称',
+    `token` VARCHAR(32) NOT NULL UNIQUE COMMENT '令牌值',
+    `is_active` BOOL NOT NULL COMMENT '是否启用',
+    `ip_whitelist` LONGTEXT COMMENT 'IP白名单，多个IP用逗号分隔',
+    `expires_at` DATETIME(6) COMMENT '过期时间',
+    `created_by` VARCHAR(36) COMMENT '创建者ID',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间',
+    `last_used_at` DATETIME(6) COMMENT '最后使用时间'
+) CHARACTER SET utf8mb4 COMMENT='API令牌模型';
+CREATE TABLE IF NOT EXISTS `aerich` (
+    `id` INT NOT NULL PRIMARY KEY AUTO_INCREMENT,
+    `version` VARCHAR(255) NOT NULL,
+    `app` VARCHAR(100) NOT NULL,
+    `content` JSON NOT NULL
+) CHARACTER SET utf8mb4;"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return MYSQL_SQL if db.capabilities.dialect == "mysql" else SQLITE_SQL
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    # 初始版本不支持回退
+    return ""
+
+
+MODELS_STATE = (
+    "eJztXWtv28gV/SuCPjmAG1AUn8ViAdlxGnX9CGJtG2xdEENyKLHhQ8tHHDf1f+/ckSg+RN"
+    "IkbclDS19kaziXos658zh37ox+Dl3fxE74/sJFtjMxDD/2ouFfBz+HHnIx+af0+ulgiJbL"
+    "9CoUREh3qAGGmhpaVaWXkB5GATLgvhZyQkyKTBwagb2MbN8Dm7tY5RC+i2VdH93FislLd7"
+    "HEj2XyinhSIsqKDncyfYPcyvbmbYxiz/4zxlrkz3G0wAEx/de/SbHtmfgHDpO3y2+aZWPH"
+    "zH1524Qb0HIteljSsvMFCj7SmvBAumb4Tux6ae3lQ7TwvU118rxQOsceDlCEzQwIXuw4a9"
+    "SSotWzkoIoiPHmIc20wMQWih2AcviLFXsGIDggZLxf87TG/f0vDnJ1E/366/opM3aadn0z"
+    "024vZpo23KICnqkA9LrI8D2g0QZSASMX/dAc7M2jBXk7lh5Xn5NitaoFH/iPyZfzT5MvJ2"
+    "PpHXygT3xh5SrX6ys8vfRIb4EitLoJZSalgv5tQUZS/2XoSApSPlJPToBNoGsO9jDvtqLA"
+    "mcSdVYsr+noTCkYc14ADUquSBHoNWEhRp425Dewbg301g06oZzsOUR5z8Cp0Qp0XxQaok1"
+    "qVqNNredSXgf/dNnHQBvisDeM+n0VfGpsEfcFSdcKBKEhdOBCbOL5Y7ffiltsvURje+0Gr"
+    "3j9rwzgBIo/A5XVDop0OkCEpQlIiK9yoGw3NeKgjYosJ20VLbeGHUauBOGvENBfTq8ln0g"
+    "hk6PgJK9AdSZLCZKdEQV36QQkTUy+qISKxKRBhryaSuyBCVcedeJARtgjqYzxuiPocnugv"
+    "/EiQBWUsCQqpQp96UyLX8DC9nhUgDt2ovbPnjJh29turWV+cnYLa0tlzNvtzdlGRO/Hw2s"
+    "4eh1gLw5LJ5ZnvOxh55SBnrAoQ68RsVxgns85Wo6wk8QCwABN8wZLJ/7LIK7e3l83wrgHz"
+    "7OaG3sQNwz8dWjCdFZz796uzCzLbpz5PKtkRLmfBDolUj+zvJdqqloecXZ+YIK9rJliiwQ"
+    "gwAKWhkg7nA7kS2S4uJyJvWWDCXJu+T/5haDSAMWAEs35iQCgSLUKOKlpCw96IfG3zxnMe"
+    "1j5RQ9NsenVxO5tcfc5x9WEyu4ArPC19KJSeFEMVm5sM/jmdfRrA28EfN9cXFHQy+M4D+o"
+    "lpvdkfQ3gmFEe+5vn3GjIz8jUpTbDMd4xLs6Mv5C175QuSZAngBTp3ML6QIJdxBvr0EI20"
+    "vmWCYFCgI+PbPQpMLXelEKgJSzrxtd3H375gB1G8t10jG+NlyivS6Nj0Q6vuOi3Nourzfh"
+    "Ws25dc3i2WIA/N6deDz4ZPWgM3iSJkLFxcHjrPXD2tC5yjTb3mUXNJIK1GwNBe6iPllRUP"
+    "KjpOW8nbi41bNvmwlvHxrA3TqhHGA0VOnBdi5MyoRPKJEWmuK+BaYF+064T/2uX3ME0bKS"
+    "LEBnWVzJsNWS/vZF5tiSK0/1sCfrVKX1ffn0DnnufwKg9LQwZnnQAJInmj8Ar/7nVE+9pz"
+    "t/Ge4R8VgGdM2PbzHOobnz85QyGWhIZ41009L77OcrPOxKtPriZf3+Vmnpc3139Lqmdawf"
+    "nlzdlRNx51Y4VuXCVetJuUZW0YnwWsVg2heTbVAruYhm2JsyfXyj/6Abbn3m/4gVIwJY+I"
+    "PKNsDGJWhrWHvkqGkeIA3W+0RM7/CBLk++NViOx8cns++XAxfKwWv7tUdCsOqvKg6nVcKs"
+    "WbJz41kXCVFY8Srv8SzsVhSFyxZfedt2J7epXzX1NRyCsnWd368p2oOSvwXRhuyYhcEkj7"
+    "++3NdYWSLtgV51K2EQ3+N3DscGcKo9ssamyOEj4ErKNnT3ABofoJbnEuW5gDwQ2KE1wy31"
+    "lDi1uRUrTrCSmSOJaypNDJLkg+RXr+etVOCDKMbgQV7Z5F0P40Ig95UirHjdhnRu9KzZZh"
+    "P7hZZa/1g5sw1v+DjXZ5PqlJfwZ6AY+JVFcVtSEPe8go1H3zoU38KqnfH9AlXRqvwlknd7"
+    "GMkZXEtiSZNxgNZAHK2iJySwR0PTUbo17y82l2dckoIxD6axtUTGxeIJz4OsyIWIRmMrKe"
+    "zwlD0cOSTIPt8KEdahAb3ab8qTywxGqPWWCbku5pYKbFkwmCbjVcyNpbNl4YoSDAHWjIGP"
+    "aKCUkawQClcDJLTCxQqBUSMlrQUWLdL05kTs0mjbDEjO05toc120XzdrJmy7Ansma1FGkK"
+    "BuTLW7BZhxfkwU/DNgm62VSC0wGEFx8f2ZQ8lu+03NKWWuxvaYo43NnN15ZR5a0l+7HaRe"
+    "7sJD2CoIHLEgOr20lq0Y8GAkMHbCeUMfu6/7hef1yvP+Z5H/O8V0+f+sL62IaWy395K8bz"
+    "N9rncu85fwOlp5u8RAZH5rCUHnPQNJEj74ptUzkyJNRqrhabGfJZ98ww8HKpNLvd0WAYOA"
+    "wv/fmwbEPD5uJp7X4GWk1z/HnjZBhF1y0YETBOYnGiZT51ClAzo4NKkolDHLy9HBn4Vi1H"
+    "yIwJ2+sDsCH19UfHwv7soO2mkqxNX/Duvqfk5c+dsZfVCUg1Pc6yJv2IrWng9PNzj3sQmm"
+    "R+CdWJX8JW3pdLBgS/ZdpdYsE02HR9AwZCQ+Cp5lLhf1PsFptqFJqqiUxtn7FEbtwC9KR+"
+    "jyBXTHrEhqU0Fbi7z34g0iWKQwKr2WrTVN6q096p/QXMBQMOmMGqAKFyHQQPzQlqca7Vyx"
+    "91Emhkol0mLp+Yu2ys+jOcChiPSYnAdTzMbQdef5Bh17wuOohQW1XYtcWRCrtU1b+HVHhu"
+    "CWpaflqnpaEvaKyis42xVjlXVzyq5Tehlveu3zpw8obkW3IEqLZAYcu5bcGQ8UluelAonW"
+    "7BGX6YM7qQsJOdPHs+tXjPqYpwcC4zUB/Pj2MjKYrAabq214GFxKxXCWqyDseHgsaAEpEp"
+    "LhwURrDqUcZGvdjIW/YpiVqSOS49S5qeEWOJYnvd0ROd0Sih+iBF5zHXp9QXjrk+h+ELVb"
+    "k+jAQgJkt75n/D3rBsVT+5dlq7qL+0tQiqNYxGTD5PaUSQxmIhhbkmIPFE3YOKSVCM315Q"
+    "4o3+ik/WaRn8FZ8oaddNYd8YMB0EyqHOjTvFH8Z8E5fnq12ePypiNhXxUrtfkKvJboWme4"
+    "qLdixHhCCbgqgtM+l0xDFoLsvioEGoIwRNhEe0Fo2XqhzsjhDHsEIt8qCdVUl9AWW2i+3H"
+    "+MfSJnOuDjPmvGWfVLRiGfJq+/FROYPm0UsOaqg5VTdnxXK7zctkheNEVpL+jjGLw9Cpx5"
+    "jFMWbRZn8SjUzHYSdvKNr2aUTOxrXT33A6vNGZlfgVDmxjMSyLXq2unNbGrtI6T8WtqgMo"
+    "LxyFqv7pxLIgVEmm5bop7Ft+N48wvUguZXVE6TsOwvVGsKYTxYwJy3GljkG8nSzzQ6Nqgf"
+    "C6+htEdyfxucpfVag5PrPyVxWYPNq0Mdr7OJDhVQezx/8DRpH5KA=="
+)
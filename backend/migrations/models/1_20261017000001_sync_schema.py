@@ -0,0 +1,341 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 迁移 - 增量同步和按需下载所需的表、列和索引，并为已有邮件回填去重键
+
+新增 sync_states、backfill_jobs 表；email_accounts 增加 sync_interval、sync_folders、imap_compress，
+emails 增加 uid、message_key，attachments 增加 part、encoding、blob_sha256；
+为已有邮件按 Message-ID（缺失时按邮件头）计算去重键，删除同一文件夹中重复的邮件后建立
+(账户, 文件夹, 去重键) 唯一索引；建立邮件列表、访问日志的组合索引。
+已有邮件的 uid 为空，下次同步获取到同一封邮件时按去重键绑定 UID。
+'''
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+# 每批回填去重键的邮件数
+BACKFILL_BATCH = 1000
+
+SQLITE_TABLES = """
+CREATE TABLE "sync_states" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "folder" VARCHAR(255) NOT NULL /* 文件夹 */,
+    "path" VARCHAR(255) /* 服务器上的文件夹名（与 folder 不同时记录） */,
+    "uid_validity" BIGINT /* UIDVALIDITY */,
+    "last_uid" BIGINT NOT NULL /* 已同步的最大UID */,
+    "highest_modseq" BIGINT /* 已同步标志的 HIGHESTMODSEQ（CONDSTORE） */,
+    "flags_synced_at" TIMESTAMP /* 最后同步标志时间 */,
+    "remap_uid_validity" BIGINT /* 正在按去重键重新绑定 UID 的新 UIDVALIDITY，为空表示没有进行中的重新绑定 */,
+    "remap_cursor_uid" BIGINT /* 重新绑定 UID 的断点：已处理的最大 UID，下一段从大于它的 UID 继续 */,
+    "last_synced_at" TIMESTAMP /* 最后同步时间 */,
+    "last_new_count" INT NOT NULL /* 最近一次同步新增的邮件数 */,
+    "last_error" TEXT /* 最近一次同步错误 */,
+    "bytes_received" BIGINT NOT NULL /* 累计从服务器接收的字节数（压缩后，即网络传输量） */,
+    "bytes_uncompressed" BIGINT NOT NULL /* 累计接收的字节数（解压后） */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */,
+    "account_id" VARCHAR(36) NOT NULL REFERENCES "email_accounts" ("id") ON DELETE CASCADE /* 账户ID */,
+    CONSTRAINT "uid_sync_states_account_ad2ba8" UNIQUE ("account_id", "folder")
+) /* 文件夹同步状态（UID 水位线和标志 MODSEQ） */;
+CREATE TABLE "backfill_jobs" (
+    "id" VARCHAR(36) NOT NULL PRIMARY KEY,
+    "folder" VARCHAR(255) NOT NULL /* 文件夹 */,
+    "status" VARCHAR(20) NOT NULL /* 状态: pending/running/paused/completed/failed */,
+    "uid_validity" BIGINT /* UIDVALIDITY */,
+    "cursor_uid" BIGINT /* 断点：已回填的最小 UID，下一段从小于它的 UID 继续 */,
+    "total" INT NOT NULL /* 需要回填的邮件总数 */,
+    "done" INT NOT NULL /* 已成功处理的邮件数 */,
+    "imported" INT NOT NULL /* 新增的邮件数 */,
+    "bytes_fetched" BIGINT NOT NULL /* 已下载字节数 */,
+    "failed_uids" JSON /* 获取失败的 UID（不含服务器上已删除的），全部分段完成后重试 */,
+    "max_messages_per_second" REAL /* 每秒最多获取的邮件数，为空时使用默认值 */,
+    "max_bytes_per_second" BIGINT /* 每秒最多下载的字节数，为空时使用默认值 */,
+    "error" TEXT /* 最近一次错误 */,
+    "started_at" TIMESTAMP /* 开始时间 */,
+    "finished_at" TIMESTAMP /* 完成时间 */,
+    "created_at" TIMESTAMP NOT NULL /* 创建时间 */,
+    "updated_at" TIMESTAMP NOT NULL /* 更新时间 */,
+    "account_id" VARCHAR(36) NOT NULL REFERENCES "email_accounts" ("id") ON DELETE CASCADE /* 账户ID */
+) /* 历史邮件回填任务：按 UID 从新到旧分段导入，每段完成后记录断点 */;
+"""
+
+MYSQL_TABLES = """
+CREATE TABLE `sync_states` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `folder` VARCHAR(255) NOT NULL COMMENT '文件夹',
+    `path` VARCHAR(255) COMMENT '服务器上的文件夹名（与 folder 不同时记录）',
+    `uid_validity` BIGINT COMMENT 'UIDVALIDITY',
+    `last_uid` BIGINT NOT NULL COMMENT '已同步的最大UID',
+    `highest_modseq` BIGINT COMMENT '已同步标志的 HIGHESTMODSEQ（CONDSTORE）',
+    `flags_synced_at` DATETIME(6) COMMENT '最后同步标志时间',
+    `remap_uid_validity` BIGINT COMMENT '正在按去重键重新绑定 UID 的新 UIDVALIDITY，为空表示没有进行中的重新绑定',
+    `remap_cursor_uid` BIGINT COMMENT '重新绑定 UID 的断点：已处理的最大 UID，下一段从大于它的 UID 继续',
+    `last_synced_at` DATETIME(6) COMMENT '最后同步时间',
+    `last_new_count` INT NOT NULL COMMENT '最近一次同步新增的邮件数',
+    `last_error` LONGTEXT COMMENT '最近一次同步错误',
+    `bytes_received` BIGINT NOT NULL COMMENT '累计从服务器接收的字节数（压缩后，即网络传输量）',
+    `bytes_uncompressed` BIGINT NOT NULL COMMENT '累计接收的字节数（解压后）',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间',
+    `account_id` VARCHAR(36) NOT NULL COMMENT '账户ID',
+    UNIQUE KEY `uid_sync_states_account_ad2ba8` (`account_id`, `folder`),
+    CONSTRAINT `fk_sync_sta_email_ac_c8d896ed` FOREIGN KEY (`account_id`) REFERENCES `email_accounts` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4 COMMENT='文件夹同步状态（UID 水位线和标志 MODSEQ）';
+CREATE TABLE `backfill_jobs` (
+    `id` VARCHAR(36) NOT NULL PRIMARY KEY,
+    `folder` VARCHAR(255) NOT NULL COMMENT '文件夹',
+    `status` VARCHAR(20) NOT NULL COMMENT '状态: pending/running/paused/completed/failed',
+    `uid_validity` BIGINT COMMENT 'UIDVALIDITY',
+    `cursor_uid` BIGINT COMMENT '断点：已回填的最小 UID，下一段从小于它的 UID 继续',
+    `total` INT NOT NULL COMMENT '需要回填的邮件总数',
+    `done` INT NOT NULL COMMENT '已成功处理的邮件数',
+    `imported` INT NOT NULL COMMENT '新增的邮件数',
+    `bytes_fetched` BIGINT NOT NULL COMMENT '已下载字节数',
+    `failed_uids` JSON COMMENT '获取失败的 UID（不含服务器上已删除的），全部分段完成后重试',
+    `max_messages_per_second` DOUBLE COMMENT '每秒最多获取的邮件数，为空时使用默认值',
+    `max_bytes_per_second` BIGINT COMMENT '每秒最多下载的字节数，为空时使用默认值',
+    `error` LONGTEXT COMMENT '最近一次错误',
+    `started_at` DATETIME(6) COMMENT '开始时间',
+    `finished_at` DATETIME(6) COMMENT '完成时间',
+    `created_at` DATETIME(6) NOT NULL COMMENT '创建时间',
+    `updated_at` DATETIME(6) NOT NULL COMMENT '更新时间',
+    `account_id` VARCHAR(36) NOT NULL COMMENT '账户ID',
+    CONSTRAINT `fk_backfill_email_ac_917f93ff` FOREIGN KEY (`account_id`) REFERENCES `email_accounts` (`id`) ON DELETE CASCADE
+) CHARACTER SET utf8mb4 COMMENT='历史邮件回填任务：按 UID 从新到旧分段导入，每段完成后记录断点';
+"""
+
+# (表, 列, SQLite 定义, MySQL 定义)
+COLUMNS = [
+    ("email_accounts", "sync_interval", "INT NOT NULL DEFAULT 300",
+     "INT NOT NULL DEFAULT 300 COMMENT '自动同步间隔(秒)，0 表示不自动同步'"),
+    ("email_accounts", "sync_folders", "JSON",
+     "JSON COMMENT '同步的文件夹（用途如 inbox/sent/junk 或服务器文件夹名），为空时使用默认配置'"),
+    ("email_accounts", "imap_compress", "INT NOT NULL DEFAULT 1",
+     "BOOL NOT NULL DEFAULT 1 COMMENT '服务器支持时是否启用 IMAP 压缩（COMPRESS=DEFLATE）'"),
+    ("emails", "uid", "BIGINT", "BIGINT COMMENT 'IMAP UID'"),
+    # 已有的行先填空字符串，回填后再建唯一索引
+    ("emails", "message_key", "VARCHAR(64) NOT NULL DEFAULT ''",
+     "VARCHAR(64) NOT NULL DEFAULT '' COMMENT '去重键: 规范化 Message-ID 的 SHA-256，缺失时为邮件头内容的 SHA-256；同一账户的同一文件夹内唯一'"),
+    ("attachments", "part", "VARCHAR(50)",
+     "VARCHAR(50) COMMENT 'IMAP 部分编号(BODY[part])，内容为空时按需从服务器获取'"),
+    ("attachments", "encoding", "VARCHAR(50)", "VARCHAR(50) COMMENT '传输编码'"),
+    ("attachments", "blob_sha256", "VARCHAR(64)",
+     "VARCHAR(64) COMMENT 'blob 存储中内容的 SHA-256，为空时按需从服务器获取'"),
+]
+
+# (表, 索引名, 列, 是否唯一)
+INDEXES = [
+    ("emails", "uid_emails_account_f62e2e", ("account_id", "folder", "message_key"), True),
+    ("emails", "idx_emails_account_folder_date_id", ("account_id", "folder", "date", "id"), False),
+    ("emails", "idx_emails_folder_date_id", ("folder", "date", "id"), False),
+    ("emails", "idx_emails_account_date_id", ("account_id", "date", "id"), False),
+    ("emails", "idx_emails_date_id", ("date", "id"), False),
+    ("emails", "idx_emails_read_account", ("is_read", "account_id"), False),
+    ("emails", "idx_emails_account_folder_uid", ("account_id", "folder", "uid"), False),
+    ("attachments", "idx_attachments_blob_sh_08c8b8", ("blob_sha256",), False),
+    ("access_logs", "idx_access_logs_created_id", ("created_at", "id"), False),
+    ("access_logs", "idx_access_logs_user_created_id", ("user_id", "created_at", "id"), False),
+    ("access_logs", "idx_access_logs_path_created", ("path", "created_at"), False),
+]
+
+def _quote(db: BaseDBAsyncClient, name: str) -> str:
+    return f"`{name}`" if db.capabilities.dialect == "mysql" else f'"{name}"'
+
+
+def _placeholder(db: BaseDBAsyncClient) -> str:
+    return "%s" if db.capabilities.dialect == "mysql" else "?"
+
+
+def _json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _message_key(row: Dict[str, Any]) -> str:
+    """按迁移时的规则计算去重键（与写入时的 email_message_key 一致），不依赖之后可能修改的运行时代码
+
+    有 Message-ID 时为规范化 Message-ID 的 SHA-256；缺失时为发件人、收件人、抄送、日期和主题的 SHA-256。
+    """
+    message_id = " ".join(str(row["message_id"] or "").split()).strip("<>").strip()
+    if message_id:
+        source = f"id:{message_id}"
+    else:
+        date = row["date"]
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+        headers = [
+            (_json(row["from_address"]) or {}).get("address"),
+            sorted(address.get("address") or "" for address in _json(row["to_addresses"]) or []),
+            sorted(address.get("address") or "" for address in _json(row["cc_addresses"]) or []),
+            date.replace(tzinfo=None) if isinstance(date, datetime) else date,
+            row["subject"]
+        ]
+        source = "headers:" + json.dumps(headers, ensure_ascii=False, default=str)
+    return hashlib.sha256(source.encode("utf-8", errors="replace")).hexdigest()
+
+
+async def _backfill_message_keys(db: BaseDBAsyncClient):
+    """为已有邮件按行中的 Message-ID 和邮件头计算去重键"""
+    mark = _placeholder(db)
+    emails = _quote(db, "emails")
+    while True:
+        _, rows = await db.execute_query(
+            f"SELECT id, message_id, from_address, to_addresses, cc_addresses, date, subject "
+            f"FROM {emails} WHERE message_key = '' LIMIT {BACKFILL_BATCH}"
+        )
+        if not rows:
+            return
+        values = [[_message_key(row), row["id"]] for row in rows]
+        await db.execute_many(f"UPDATE {emails} SET message_key = {mark} WHERE id = {mark}", values)
+
+
+async def _delete_duplicates(db: BaseDBAsyncClient):
+    """同一账户同一文件夹中去重键相同的邮件只保留一封（此前按 Message-ID 去重，可能存在重复）"""
+    mark = _placeholder(db)
+    emails, attachments = _quote(db, "emails"), _quote(db, "attachments")
+    _, groups = await db.execute_query(
+        f"SELECT account_id, folder, message_key, MIN(id) AS keep_id FROM {emails} "
+        f"GROUP BY account_id, folder, message_key HAVING COUNT(*) > 1"
+    )
+    for group in groups:
+        _, rows = await db.execute_query(
+            f"SELECT id FROM {emails} WHERE account_id = {mark} AND folder = {mark} "
+            f"AND message_key = {mark} AND id <> {mark}",
+            [group["account_id"], group["folder"], group["message_key"], group["keep_id"]]
+        )
+        ids = [[row["id"]] for row in rows]
+        await db.execute_many(f"DELETE FROM {attachments} WHERE email_id = {mark}", ids)
+        await db.execute_many(f"DELETE FROM {emails} WHERE id = {mark}", ids)
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    mysql = db.capabilities.dialect == "mysql"
+    await db.execute_script(MYSQL_TABLES if mysql else SQLITE_TABLES)
+    for table, column, sqlite_type, mysql_type in COLUMNS:
+        await db.execute_script(
+            f"ALTER TABLE {_quote(db, table)} ADD {_quote(db, column)} {mysql_type if mysql else sqlite_type}"
+        )
+
+    await _backfill_message_keys(db)
+    await _delete_duplicates(db)
+    if mysql:
+        await db.execute_script("ALTER TABLE `emails` ALTER COLUMN `message_key` DROP DEFAULT")
+
+    statements: List[str] = []
+    for table, name, columns, unique in INDEXES:
+        column_list = ", ".join(_quote(db, column) for column in columns)
+        statements.append(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {_quote(db, name)} ON {_quote(db, table)} ({column_list});"
+        )
+    return "\n".join(statements)
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    mysql = db.capabilities.dialect == "mysql"
+    statements = []
+    for table, name, _, _ in INDEXES:
+        if mysql:
+            statements.append(f"ALTER TABLE `{table}` DROP INDEX `{name}`;")
+        else:
+            statements.append(f'DROP INDEX IF EXISTS "{name}";')
+    for table, column, _, _ in COLUMNS:
+        statements.append(f"ALTER TABLE {_quote(db, table)} DROP COLUMN {_quote(db, column)};")
+    statements.append(f"DROP TABLE IF EXISTS {_quote(db, 'sync_states')};")
+    statements.append(f"DROP TABLE IF EXISTS {_quote(db, 'backfill_jobs')};")
+    return "\n".join(statements)
+
+
+MODELS_STATE = (
+    "eJztXWtz27YS/SsafUpn3Ibim53eztix06i149xI6W1v0+GAJGizkUhVpJK4ufnvFwvwLZIm"
+    "aUuCLH3xA8TysWcB7C4OgC/DeeDgWfjdxRx5s1PbDlZ+NPx+8GXoozkmf1RePxkM0WKRXYWC"
+    "CFkzKoChpolYVXoJWWG0RDbc10WzEJMiB4f20ltEXuCDzPuVISD8fqVZ1uj9SndE9f1KFSWN"
+    "/EQiKVE03YI7OYFNbuX5N12EVr739wqbUXCDo1u8JKJ//EmKPd/Bn3GY/Lv4YLoenjmFj/cc"
+    "uAEtN6O7BS17cYuWL2lNeCHLtIPZau5ntRd30W3gp9XJ+0LpDfbxEkXYySnBX81msdaSIvau"
+    "pCBarnD6kk5W4GAXrWagyuEP7sq3QYMDAsZ3MU6x3r/7YYbmloN+/DF+y5ycab6+npqTi6lp"
+    "DteggHcqKTousgMfYPQAVNDRHH02Z9i/iW7Jv5L6lT0n0xWrBQ/89fTti1enb59J6jfwwIDY"
+    "AjOV1/EVkV76Sm+BIsRuQpHJoKC/O4CR1H8cOJKCDI/MkhPFJqprr+xh0WwVWXCIORuuULb1"
+    "NhCMBKEFBqRWLQj0GqCQaZ025i5qTwW21Qx6aT3fcSiaJMBPuZfWRUVpoXVSq1br9FpR64tl"
+    "8NFz8LKL4vMynNt8Xvuq5BDty65hEQwUWe2DgdLG8JV6u1fWzH6BwvBTsOzU++dlOAdAERGY"
+    "vGWrtNMBMFRdTko0XRj1g6EdDk1ArCHhzdHCvA3CqNNAnBfiGovx1ekb0gg06PgJKtAdqarO"
+    "ZadElboIlhVIjP2oAYhEpgSExxzJTQBhGFIvHDSEXaJ1CUsttX4Db/StOJI1WZdUWSdV6Fun"
+    "JVoDDuPX05KKw3nU3dgLQlwb++Rqui/GTpXa0dgLMtszdkXXeuGwa2NfhdgMwwrn8iwIZhj5"
+    "1UrOSZVUbBGxTek48To7jbKqKoKCZXDwZVcjf2uKqE8ml+303aDMs+trepN5GP49owXjacm4"
+    "312dXRBvn9o8qeRFuBoF2kPbwXyxxGHYEYs1We4RWet6VAUwUiUBXFHFVYuokZ8xagMYIAbQ"
+    "XHTiqGquaLxfua6gv7i+evP2YjL51/nFy8vT6QUtNbgCODSRHXkfK4LnZnDzctwDWwkaTzCE"
+    "d75tkkfi5UdU0efVDyplue0NLJIgdAZCH2FEW5hOIwubQGOpCgn5FJfEF4ZqyM8gw+GI39CW"
+    "YgukTek6tETNkIikjKGFVt9lRz4ZAOAGMxJaV/SPP0+uXzcAl5Mr4eZ4djT432DmhW3wixvF"
+    "FiLDHGYsJlSJfwG4QN+oGFLc77EGBqH8COJGQxcHnm8Fn5+H2I+e/7XyPwwgqzVSqzvd8i1Z"
+    "5gu6TmYWcBXMQUMaSjrmbAglj8UO+albCIxqJEPWzFXxg9s7oFlo74mP+Ozq9Ley+/ji8vqM"
+    "Aktc75slvQu9wVnJgOwlBmBNVOFLnpMrkTfH1SZUlCwbUCz6XfIHR44+wD2ChA4RSOCDHqBl"
+    "Cyaf7Vz7s7vY8BsAm46vLibT06s3BdTOyUAMV0RaelcqfVbOQqc3GfxnPH01gH8H/71+fVEG"
+    "N603/e8Q3gmtosD0g08mcnKZyaQ00WXR5104PW2hKLlXtqCqLu1HLOFgbCHRXM4Y6NvDRJP7"
+    "ITe/AQUWsj98QkvHLFwp5eCrfPNY7uUvb/EMUX2vm0Z++o4rq8gmPsbnnTrurDSziUxZoEzX"
+    "m83MvwLrgTo7i2/1c2AdguaowxJG5AsfqLcJudEE7vNUtQaNNhCDuma8fmkuzsslyEc39PPg"
+    "2fCkWHmnUYTs2zmunoXPXT1pmoNHab32E/CqLCdOWfOke23Fg5pop73y05tmJx0e7jrVnpfh"
+    "OgFdCj1I0MFNwpk8MSLNlSmug+7Lcr30v73wcqQrMM1okThPszWrupPZGdsh9P6pUH59biau"
+    "vr2UTPeETDHWFoFlYgvuMwBBIf/ooi5+s5vESmy56/qe4s81Cs+J8G3nBa2nNv/sDIVYlb9J"
+    "chyqgoGspmgQGEkqTsoNw4Cx1YKxVcYCaSW6qzlJ8KS7qk3hg+SYKAkDaxZYg7REQA/Pe04v"
+    "fps250HSSOry+vVPSfVycqSIN7ymGd4iUVG7dHAlsQ3h/hi0ojUcAD3RKfV6qi4PJq9OvyXf"
+    "U5/rUiXIhBmaANwYbOOqLJouWdCaJacXZ0aVW3SfxFbrek+4VObMVM2WNvFlKmdKuWrJ8ayP"
+    "IWDa2ARgx7iQ1FQkV3t2dn3++x/wGX+mTToP9S5gfXwqFPbtwIEX6ABtXoZneCGpLArQpRpS"
+    "gmx/9tNja/6YOD6MZGGbxDEj1XeLkvMynIdljBEK/lLb5Mwm4uK17Oy9POiXwRJ7N/4v+I5C"
+    "MCaviHy7KijgNg/bXfV1eTFSvESf0uROwf6IJsj3YzY7/uJ08uL0/GL4tT77vckUG8Ogbo1L"
+    "c2Ity8W3X9TSJqdWW7Eip/bHEGXrcNgMM+2vcBiSDzY/4Lvhn6W825dhpptEOulN0hs4ccqW"
+    "lIM4/kx5PeRjUpVm2brPJtNEss4nnuk24R7xjRPLH9J7EV3Rf2ivlnuZBz6+72OLOnjQl3d+"
+    "dq+ndX6KF5owHFJTzT62/QNB2MwZWh+9ZuCuHmJUq8bvPuaUec8pJz1TN0CKUnyHEYX+29GB"
+    "4yKobj9fZiPp5fzg0AODWIxzL1KRLAv4QLYDUYOIvwdymWHLEFQLElwfqYMr9knfjs8H1dkY"
+    "zYWwXTGklBLKAvk8xuSq3JzXoVGMzLI7EO7n1/nFi21yVysYUezelJ4KdfjI8ayqmvCZd1Ob"
+    "Il9Vtt52GfJt5njetW6rLAtuiKIkaaIgqboia5qiC2k6fP1SU178bPwTpMYLCKznyt1lMIdo"
+    "sZqkXU9CLMs9iIS4zYbsjJLmIGMLPTihvRFiHwnXY9VWMSbqQSnL7QkoqiKpeVBorkZj9F0+"
+    "AbLtfgCV5faDuquKMKoYAixl4B0Zqy80a4L7gQ1bWLsf2IQr6y9sd1uCmInsj59OvDrwFnWj"
+    "JQ5bWOxsBU6Fe14/H57U3x+lq5YqMXcX1oFg5Ca+r6qJdksiwtYnromWzdtoXpH/bYYmFdpL"
+    "fF5Nry45RSTJoHWZE0tkHmE2bDfIKFiBZjJyH44JR5NfFUz59dmvXC6z2wrGRGqL6xfTkv4L"
+    "GB1XhMVNbkti3NbWkYYRWi5xDxhygnuFhKqOYIAiETxPSNyi0CwRvDvAUSG9X5holEOTktB5"
+    "QsbzZ56PTW+ObrqFNWuCexLWsCSlIwPzSXVhHyFR1gZfbM8h2s1Tk08GwJM6GSTMoJMBo/SR"
+    "394/5KqLvBklrHz9Wkmlch0nZdZpor7OeUy4diDLbj24j4GVMa2YWPoOqaTK6rksG0UTtZSU"
+    "mZdkiWLdEXMrZhPaCk34ttxeY9thXjY315rmn0psbx6ANLKz69+G3XuMUkK9T4i3EYo50Qau"
+    "WsxX3zdkEvvRKcBwCbu7aZj/XMeRYnek2B3XZh/XZpfXwpZoLC0HyKIU55Pl3dfDbplymSe5"
+    "PQLpMrd39R5j0JZ7WTTFruzLHAiNcWaHReHFlcvcIPB47NfNrgq3bRyGl8HNsGpReHrxpHFN"
+    "OK1mzoKb1vxV3bJcGBEwTvKPiuvctyl7O6H714oXeIVFd6sdmTD3wWYi34VBuQrxMhZ46OPp"
+    "rfq8wwKRzrb4Ah0fDXdIHt3w3CfEogRlPz0SZc4a24KRE+F7Bopt6rVrX6S0Oemy6zYIeZl9"
+    "0Xf/XRAef72bt6inuDX0OIsGghtfTvf4zUP3OpbbUIPlemawXEEMJgrryMtOJLhWNp1BA7fD"
+    "lkUa4Rrwt9N2F8lSJrBVIrAhD7i+WJqN6+0XS7P6e6Ry3aH7S7t623TC5vk1sLvVijiDxE9Y"
+    "V379Nh9FKZ65zNCdA/tdwYYMkzEWhJeUddZhWfPj7/O9NElYUxXK3+O7pFL7M5zKGMNSclno"
+    "uXx/A1Z/kEnuYhR6EInNuiT3Wo5tN8tu34U0zF9LX9Dyk6bMBfQFrXMW+cbYmKeor3hQ+9g9"
+    "3Wh56/FbD0yeUPiWnH9l3qKwo29bEuTcyc1OyaLuFhBQsGD3AWEjSz23fGTflsmwcGocN6o+"
+    "nq3BB+2OqNOZe34PFBKxvaJAahZsFwYxBpQoXGExQ2EEEw9VaDQHG0XJfaLpM5pgcpAi3dXU"
+    "VZTucceexBmtKPsHGXQemVWVtnBkVh2GLdQxqzhJQJwuvGnwAfvDKg5Fcu2kkUKx8MwIqrXM"
+    "Rpy+GdOMIM3FAkm+ISFxT92DyklQHT+9pMQTPcI+b7QcHmEfJe26rdpTAa6TQAWtC1Kv/IMk"
+    "tjF5sd7kxWNEzGdEvDA/3ZKrydqQtqvWy3I8Z4SATUGiLSfpdBQJYq547ZgxoodJiojWSo4q"
+    "1NjG3clW3nAc5cMjs00scMefFx7xuXp4zEXJfYqiddfW2AL3Y+QMMY/Vaae+ohTP7bYYJuuC"
+    "oPBC+jvmLA4jTj3mLI45iy6rwWhmehX2soay7D6NyPm8dv705UMbnTnJX+XPI61IYZWOK63P"
+    "Yq0dkdqGVqNIOjv2RizthKs6sM5bVy1aYiWH2bgueOCw3QLsrTpIz7uhfQscW5Ucf8VccdWy"
+    "6GYPLt34QU0dedWy3eyqbtNDxVOj1C16t3iyBUHmQbDW1vrv39sfVLIPzp19erm+4/Ya92Gw"
+    "EUYG42p3UXsmsUW1L7CfnI/VkfqVUrq/H8Q3eb5c+T78XiDwM57bwXwBa32d52xDm17YtMnD"
+    "ivVpWHEtC7vyHPMjmnmOF1XEtfdsIV6Q5Jl/TwaLX08vx+fj6e8t1b6T7cTt1TIM0nM12kNR"
+    "lOMZiPyImgznbF+9/JAf79fE3FxbcGGwzw5lFKxs1ycYwZkPAPXgbx3TMV2Kt/5nboKGwSkg"
+    "P9u2up3AHwURqmAI1sKe1uf5oNt4Ty9DH1VhXNhJU4CNf+HY1U4gPdqCGCfwuyw/SqrzrHzW"
+    "tGLnVjRgdsQQ5ISjVgHBzpTvzRfBMqraxLIWgLwIzyDE0YluYL5Ubt1FODRdHNm3lZuHNgw4"
+    "a6I86581gvyBzdkZ2z30v+0jRtjuh2Rs73bCSFFsP7aoa9q/MfUB6JaSdGJRFq2qk3rJ1cyr"
+    "EOEcWUNV5aTtkTsY2VaWql48RbguJ8AOL9KttuuUG2DfyIZ5ECXEh0KF5gIvzRCTN6po1S9n"
+    "Aapp1A33KJmPCzfhyXBYQkczHDF1G+lMc96gqrve+rO+85lVAztwBLSF5C6kjgYjOL9+d3Z5"
+    "MXjz9uLFeDKODSJNqNKLUJRxCd5enF5WYM464ibAm7rxujtwHkHUgJ3v4eOjvEr9/CbB3s3o"
+    "gJfLoCKbVc8kSQX4noqu2+HXUEYGYIMfYbf9TRBEYEf1ftOTRcl9mo5SXNYGbevwpqAKnprn"
+    "e+FtL/BLonuFfs5XOmT0jySVwyAmHEkqR5LKccvi45bFnG2Yy+uWxZsk3kzufHsSIfoua7Sb"
+    "7OJJE+kGWA5wDlKEW1NuKg6FlhmrBBgm+c29IFvFJqBUGw6mll0ZYlNs0WUK1G+ihzLARryD"
+    "q+vzycW/WYKqjOD2nlpBcfmj0H4YG+LPI+/lyHs58l6KKFTwXra6n+Q2szOVOffknKWKnsrJ"
+    "5e7xgNnWIMvk056MOo16jn1X1RXuDMojU4ajvCejb3flyeSl+J+xLIzveUaMIWrvWnvaO4Hn"
+    "1ru5xUTXZEgN8d/dQFqX5bm9VIGVuVfx1OWr8U+vSByZ87X0F9evzyfT67cXnXq53cxAz9BN"
+    "aIJb1C+3uS6+T/nN/GKLOpAPOe+5xHO0MPsPjtXyfDd5dho3HHiZnFypSJaVsAQMRUwZAywd"
+    "pmGYx1IsAyV8xNhRsoRBbsCtmp6EM/pgspMee2mDw8UOWtVdByY7ddlOTtiM57crH8tz98IM"
+    "oC/1tUqab+NpZRg1HNk18l7mEbTiyJJ6e86RpS5c77FoXfpJDEUHPPxQRH38yazJ8DbHAgVB"
+    "niOCOj5E0Qz45JlSTXcmqhSluM+H3IsO78wVxgNbknHC+9iPDpyX5bktaQ5sDaTTzVrj9aNr"
+    "+SxVQrRFSWojl0ynS1hhNYMrGknXHHNLJQ3GV1cZ0WEeRmVXpFZiSNQJcPmP/BiuKx+WrsFJ"
+    "Tv3soiy/L7bR3gZIlysllpDaANfIHtkqh8FQOLJVjmyVI1vlyFY5slV2zlY5xUvPvh1WbXLM"
+    "rpw0bnGc1bmPolLPQXjk/UvqV2a29PNiALe9S2t7ksajRML1pIyPeBnGp7O37WpzIjz3sz15"
+    "MBuZuIdG1WUwY9WfoHY3so0zeWJUeYZk/drUnMiD1qXypu1tLPrc6Z5nX/8PPZY/3Q=="
+)
@@ -0,0 +1,147 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 多个进程同时写访问日志、读邮件列表时，不同存储配置下 SQLite 的读写吞吐、延迟和锁等待失败次数
+
+写进程模拟中间件中的 AccessLog.create，读进程模拟邮件列表接口（分页 + 计数）。
+对比的配置：回滚日志（journal_mode=DELETE）、Tortoise 默认值（WAL + synchronous=FULL）、production 配置。
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_db_concurrency.py --writers 2 --readers 2 --duration 5
+'''
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tortoise import Tortoise  # noqa: E402
+
+from app.database import TORTOISE_ORM, storage_credentials  # noqa: E402
+from app.models import AccessLog, Email, EmailAccount  # noqa: E402
+
+ACCOUNT_ID = "00000000-0000-0000-0000-000000000001"
+
+# (名称, URL 查询参数, 存储配置)
+PROFILES = [
+    ("回滚日志 DELETE", "?journal_mode=DELETE", "default"),
+    ("Tortoise 默认 WAL+FULL", "", "default"),
+    ("production", "", "production"),
+]
+
+
+def config_for(db_url: str, profile: str) -> dict:
+    return {**TORTOISE_ORM, "connections": {"default": storage_credentials(db_url, profile)}}
+
+
+async def prepare(db_url: str, emails: int):
+    """建表并写入测试邮件"""
+    await Tortoise.init(config=config_for(db_url, "default"))
+    await Tortoise.generate_schemas()
+    await EmailAccount.create(
+        id=ACCOUNT_ID, name="测试账户", email="bench@example.com", provider="custom",
+        password="-", imap_host="imap.example.com", smtp_host="smtp.example.com"
+    )
+    now = datetime.now()
+    await Email.bulk_create([
+        Email(
+            account_id=ACCOUNT_ID, message_key=f"{i:064x}", uid=i + 1,
+            from_address={"address": "sender@example.com"}, to_addresses=[],
+            subject=f"邮件 {i}", body="正文" * 200, date=now - timedelta(minutes=i), folder="INBOX"
+        )
+        for i in range(emails)
+    ], batch_size=1000)
+    await Tortoise.close_connections()
+
+
+async def worker(db_url: str, profile: str, role: str, duration: float) -> dict:
+    await Tortoise.init(config=config_for(db_url, profile))
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                if role == "writer":
+                    await AccessLog.create(
+                        user_id=str(uuid.uuid4()), username="bench", ip_address="127.0.0.1",
+                        method="GET", path="/api/emails", status_code=200, user_agent="bench"
+                    )
+                else:
+                    query = Email.filter(account_id=ACCOUNT_ID, folder="INBOX")
+                    await query.count()
+                    await query.order_by("-date").offset(0).limit(20)
+            except Exception:
+                # database is locked 等锁等待超时
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await Tortoise.close_connections()
+    return {"role": role, "latencies": latencies, "errors": errors}
+
+
+def run_worker(args, results):
+    results.put(asyncio.run(worker(*args)))
+
+
+def percentile(values, ratio: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * ratio), len(values) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 存储配置的并发读写基准测试")
+    parser.add_argument("--writers", type=int, default=2, help="写进程数")
+    parser.add_argument("--readers", type=int, default=2, help="读进程数")
+    parser.add_argument("--duration", type=float, default=5, help="每种配置运行的秒数")
+    parser.add_argument("--emails", type=int, default=5000, help="测试邮件数量")
+    parser.add_argument("--dir", default=None, help="数据库文件目录（默认系统临时目录，请使用真实磁盘而非 tmpfs）")
+    args = parser.parse_args()
+
+    print(f"{args.writers} 个写进程 + {args.readers} 个读进程，每种配置 {args.duration:g} 秒，{args.emails} 封邮件")
+    print(f"{'配置':<24} | {'写/秒':>7} | {'写 p50/p99':>15} | {'读/秒':>7} | {'读 p50/p99':>15} | {'失败':>4}")
+    for label, query, profile in PROFILES:
+        directory = tempfile.mkdtemp(dir=args.dir)
+        db_url = f"sqlite://{os.path.join(directory, 'bench.db')}{query}"
+        try:
+            asyncio.run(prepare(db_url, args.emails))
+            results = multiprocessing.Queue()
+            roles = ["writer"] * args.writers + ["reader"] * args.readers
+            processes = [
+                multiprocessing.Process(target=run_worker, args=((db_url, profile, role, args.duration), results))
+                for role in roles
+            ]
+            for process in processes:
+                process.start()
+            collected = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        row = {}
+        for role in ("writer", "reader"):
+            latencies = [value for result in collected if result["role"] == role for value in result["latencies"]]
+            row[role] = (
+                len(latencies) / args.duration,
+                f"{percentile(latencies, 0.5):.1f}/{percentile(latencies, 0.99):.1f}ms"
+            )
+        errors = sum(result["errors"] for result in collected)
+        print(
+            f"{label:<24} | {row['writer'][0]:>7.0f} | {row['writer'][1]:>15} | "
+            f"{row['reader'][0]:>7.0f} | {row['reader'][1]:>15} | {errors:>4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
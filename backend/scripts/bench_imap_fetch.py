@@ -0,0 +1,107 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 逐封 FETCH 与批量 FETCH 在高延迟 IMAP 服务器上的耗时对比
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_imap_fetch.py --messages 50 --latency 0.05
+    python scripts/bench_imap_fetch.py --messages 50 --attachment-size 500000
+
+参考结果（单核虚拟机，50 封邮件，每条命令注入 50ms 延迟）:
+    获取正文: 逐封 2.60s，批量 0.15s（约 17 倍）
+    只获取邮件头: 逐封 2.58s，批量 0.08s（约 32 倍）
+    批量 FETCH 只需 1-2 次往返，剩余时间主要是解析；未预热 MIME 解析进程池时批量约 1.6s，
+    其中约 1.5s 是启动解析子进程，服务运行后进程池常驻，不再有这部分开销。
+'''
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_imap_server import FakeIMAPServer  # noqa: E402
+from app.utils import email_service as email_service_module  # noqa: E402
+from app.utils.email_service import EmailService  # noqa: E402
+
+
+def connect(server: FakeIMAPServer) -> EmailService:
+    service = EmailService("127.0.0.1", server.port, "bench", "bench", use_ssl=False)
+    service.connect()
+    service.connection.select("INBOX")
+    return service
+
+
+def bench_sequential(server: FakeIMAPServer, count: int, fetch_body: bool) -> float:
+    """逐封 FETCH（每封邮件一次往返）"""
+    service = connect(server)
+    start = time.perf_counter()
+    for msg_id in range(count, 0, -1):
+        service._fetch_email(str(msg_id).encode(), fetch_body=fetch_body)
+    elapsed = time.perf_counter() - start
+    service.disconnect()
+    return elapsed
+
+
+def bench_batched(server: FakeIMAPServer, count: int, fetch_body: bool) -> float:
+    """批量 FETCH（每批一次往返）"""
+    service = connect(server)
+    start = time.perf_counter()
+    service._fetch_emails_batch(list(range(count, 0, -1)), fetch_body=fetch_body)
+    elapsed = time.perf_counter() - start
+    service.disconnect()
+    return elapsed
+
+
+def bench_fetch_mode(server: FakeIMAPServer, count: int, mode: str):
+    """按指定获取方式批量获取正文，返回 (耗时, 服务器发送字节数)"""
+    email_service_module.IMAP_FETCH_MODE = mode
+    service = connect(server)
+    sent = server.bytes_sent
+    start = time.perf_counter()
+    service._fetch_emails_batch(list(range(count, 0, -1)), fetch_body=True)
+    elapsed = time.perf_counter() - start
+    sent = server.bytes_sent - sent
+    service.disconnect()
+    return elapsed, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IMAP FETCH 基准测试")
+    parser.add_argument("--messages", type=int, default=50, help="获取的邮件数量")
+    parser.add_argument("--latency", type=float, default=0.05, help="每条命令注入的延迟（秒）")
+    parser.add_argument("--headers-only", action="store_true", help="只获取邮件头")
+    parser.add_argument("--attachment-size", type=int, default=0, help="每封邮件附件大小（字节），大于 0 时对比 full 与 structure 获取方式")
+    args = parser.parse_args()
+
+    server = FakeIMAPServer(latency=args.latency).start()
+    server.store.fill(
+        "INBOX", args.messages,
+        attachment_size=args.attachment_size,
+        inline_image=bool(args.attachment_size)
+    )
+    fetch_body = not args.headers_only
+
+    # 服务进程中 MIME 解析进程池常驻，先预热一次，避免把启动子进程的时间（单核约 1.5 秒）计入批量 FETCH
+    bench_batched(server, args.messages, fetch_body)
+
+    sequential = bench_sequential(server, args.messages, fetch_body)
+    batched = bench_batched(server, args.messages, fetch_body)
+
+    print(f"邮件数量: {args.messages}，注入延迟: {args.latency * 1000:.0f}ms，获取正文: {fetch_body}")
+    print(f"逐封 FETCH: {sequential:.3f}s ({args.messages / sequential:.1f} 封/秒)")
+    print(f"批量 FETCH: {batched:.3f}s ({args.messages / batched:.1f} 封/秒)")
+    print(f"加速比: {sequential / batched:.1f}x")
+
+    if args.attachment_size and fetch_body:
+        full_time, full_bytes = bench_fetch_mode(server, args.messages, "full")
+        structure_time, structure_bytes = bench_fetch_mode(server, args.messages, "structure")
+        print(f"完整获取 (RFC822): {full_time:.3f}s，传输 {full_bytes / 1024:.0f} KB")
+        print(f"结构优先 (BODYSTRUCTURE + 文本部分): {structure_time:.3f}s，传输 {structure_bytes / 1024:.0f} KB")
+        print(f"传输量减少: {(1 - structure_bytes / full_bytes) * 100:.1f}%")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 高往返延迟下逐条等待与流水线发送 IMAP 命令的耗时对比（登录、获取邮件、标志同步、文件夹状态）
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_imap_pipeline.py --messages 400 --rtt 0.15 --depth 1 4 8
+'''
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_imap_server import FakeIMAPServer  # noqa: E402
+from app.utils import email_service as email_service_module  # noqa: E402
+from app.utils.email_service import EmailService  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(server: FakeIMAPServer, count: int):
+    """依次执行各项操作，返回 {操作: (耗时, 结果数量)}"""
+    service = EmailService("127.0.0.1", server.port, "bench", "bench", use_ssl=False)
+    timings = {}
+    timings["连接登录"] = timed(service.connect)
+    service._select_folder("INBOX")
+    uids = list(range(count, 0, -1))
+
+    email_service_module.IMAP_FETCH_MODE = "full"
+    elapsed, emails = timed(lambda: service._fetch_emails_batch(uids, fetch_body=False, by_uid=True))
+    timings["邮件头"] = (elapsed, len(emails))
+    email_service_module.IMAP_FETCH_MODE = "structure"
+    elapsed, emails = timed(lambda: service._fetch_emails_batch(uids, fetch_body=True, by_uid=True))
+    timings["正文(structure)"] = (elapsed, len(emails))
+
+    elapsed, changes = timed(lambda: service.get_flag_changes("INBOX", 1, None, count, full_sweep=True))
+    timings["标志全量扫描"] = (elapsed, len(changes["flags"]))
+    elapsed, folders = timed(service.get_folders)
+    timings["文件夹状态"] = (elapsed, len(folders))
+    service.disconnect()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IMAP 命令流水线基准测试")
+    parser.add_argument("--messages", type=int, default=400, help="INBOX 中的邮件数量")
+    parser.add_argument("--folders", type=int, default=20, help="额外的文件夹数量")
+    parser.add_argument("--rtt", type=float, default=0.15, help="模拟的网络往返延迟（秒）")
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 4, 8], help="流水线深度，1 表示逐条等待")
+    args = parser.parse_args()
+
+    server = FakeIMAPServer(rtt=args.rtt).start()
+    server.store.fill("INBOX", args.messages)
+    for index in range(args.folders):
+        server.store.fill(f"Folder {index}", 1)
+    # 每条 FETCH 50 封邮件，标志扫描每条 100 个 UID，使各项操作都包含多条命令
+    email_service_module.FETCH_BATCH_SIZE = 50
+    email_service_module.IMAP_FLAG_SWEEP_CHUNK = 100
+
+    print(f"邮件数量: {args.messages}，文件夹: {args.folders + 1}，往返延迟: {args.rtt * 1000:.0f}ms")
+    # 预热：启动 MIME 解析进程池，避免计入第一轮
+    server.rtt = 0.0
+    run(server, args.messages)
+    server.rtt = args.rtt
+
+    results = {}
+    for depth in args.depth:
+        email_service_module.IMAP_PIPELINE_DEPTH = depth
+        results[depth] = run(server, args.messages)
+
+    names = list(results[args.depth[0]])
+    print(f"{'操作':<14} | " + " | ".join(f"{'深度 ' + str(depth):>12}" for depth in args.depth))
+    for name in names:
+        cells = [f"{results[depth][name][0]:>11.2f}s" for depth in args.depth]
+        print(f"{name:<14} | " + " | ".join(cells))
+    totals = [sum(elapsed for elapsed, _ in results[depth].values()) for depth in args.depth]
+    print(f"{'合计':<14} | " + " | ".join(f"{total:>11.2f}s" for total in totals))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 一次性解析（email.message_from_bytes）与流式 MIME 解析在大邮件上的峰值内存对比
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_mime_memory.py --sizes 5 20 50
+'''
+import argparse
+import base64
+import email
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_imap_server import build_message  # noqa: E402
+from app.utils.email_service import EmailService  # noqa: E402
+
+
+def parse_in_memory(raw: bytes):
+    """原实现：整封邮件解析为 Message，解码所有部分并对内嵌图片做 base64"""
+    msg = email.message_from_bytes(raw)
+    result = {"body": "", "body_html": "", "attachments": [], "inline_images": {}}
+    for part in msg.walk():
+        content_type = part.get_content_type()
+        content_id = part.get("Content-ID", "")
+        if content_id and content_type.startswith("image/"):
+            payload = part.get_payload(decode=True)
+            if payload:
+                result["inline_images"][content_id.strip("<>")] = base64.b64encode(payload).decode()
+        elif "attachment" in str(part.get("Content-Disposition", "")):
+            result["attachments"].append(len(part.get_payload(decode=True) or b""))
+        elif content_type == "text/plain" and not result["body"]:
+            result["body"] = part.get_payload(decode=True).decode("utf-8", errors="ignore")
+        elif content_type == "text/html" and not result["body_html"]:
+            result["body_html"] = part.get_payload(decode=True).decode("utf-8", errors="ignore")
+    return result
+
+
+def measure(func):
+    """返回 (峰值内存字节数, 耗时)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIME 解析峰值内存基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50], help="附件大小（MB）")
+    args = parser.parse_args()
+
+    service = EmailService("127.0.0.1", 0, "bench", "bench", use_ssl=False)
+    print(f"{'附件大小':>8} | {'一次性解析峰值':>14} | {'流式解析峰值':>12} | {'一次性耗时':>10} | {'流式耗时':>8}")
+
+    for size in args.sizes:
+        # 原始邮件放在临时文件中，模拟从 socket 读入的字面量
+        literal = tempfile.TemporaryFile()
+        literal.write(build_message(1, attachment_size=size * 1024 * 1024, inline_image=True))
+
+        literal.seek(0)
+        legacy_peak, legacy_time = measure(lambda: parse_in_memory(literal.read()))
+        streaming_peak, streaming_time = measure(lambda: service._parse_message(literal, fetch_body=True))
+        literal.close()
+
+        print(
+            f"{size:>6}MB | {legacy_peak / 2 ** 20:>12.1f}MB | {streaming_peak / 2 ** 20:>10.2f}MB | "
+            f"{legacy_time:>9.2f}s | {streaming_time:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
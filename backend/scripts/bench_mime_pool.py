@@ -0,0 +1,100 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 单进程解析与 MIME 解析进程池的吞吐量（封/秒），以及解析期间事件循环的延迟
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_mime_pool.py --messages 2000 --workers 1 2 4
+'''
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_imap_server import build_message  # noqa: E402
+from app.utils.email_service import FETCH_BATCH_SIZE, parse_raw_messages  # noqa: E402
+from app.utils.mime_pool import MimeParsePool  # noqa: E402
+
+
+def build_corpus(count: int):
+    """合成邮件：正文大小不一，每 3 封带内嵌图片，每 5 封带附件（保持在内存解析的大小范围内）"""
+    corpus = []
+    for i in range(count):
+        raw = build_message(
+            i + 1,
+            body_size=1024 * (1 + i % 16),
+            attachment_size=32 * 1024 if i % 5 == 0 else 0,
+            inline_image=i % 3 == 0
+        )
+        corpus.append((raw, i + 1, True))
+    return corpus
+
+
+def batches(jobs):
+    for start in range(0, len(jobs), FETCH_BATCH_SIZE):
+        yield jobs[start:start + FETCH_BATCH_SIZE]
+
+
+def ingest(jobs, pool=None):
+    """按 FETCH 批次解析全部邮件，与同步时的调用方式一致"""
+    for batch in batches(jobs):
+        results = pool.map(parse_raw_messages, batch) if pool else None
+        if results is None:
+            results = parse_raw_messages(batch)
+        assert not any(isinstance(result, Exception) for result in results)
+
+
+async def loop_lag(jobs, pool=None, interval: float = 0.005):
+    """在 IMAP 线程中解析邮件，同时测量事件循环的调度延迟（模拟 API 请求）"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.get_running_loop().run_in_executor(None, ingest, jobs, pool)
+    done.set()
+    await task
+    lags.sort()
+    return lags[int(len(lags) * 0.99)] * 1000, lags[-1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIME 解析进程池吞吐量基准测试")
+    parser.add_argument("--messages", type=int, default=2000, help="合成邮件数量")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="进程池大小")
+    args = parser.parse_args()
+
+    jobs = build_corpus(args.messages)
+    total = sum(len(raw) for raw, _, _ in jobs)
+    print(f"语料: {len(jobs)} 封邮件, {total / 2 ** 20:.1f}MB, CPU 核数 {os.cpu_count()}")
+    print(f"{'方式':<12} | {'耗时':>7} | {'吞吐量':>11} | {'事件循环 p99 延迟':>16} | {'最大延迟':>8}")
+
+    def report(name, elapsed, lag):
+        print(f"{name:<12} | {elapsed:>6.2f}s | {len(jobs) / elapsed:>7.0f} 封/秒 | {lag[0]:>14.1f}ms | {lag[1]:>6.1f}ms")
+
+    start = time.perf_counter()
+    ingest(jobs)
+    report("单进程", time.perf_counter() - start, asyncio.run(loop_lag(jobs)))
+
+    for workers in args.workers:
+        pool = MimeParsePool(workers=workers, min_batch=1)
+        # 预热：启动子进程并完成模块导入
+        pool.map(parse_raw_messages, jobs[:workers])
+        start = time.perf_counter()
+        ingest(jobs, pool)
+        elapsed = time.perf_counter() - start
+        report(f"进程池 x{workers}", elapsed, asyncio.run(loop_lag(jobs, pool)))
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
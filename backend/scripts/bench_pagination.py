@@ -0,0 +1,83 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 基准测试 - 邮件列表按页码（OFFSET + COUNT）和按游标分页在不同翻页深度下的耗时
+
+用法（在 backend 目录下执行）:
+    python scripts/bench_pagination.py --emails 200000 --pages 1 100 1000 5000
+'''
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tortoise import Tortoise  # noqa: E402
+
+from app.database import TORTOISE_ORM  # noqa: E402
+from app.models import Email, EmailAccount  # noqa: E402
+from app.utils.pagination import encode_cursor, paginate  # noqa: E402
+
+ACCOUNT_ID = "00000000-0000-0000-0000-000000000001"
+PAGE_SIZE = 20
+
+
+async def seed(count: int):
+    await EmailAccount.create(
+        id=ACCOUNT_ID, name="测试账户", email="bench@example.com", provider="custom",
+        password="-", imap_host="imap.example.com", smtp_host="smtp.example.com"
+    )
+    now = datetime(2026, 10, 17)
+    for start in range(0, count, 10000):
+        await Email.bulk_create([
+            Email(
+                account_id=ACCOUNT_ID, message_key=f"{i:064x}", uid=i + 1,
+                from_address={"address": "sender@example.com"}, to_addresses=[],
+                subject=f"邮件 {i}", date=now - timedelta(seconds=i * 30), folder="INBOX"
+            )
+            for i in range(start, min(start + 10000, count))
+        ])
+    await Tortoise.get_connection("default").execute_script("ANALYZE")
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await coro_factory()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="页码分页与游标分页的耗时对比")
+    parser.add_argument("--emails", type=int, default=200000, help="测试邮件数量")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 5000], help="测试的页码")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数")
+    args = parser.parse_args()
+
+    db_url = f"sqlite://{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    await Tortoise.init(config={**TORTOISE_ORM, "connections": {"default": db_url}})
+    try:
+        await Tortoise.generate_schemas()
+        await seed(args.emails)
+
+        query = Email.filter(account_id=ACCOUNT_ID, folder="INBOX")
+        print(f"{args.emails} 封邮件，每页 {PAGE_SIZE} 封")
+        print(f"{'页码':>6} | {'页码分页':>10} | {'游标分页':>10}")
+        for page in args.pages:
+            # 游标取上一页最后一封邮件，与逐页翻到该页时得到的游标相同
+            offset = (page - 1) * PAGE_SIZE
+            previous = await query.order_by("-date", "-id").offset(offset - 1).first() if page > 1 else None
+            cursor = encode_cursor(previous.date, previous.id) if previous else None
+            by_page = await timed(lambda: paginate(query, "date", PAGE_SIZE, page=page), args.repeat)
+            by_cursor = await timed(lambda: paginate(query, "date", PAGE_SIZE, cursor=cursor), args.repeat)
+            print(f"{page:>6} | {by_page:>8.2f}ms | {by_cursor:>8.2f}ms")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
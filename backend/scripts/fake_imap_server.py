@@ -0,0 +1,697 @@
+'''
+Author: XDTEAM
+Date: 2026-10-17
+Description: 本地模拟 IMAP 服务器 - 用于基准测试，可注入网络延迟
+'''
+import argparse
+import email
+import ipaddress
+import os
+import queue
+import re
+import socket
+import socketserver
+import ssl
+import threading
+import time
+import zlib
+from email.message import EmailMessage
+from email.utils import format_datetime, encode_rfc2231, collapse_rfc2231_value
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+def build_message(index: int, body_size: int = 2048, attachment_size: int = 0, inline_image: bool = False) -> bytes:
+    """生成一封测试邮件，可附带附件和内嵌图片"""
+    msg = EmailMessage()
+    msg["From"] = f"Sender {index} <sender{index}@example.com>"
+    msg["To"] = "receiver@example.com"
+    msg["Subject"] = f"测试邮件 {index}"
+    msg["Date"] = format_datetime(datetime(2026, 1, 1) + timedelta(minutes=index))
+    msg["Message-ID"] = f"<msg-{index}@example.com>"
+    text = (f"第 {index} 封邮件正文。" * (body_size // 24 + 1))[:body_size]
+    msg.set_content(text)
+    image = f'<img src="cid:image-{index}@example.com">' if inline_image else ""
+    msg.add_alternative(f"<html><body><p>{text}</p>{image}</body></html>", subtype="html")
+    if inline_image:
+        html_part = msg.get_payload()[1]
+        html_part.add_related(
+            bytes(range(256)) * 8, maintype="image", subtype="png",
+            cid=f"<image-{index}@example.com>"
+        )
+    if attachment_size:
+        payload = bytes((index + i) % 256 for i in range(attachment_size))
+        msg.add_attachment(payload, maintype="application", subtype="octet-stream", filename=f"附件-{index}.bin")
+    return msg.as_bytes()
+
+
+def _quote(value) -> str:
+    if value is None:
+        return "NIL"
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _params(pairs) -> str:
+    if not pairs:
+        return "NIL"
+    return "(" + " ".join(f"{_quote(k.upper())} {_quote(v)}" for k, v in pairs) + ")"
+
+
+def body_structure(part) -> str:
+    """生成 BODYSTRUCTURE（RFC 3501 7.4.2），含 disposition 扩展字段"""
+    if part.get_content_maintype() == "multipart":
+        children = "".join(body_structure(child) for child in part.get_payload())
+        return f"({children} {_quote(part.get_content_subtype().upper())})"
+
+    params = [(k, v) for k, v in part.get_params()[1:]] if part.get_params() else []
+    payload = _part_bytes(part)
+    fields = [
+        _quote(part.get_content_maintype().upper()),
+        _quote(part.get_content_subtype().upper()),
+        _params(params),
+        _quote(part.get("Content-ID")),
+        "NIL",
+        _quote(str(part.get("Content-Transfer-Encoding", "7BIT")).upper()),
+        str(len(payload)),
+    ]
+    if part.get_content_maintype() == "text":
+        fields.append(str(payload.count(b"\n")))
+    disposition = part.get_content_disposition()
+    if disposition:
+        filename = part.get_param("filename", header="Content-Disposition")
+        if isinstance(filename, tuple):
+            # RFC 2231 编码的参数，如 filename*=utf-8''%E9%99%84...
+            filename_param = [("filename*", encode_rfc2231(collapse_rfc2231_value(filename), "utf-8"))]
+        else:
+            filename_param = [("filename", filename)] if filename else None
+        fields += ["NIL", f"({_quote(disposition.upper())} {_params(filename_param)})"]
+    return "(" + " ".join(fields) + ")"
+
+
+def _part_bytes(part) -> bytes:
+    """部分的原始（编码后）内容"""
+    payload = part.get_payload()
+    if isinstance(payload, str):
+        return payload.encode("utf-8", errors="surrogateescape")
+    return part.as_bytes()
+
+
+def find_part(msg, section: str):
+    """按部分编号查找邮件部分，如 "1.2" """
+    part = msg
+    for index in section.split("."):
+        if part.get_content_maintype() != "multipart":
+            if index == "1":
+                continue
+            return None
+        children = part.get_payload()
+        if int(index) > len(children):
+            return None
+        part = children[int(index) - 1]
+    return part
+
+
+class Mailbox:
+    """模拟的邮件文件夹"""
+
+    def __init__(self, uidvalidity: int = 1):
+        self.uidvalidity = uidvalidity
+        self.uidnext = 1
+        self.modseq = 1
+        self.messages: List[Dict] = []
+        # 已删除的 UID 及删除时的 modseq，用于 VANISHED (EARLIER)
+        self.expunged: List[tuple] = []
+
+    def append(self, raw: bytes, flags: Optional[List[str]] = None) -> int:
+        uid = self.uidnext
+        self.uidnext += 1
+        self.modseq += 1
+        self.messages.append({
+            "uid": uid,
+            "raw": raw,
+            "flags": set(flags or []),
+            "modseq": self.modseq,
+        })
+        return uid
+
+    def set_flags(self, uid: int, flags: List[str]):
+        for message in self.messages:
+            if message["uid"] == uid:
+                self.modseq += 1
+                message["flags"] = set(flags)
+                message["modseq"] = self.modseq
+
+    def expunge(self, uid: int):
+        self.modseq += 1
+        self.messages = [m for m in self.messages if m["uid"] != uid]
+        self.expunged.append((uid, self.modseq))
+
+
+class MailStore:
+    """模拟的邮件存储，多个连接共享"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        self.folders: Dict[str, Mailbox] = {"INBOX": Mailbox()}
+        # 文件夹的 LIST 属性（如 SPECIAL-USE 的 \Sent、\Junk）
+        self.attributes: Dict[str, List[str]] = {}
+        self.logins = 0
+
+    def fill(self, folder: str, count: int, body_size: int = 2048, attachment_size: int = 0, inline_image: bool = False):
+        with self.lock:
+            box = self.folders.setdefault(folder, Mailbox())
+            start = len(box.messages)
+            for i in range(start, start + count):
+                box.append(build_message(i + 1, body_size, attachment_size, inline_image))
+            self.changed.notify_all()
+
+    def set_flags(self, folder: str, uid: int, flags: List[str]):
+        with self.lock:
+            self.folders[folder].set_flags(uid, flags)
+
+    def expunge(self, folder: str, uid: int):
+        with self.lock:
+            self.folders[folder].expunge(uid)
+
+
+def tokenize(data: str) -> list:
+    """解析命令参数为嵌套列表（支持引号字符串、括号和方括号）"""
+    pos = 0
+    stack: list = [[]]
+    while pos < len(data):
+        ch = data[pos]
+        if ch == " ":
+            pos += 1
+        elif ch == "(":
+            stack.append([])
+            pos += 1
+        elif ch == ")":
+            item = stack.pop()
+            stack[-1].append(item)
+            pos += 1
+        elif ch == '"':
+            end = pos + 1
+            buf = []
+            while data[end] != '"':
+                if data[end] == "\\":
+                    end += 1
+                buf.append(data[end])
+                end += 1
+            stack[-1].append("".join(buf))
+            pos = end + 1
+        else:
+            end = pos
+            depth = 0
+            while end < len(data):
+                c = data[end]
+                if c == "[":
+                    depth += 1
+                elif c == "]":
+                    depth -= 1
+                elif depth == 0 and c in " ()":
+                    break
+                end += 1
+            stack[-1].append(data[pos:end])
+            pos = end
+    return stack[0]
+
+
+def parse_sequence_set(value: str, max_value: int) -> List[int]:
+    """解析序列集合，如 1:5,7,9:*"""
+    result = []
+    for part in value.split(","):
+        if ":" in part:
+            a, b = part.split(":", 1)
+            a = max_value if a == "*" else int(a)
+            b = max_value if b == "*" else int(b)
+            lo, hi = min(a, b), max(a, b)
+            result.extend(range(lo, hi + 1))
+        else:
+            result.append(max_value if part == "*" else int(part))
+    return result
+
+
+SECTION_PATTERN = re.compile(r"^BODY(?:\.PEEK)?\[([\d.]+)\]$")
+HEADER_FIELDS_PATTERN = re.compile(r"^BODY(?:\.PEEK)?\[HEADER\.FIELDS \((.*)\)\]$")
+
+
+class InflateReader:
+    """COMPRESS DEFLATE 之后读取客户端命令：从 socket 读取并解压"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.buffer = b""
+
+    def readline(self) -> bytes:
+        while b"\n" not in self.buffer:
+            try:
+                data = self.sock.recv(65536)
+            except OSError:
+                data = b""
+            if not data:
+                line, self.buffer = self.buffer, b""
+                return line
+            self.buffer += self.decompressor.decompress(data)
+        line, _, self.buffer = self.buffer.partition(b"\n")
+        return line + b"\n"
+
+    def close(self):
+        pass
+
+
+def create_test_certificate(directory: str, hostname: str = "127.0.0.1") -> tuple:
+    """生成自签名证书，返回 (证书文件, 私钥文件)，客户端需要把证书文件作为 CA 信任"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostname)])
+    now = datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.DNSName("localhost"),
+            x509.IPAddress(ipaddress.ip_address("127.0.0.1"))
+        ]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    certfile = os.path.join(directory, "fake_imap_cert.pem")
+    keyfile = os.path.join(directory, "fake_imap_key.pem")
+    with open(certfile, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    return certfile, keyfile
+
+
+class IMAPHandler(socketserver.StreamRequestHandler):
+    """处理单个 IMAP 连接"""
+
+    def setup(self):
+        if isinstance(self.request, ssl.SSLSocket):
+            # 握手在处理线程中进行，不阻塞接受新连接；客户端不完成握手时超时退出，不永久占用线程
+            self.request.settimeout(10)
+            self.request.do_handshake()
+            self.request.settimeout(None)
+        super().setup()
+        self.selected: Optional[Mailbox] = None
+        self.enabled = set()
+        self.deflater = None
+        # 模拟往返延迟：响应放入队列，由发送线程在到期后写出，不阻塞读取后续命令
+        self.outbox: Optional[queue.Queue] = None
+        if self.server.rtt:
+            self.outbox = queue.Queue()
+            self.sender = threading.Thread(target=self._deliver, daemon=True)
+            self.sender.start()
+
+    def finish(self):
+        if self.outbox is not None:
+            self.outbox.put(None)
+            self.sender.join(timeout=5)
+        super().finish()
+
+    def _deliver(self):
+        while True:
+            item = self.outbox.get()
+            if item is None:
+                return
+            due, data = item
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.wfile.write(data)
+            except OSError:
+                return
+
+    @property
+    def condstore(self) -> bool:
+        return "CONDSTORE" in self.server.capabilities
+
+    @property
+    def store(self) -> MailStore:
+        return self.server.store
+
+    def write(self, data: bytes):
+        if self.deflater is not None:
+            data = self.deflater.compress(data)
+            if not data:
+                return
+        self.server.bytes_sent += len(data)
+        if self.outbox is not None:
+            self.outbox.put((time.monotonic() + self.server.rtt, data))
+        else:
+            self.wfile.write(data)
+
+    def flush(self):
+        """发送缓冲的响应（压缩时输出 SYNC_FLUSH 块）"""
+        if self.deflater is not None:
+            deflater, self.deflater = self.deflater, None
+            self.write(deflater.flush(zlib.Z_SYNC_FLUSH))
+            self.deflater = deflater
+        if self.outbox is None:
+            self.wfile.flush()
+
+    def send_line(self, line):
+        if isinstance(line, str):
+            line = line.encode()
+        self.write(line + b"\r\n")
+
+    def handle(self):
+        self.send_line("* OK FakeIMAP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if not line:
+                continue
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            tag, _, rest = line.partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            uid_mode = False
+            if command == "UID":
+                uid_mode = True
+                command, _, args = args.partition(" ")
+                command = command.upper()
+            if command in self.server.stall_commands:
+                # 模拟服务器挂起：不再响应，直到客户端断开
+                self.rfile.read()
+                break
+            handler = getattr(self, f"cmd_{command.lower()}", None)
+            if handler is None:
+                self.send_line(f"{tag} BAD unknown command")
+                continue
+            try:
+                result = handler(tag, args, uid_mode)
+            except Exception as e:
+                self.send_line(f"{tag} BAD {e}")
+                continue
+            if result == "LOGOUT":
+                break
+            self.flush()
+
+    # ==================== 命令处理 ====================
+
+    def cmd_capability(self, tag, args, uid_mode):
+        self.send_line(f"* CAPABILITY {' '.join(self.server.capabilities)}")
+        self.send_line(f"{tag} OK CAPABILITY completed")
+
+    def cmd_login(self, tag, args, uid_mode):
+        with self.store.lock:
+            self.store.logins += 1
+        self.send_line(f"{tag} OK LOGIN completed")
+
+    def cmd_id(self, tag, args, uid_mode):
+        self.send_line('* ID ("name" "FakeIMAP")')
+        self.send_line(f"{tag} OK ID completed")
+
+    def cmd_enable(self, tag, args, uid_mode):
+        wanted = [name.upper() for name in args.split()]
+        enabled = [name for name in wanted if name in self.server.capabilities]
+        self.enabled.update(enabled)
+        if "QRESYNC" in enabled:
+            self.enabled.add("CONDSTORE")
+        self.send_line("* ENABLED" + "".join(f" {name}" for name in enabled))
+        self.send_line(f"{tag} OK ENABLE completed")
+
+    def cmd_compress(self, tag, args, uid_mode):
+        """COMPRESS DEFLATE（RFC 4978）：返回 OK 后双向压缩"""
+        if "COMPRESS=DEFLATE" not in self.server.capabilities or args.strip().upper() != "DEFLATE":
+            self.send_line(f"{tag} NO compression not supported")
+            return
+        if self.deflater is not None:
+            self.send_line(f"{tag} NO [COMPRESSIONACTIVE] already active")
+            return
+        self.send_line(f"{tag} OK DEFLATE active")
+        self.flush()
+        self.deflater = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.rfile = InflateReader(self.connection)
+
+    def cmd_noop(self, tag, args, uid_mode):
+        self.send_line(f"{tag} OK NOOP completed")
+
+    def cmd_logout(self, tag, args, uid_mode):
+        self.send_line("* BYE logging out")
+        self.send_line(f"{tag} OK LOGOUT completed")
+        self.flush()
+        return "LOGOUT"
+
+    def cmd_idle(self, tag, args, uid_mode):
+        """IDLE：有新邮件时推送 EXISTS，收到 DONE 后结束"""
+        self.send_line("+ idling")
+        self.flush()
+        done = threading.Event()
+
+        def wait_done():
+            self.rfile.readline()
+            done.set()
+            with self.store.lock:
+                self.store.changed.notify_all()
+
+        threading.Thread(target=wait_done, daemon=True).start()
+        known = len(self.selected.messages)
+        with self.store.lock:
+            while not done.is_set():
+                if len(self.selected.messages) != known:
+                    known = len(self.selected.messages)
+                    self.send_line(f"* {known} EXISTS")
+                    self.flush()
+                self.store.changed.wait(1)
+        self.send_line(f"{tag} OK IDLE terminated")
+
+    def cmd_select(self, tag, args, uid_mode):
+        tokens = tokenize(args)
+        name = tokens[0]
+        box = self.store.folders.get(name)
+        if box is None:
+            self.send_line(f"{tag} NO no such mailbox")
+            return
+        self.selected = box
+        self.send_line(f"* {len(box.messages)} EXISTS")
+        self.send_line("* 0 RECENT")
+        self.send_line(r"* FLAGS (\Answered \Flagged \Deleted \Seen \Draft)")
+        self.send_line(f"* OK [UIDVALIDITY {box.uidvalidity}] UIDs valid")
+        self.send_line(f"* OK [UIDNEXT {box.uidnext}] Predicted next UID")
+        if self.condstore:
+            self.send_line(f"* OK [HIGHESTMODSEQ {box.modseq}] Highest")
+
+        # SELECT folder (QRESYNC (uidvalidity modseq))
+        params = tokens[1] if len(tokens) > 1 and isinstance(tokens[1], list) else []
+        if "QRESYNC" in self.enabled and len(params) > 1 and str(params[0]).upper() == "QRESYNC":
+            uidvalidity, modseq = (int(value) for value in params[1][:2])
+            if uidvalidity == box.uidvalidity:
+                vanished = [uid for uid, changed in box.expunged if changed > modseq]
+                if vanished:
+                    self.send_line(f"* VANISHED (EARLIER) {','.join(map(str, vanished))}")
+                for index, message in enumerate(box.messages):
+                    if message["modseq"] > modseq:
+                        self.write(f"* {index + 1} FETCH (".encode())
+                        self.write(self._fetch_items(message, ["UID", "FLAGS", "MODSEQ"]))
+                        self.write(b")\r\n")
+        self.send_line(f"{tag} OK [READ-WRITE] SELECT completed")
+
+    cmd_examine = cmd_select
+
+    def cmd_list(self, tag, args, uid_mode):
+        for name in self.store.folders:
+            quoted = name.replace("\\", "\\\\").replace('"', '\\"')
+            attributes = " ".join(["\\HasNoChildren"] + self.store.attributes.get(name, []))
+            self.send_line(f'* LIST ({attributes}) "{self.server.delimiter}" "{quoted}"')
+        self.send_line(f"{tag} OK LIST completed")
+
+    def cmd_status(self, tag, args, uid_mode):
+        tokens = tokenize(args)
+        name = tokens[0]
+        box = self.store.folders.get(name)
+        if box is None:
+            self.send_line(f"{tag} NO no such mailbox")
+            return
+        unseen = sum(1 for m in box.messages if "\\Seen" not in m["flags"])
+        self.send_line(
+            f'* STATUS "{name}" (MESSAGES {len(box.messages)} UNSEEN {unseen} '
+            f'UIDNEXT {box.uidnext} UIDVALIDITY {box.uidvalidity})'
+        )
+        self.send_line(f"{tag} OK STATUS completed")
+
+    def _resolve(self, seq: str, uid_mode: bool) -> List[int]:
+        """将序列集合解析为消息下标列表"""
+        messages = self.selected.messages
+        if not messages:
+            return []
+        if uid_mode:
+            max_uid = messages[-1]["uid"]
+            wanted = set(parse_sequence_set(seq, max_uid))
+            # "n:*" 至少包含最后一封邮件（RFC 3501）
+            if seq.endswith(":*"):
+                wanted.add(max_uid)
+            return [i for i, m in enumerate(messages) if m["uid"] in wanted]
+        wanted = parse_sequence_set(seq, len(messages))
+        return [i - 1 for i in sorted(set(wanted)) if 1 <= i <= len(messages)]
+
+    def cmd_search(self, tag, args, uid_mode):
+        tokens = tokenize(args)
+        indexes = list(range(len(self.selected.messages)))
+        upper = [t.upper() if isinstance(t, str) else t for t in tokens]
+        if "UID" in upper:
+            indexes = self._resolve(tokens[upper.index("UID") + 1], True)
+        if uid_mode:
+            values = [self.selected.messages[i]["uid"] for i in indexes]
+        else:
+            values = [i + 1 for i in indexes]
+        self.send_line("* SEARCH" + "".join(f" {v}" for v in values))
+        self.send_line(f"{tag} OK SEARCH completed")
+
+    def cmd_fetch(self, tag, args, uid_mode):
+        tokens = tokenize(args)
+        seq, items = tokens[0], tokens[1]
+        if isinstance(items, str):
+            items = [items]
+        items = [i.upper() for i in items if isinstance(i, str)]
+        if uid_mode and "UID" not in items:
+            items.insert(0, "UID")
+        # 修饰符 (CHANGEDSINCE modseq)
+        changed_since = None
+        if len(tokens) > 2 and isinstance(tokens[2], list) and str(tokens[2][0]).upper() == "CHANGEDSINCE":
+            changed_since = int(tokens[2][1])
+            if "MODSEQ" not in items:
+                items.append("MODSEQ")
+        for index in self._resolve(seq, uid_mode):
+            message = self.selected.messages[index]
+            if changed_since is not None and message["modseq"] <= changed_since:
+                continue
+            self.write(f"* {index + 1} FETCH (".encode())
+            self.write(self._fetch_items(message, items))
+            self.write(b")\r\n")
+        self.send_line(f"{tag} OK FETCH completed")
+
+    @staticmethod
+    def _parsed(message: Dict):
+        """解析后的邮件（缓存，真实服务器会预先建立结构索引）"""
+        if "parsed" not in message:
+            message["parsed"] = email.message_from_bytes(message["raw"])
+        return message["parsed"]
+
+    def _fetch_items(self, message: Dict, items: List[str]) -> bytes:
+        parts = []
+        raw = message["raw"]
+        header_end = raw.find(b"\n\n")
+        if raw.find(b"\r\n\r\n") != -1:
+            header_end = raw.find(b"\r\n\r\n") + 4
+        elif header_end != -1:
+            header_end += 2
+        for item in items:
+            if item == "UID":
+                parts.append(f"UID {message['uid']}".encode())
+            elif item == "FLAGS":
+                parts.append(f"FLAGS ({' '.join(sorted(message['flags']))})".encode())
+            elif item == "RFC822.SIZE":
+                parts.append(f"RFC822.SIZE {len(raw)}".encode())
+            elif item == "MODSEQ":
+                parts.append(f"MODSEQ ({message['modseq']})".encode())
+            elif item in ("RFC822", "BODY[]", "BODY.PEEK[]"):
+                name = "RFC822" if item == "RFC822" else "BODY[]"
+                parts.append(f"{name} {{{len(raw)}}}\r\n".encode() + raw)
+            elif item in ("RFC822.HEADER", "BODY.PEEK[HEADER]", "BODY[HEADER]"):
+                name = "RFC822.HEADER" if item == "RFC822.HEADER" else "BODY[HEADER]"
+                header = raw[:header_end]
+                parts.append(f"{name} {{{len(header)}}}\r\n".encode() + header)
+            elif item == "BODYSTRUCTURE":
+                parts.append(f"BODYSTRUCTURE {body_structure(self._parsed(message))}".encode())
+            elif SECTION_PATTERN.match(item):
+                section = SECTION_PATTERN.match(item).group(1)
+                part = find_part(self._parsed(message), section)
+                data = _part_bytes(part) if part is not None else b""
+                parts.append(f"BODY[{section}] {{{len(data)}}}\r\n".encode() + data)
+            elif HEADER_FIELDS_PATTERN.match(item):
+                spec = HEADER_FIELDS_PATTERN.match(item).group(1)
+                wanted = {name.upper() for name in spec.split()}
+                lines = [
+                    line for line in raw[:header_end].splitlines()
+                    if line.split(b":", 1)[0].decode(errors="ignore").upper() in wanted
+                ]
+                data = b"\r\n".join(lines) + b"\r\n\r\n"
+                parts.append(f"BODY[HEADER.FIELDS ({spec})] {{{len(data)}}}\r\n".encode() + data)
+        return b" ".join(parts)
+
+
+class FakeIMAPServer(socketserver.ThreadingTCPServer):
+    """模拟 IMAP 服务器"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        store: Optional[MailStore] = None,
+        latency: float = 0.0,
+        capabilities: Optional[List[str]] = None,
+        rtt: float = 0.0,
+        ssl_context: Optional[ssl.SSLContext] = None
+    ):
+        super().__init__(address, IMAPHandler)
+        # 设置后所有连接使用 IMAPS（隐式 TLS）
+        self.ssl_context = ssl_context
+        self.store = store or MailStore()
+        # latency: 每条命令处理前的等待（命令串行处理）；rtt: 网络往返延迟（流水线发送的命令可以重叠）
+        self.latency = latency
+        self.rtt = rtt
+        self.bytes_sent = 0
+        self.capabilities = capabilities or ["IMAP4rev1", "ID", "IDLE", "UIDPLUS"]
+        self.delimiter = "/"
+        # 收到这些命令后不再响应（模拟挂起的服务器）
+        self.stall_commands: set = set()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def get_request(self):
+        sock, address = super().get_request()
+        # 响应逐行写出，关闭 Nagle 算法，避免与客户端的延迟确认叠加出每条命令约 40ms 的等待
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, address
+
+    def start(self) -> "FakeIMAPServer":
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟 IMAP 服务器")
+    parser.add_argument("--port", type=int, default=1143)
+    parser.add_argument("--messages", type=int, default=200, help="INBOX 中的邮件数量")
+    parser.add_argument("--latency", type=float, default=0.0, help="每条命令注入的延迟（秒）")
+    parser.add_argument("--rtt", type=float, default=0.0, help="模拟的网络往返延迟（秒）")
+    parser.add_argument("--attachment-size", type=int, default=0, help="每封邮件附件大小（字节），0 表示无附件")
+    args = parser.parse_args()
+
+    server = FakeIMAPServer(("127.0.0.1", args.port), latency=args.latency, rtt=args.rtt)
+    server.store.fill("INBOX", args.messages, attachment_size=args.attachment_size, inline_image=bool(args.attachment_size))
+    print(f"FakeIMAP 监听 127.0.0.1:{server.port}，{args.messages} 封邮件，延迟 {args.latency}s，往返延迟 {args.rtt}s")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@
  * @Description: 
  */
 import request from './request'
-import type { EmailAccount, AccountFormData, ApiResponse } from '@/types'
+import type { EmailAccount, AccountFormData, ApiResponse, SyncSummary } from '@/types'
 
 // 获取所有邮箱账户
 export function getAccounts(): Promise<ApiResponse<EmailAccount[]>> {
@@ -39,7 +39,7 @@ export function testAccountConnection(data: AccountFormData): Promise<ApiRespons
 }
 
 // 同步邮箱账户邮件
-export function syncAccount(id: string): Promise<ApiResponse<{ syncedCount: number }>> {
+export function syncAccount(id: string): Promise<ApiResponse<SyncSummary>> {
   return request.post(`/accounts/${id}/sync`)
 }
 
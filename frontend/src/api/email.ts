@@ -6,7 +6,7 @@
  * @Description: 
  */
 import request from './request'
-import type { Email, EmailFolder, ApiResponse, PaginatedResponse } from '@/types'
+import type { Email, EmailFolder, ApiResponse, PaginatedResponse, CursorPaginatedResponse } from '@/types'
 
 // 获取邮件列表
 export function getEmails(params: {
@@ -20,6 +20,19 @@ export function getEmails(params: {
   return request.get('/emails', { params })
 }
 
+// 按游标获取邮件列表（翻页深度不影响速度，适合无限滚动）
+export function getEmailsByCursor(params: {
+  accountId?: string
+  folder?: string
+  pageSize?: number
+  cursor?: string | null
+  withTotal?: boolean
+  search?: string
+}): Promise<ApiResponse<CursorPaginatedResponse<Email>>> {
+  const { cursor, ...rest } = params
+  return request.get('/emails', { params: cursor ? { ...rest, cursor } : rest })
+}
+
 // 获取单封邮件详情
 export function getEmail(id: string): Promise<ApiResponse<Email>> {
   return request.get(`/emails/${id}`)
@@ -56,8 +69,8 @@ export function moveEmail(id: string, folder: string): Promise<ApiResponse<Email
 }
 
 // 获取邮件文件夹列表
-export function getEmailFolders(accountId: string): Promise<ApiResponse<EmailFolder[]>> {
-  return request.get(`/accounts/${accountId}/folders`)
+export function getEmailFolders(accountId: string, refresh = false): Promise<ApiResponse<EmailFolder[]>> {
+  return request.get(`/accounts/${accountId}/folders`, { params: refresh ? { refresh } : {} })
 }
 
 // 刷新邮件
@@ -172,6 +172,12 @@ const service: AxiosInstance = axios.create({
   }
 })
 
+// 将后端返回的相对地址（如内嵌图片 /emails/images/...）拼接为完整地址
+export function resolveApiUrl(path: string): string {
+  const baseUrl = getApiBaseUrl() || service.defaults.baseURL || '/api'
+  return baseUrl.replace(/\/+$/, '') + path
+}
+
 // 请求拦截器
 service.interceptors.request.use(
   (config: InternalAxiosRequestConfig) => {
@@ -10,7 +10,9 @@ export interface EmailAccount {
   smtpHost: string
   smtpPort: number
   useSSL: boolean
+  imapCompress?: boolean  // 服务器支持时启用 IMAP 压缩（COMPRESS=DEFLATE）
   isActive: boolean
+  syncFolders?: string[] | null  // 同步的文件夹（inbox/sent/archive/junk 等用途或服务器文件夹名），为空时使用服务端默认配置
   createdAt: string
   updatedAt: string
 }
@@ -30,8 +32,9 @@ export interface ProviderConfig {
 
 // 内嵌图片类型
 export interface InlineImage {
-  content_type: string
-  data: string  // Base64 编码的图片数据
+  contentType: string
+  size?: number
+  url?: string  // 图片地址（相对于 API 根路径），尚未从邮件服务器获取时为空
 }
 
 // 邮件类型
@@ -51,7 +54,7 @@ export interface Email {
   isStarred: boolean
   hasAttachments: boolean
   attachments?: Attachment[]
-  inlineImages?: Record<string, InlineImage>  // CID 到图片数据的映射
+  inlineImages?: Record<string, InlineImage>  // CID 到图片地址的映射
   folder: string
   labels?: string[]
 }
@@ -71,14 +74,32 @@ export interface Attachment {
   url?: string
 }
 
+// 账户同步结果摘要
+export interface SyncSummary {
+  syncedCount: number
+  fetched: number   // 获取到的新邮件数
+  inserted: number  // 写入数据库的邮件数
+  skipped: number   // 已存在而跳过的邮件数
+  failed: number    // 获取或解析失败的邮件数
+  duration: number
+  error: string | null
+}
+
 // 邮件文件夹类型
 export interface EmailFolder {
   name: string
   path: string
+  delimiter: string | null
+  flags: string[]
+  specialUse: FolderSpecialUse | null
   count: number
   unreadCount: number
+  uidNext: number | null
 }
 
+// 文件夹用途（SPECIAL-USE 属性或常见文件夹名识别）
+export type FolderSpecialUse = 'inbox' | 'sent' | 'drafts' | 'archive' | 'junk' | 'trash' | 'all' | 'flagged'
+
 // API 响应类型
 export interface ApiResponse<T> {
   success: boolean
@@ -94,6 +115,17 @@ export interface PaginatedResponse<T> {
   page: number
   pageSize: number
   totalPages: number
+  nextCursor?: string | null  // 最后一行的游标，可用于改为按游标继续翻页
+  hasMore?: boolean
+}
+
+// 游标分页响应（传入 cursor 时返回；按页码分页的响应同样包含 nextCursor 和 hasMore）
+export interface CursorPaginatedResponse<T> {
+  items: T[]
+  pageSize: number
+  nextCursor: string | null  // 下一页的游标，为空表示没有更多
+  hasMore: boolean
+  total: number | null  // 仅 withTotal 为 true 时统计
 }
 
 // 账户表单类型